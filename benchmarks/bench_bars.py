@@ -0,0 +1,41 @@
+import argparse
+import logging
+
+from benchmarks.common import TARGET_CONFIG, make_etl, make_trades, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="OHLCV bars from one shared pass versus one pass per resolution."
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--isins", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[15, 60, 1440])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    df = make_trades(args.rows, args.isins)
+    shared_time, df_bars = timed(
+        lambda: make_etl(
+            target_config=TARGET_CONFIG._replace(bar_resolutions=args.resolutions)
+        ).transform_bars(df),
+        args.repeat,
+    )
+    separate_time = 0.0
+    for resolution in args.resolutions:
+        elapsed, _ = timed(
+            lambda: make_etl(
+                target_config=TARGET_CONFIG._replace(bar_resolutions=[resolution])
+            ).transform_bars(df),
+            args.repeat,
+        )
+        separate_time += elapsed
+
+    print(f"rows={len(df)} bars={len(df_bars)} resolutions={args.resolutions}")
+    print(f"shared pass={shared_time:.3f}s separate passes={separate_time:.3f}s")
+    print(f"speedup={separate_time / shared_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
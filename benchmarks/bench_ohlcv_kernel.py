@@ -0,0 +1,43 @@
+import argparse
+import logging
+
+import pandas as pd
+
+from benchmarks.common import SOURCE_CONFIG, make_etl, make_trades, timed
+from src.transformers.xetra_transformer import COMPACT_NUMERIC_ATTR
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="transform_report1 with the pandas and the numpy backend."
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--isins", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Run both backends on scaled-integer prices.",
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    source_config = SOURCE_CONFIG._replace(compact_numeric=args.compact)
+    df = make_trades(args.rows, args.isins)
+    if args.compact:
+        df = make_etl(source_config)._compact_numeric(df)
+        df.attrs[COMPACT_NUMERIC_ATTR] = True
+    results = {}
+    for backend in ("pandas", "numpy"):
+        xetra_etl = make_etl(source_config._replace(backend=backend))
+        results[backend] = timed(lambda: xetra_etl.transform_report1(df), args.repeat)
+
+    pd.testing.assert_frame_equal(results["pandas"][1], results["numpy"][1])
+    print(f"rows={len(df)} isins={args.isins} compact={args.compact}")
+    for backend, (elapsed, _) in results.items():
+        print(f"{backend:<8}{elapsed:.3f}s")
+    print(f"speedup={results['pandas'][0] / results['numpy'][0]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
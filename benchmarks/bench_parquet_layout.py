@@ -0,0 +1,81 @@
+import argparse
+import logging
+import os
+import tempfile
+
+import pandas as pd
+
+from benchmarks.common import make_etl, make_trades, timed
+from src.common.storage import LocalBucketConnector, ParquetWriteConfig
+
+LAYOUTS = {
+    "default": ParquetWriteConfig(),
+    "uncompressed": ParquetWriteConfig(compression=None),
+    "zstd-3": ParquetWriteConfig(compression="zstd", compression_level=3),
+    "zstd-9": ParquetWriteConfig(compression="zstd", compression_level=9),
+    "zstd-3-sorted": ParquetWriteConfig(
+        compression="zstd",
+        compression_level=3,
+        row_group_size=131072,
+        sort_by=["ISIN", "Date"],
+        use_dictionary=["ISIN"],
+    ),
+    "zstd-3-sorted-small-groups": ParquetWriteConfig(
+        compression="zstd",
+        compression_level=3,
+        row_group_size=16384,
+        sort_by=["ISIN", "Date"],
+        use_dictionary=["ISIN"],
+    ),
+    "zstd-3-sorted-no-stats": ParquetWriteConfig(
+        compression="zstd",
+        compression_level=3,
+        row_group_size=131072,
+        sort_by=["ISIN", "Date"],
+        use_dictionary=["ISIN"],
+        write_statistics=False,
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="File size and scan speed of report 1 for each Parquet layout."
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--isins", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    df_report = make_etl().transform_report1(make_trades(args.rows, args.isins))
+    isin = df_report["ISIN"].iloc[len(df_report) // 2]
+    print(f"report_rows={len(df_report)} point_lookup_isin={isin}")
+    print(
+        f"{'layout':<28}{'size_kib':>10}{'write_s':>10}"
+        f"{'full_scan_s':>13}{'isin_scan_s':>13}"
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bucket = LocalBucketConnector(temp_dir, "bench")
+        for name, parquet_args in LAYOUTS.items():
+            key = f"{name}.parquet"
+            path = bucket.location(key)
+            write_time, _ = timed(
+                lambda: bucket.write_df_to_s3(
+                    df_report, key, "parquet", parquet_args=parquet_args
+                ),
+                args.repeat,
+            )
+            full_time, _ = timed(lambda: pd.read_parquet(path), args.repeat)
+            lookup_time, _ = timed(
+                lambda: pd.read_parquet(path, filters=[("ISIN", "==", isin)]),
+                args.repeat,
+            )
+            print(
+                f"{name:<28}{os.path.getsize(path) / 2**10:>10.1f}"
+                f"{write_time:>10.3f}{full_time:>13.3f}{lookup_time:>13.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import logging
+
+import pandas as pd
+
+from benchmarks.common import make_etl, make_hourly_files, timed
+from src.transformers.xetra_transformer import SORTED_BY_TIME_ATTR
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="transform_report1 with and without the presorted path."
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    files = make_hourly_files(args.rows)
+    xetra_etl = make_etl()
+    last_times = {}
+    check_time, sorted_flags = timed(
+        lambda: [xetra_etl._continues_time_order(df, last_times) for df in files], 1
+    )
+    df = pd.concat(files, ignore_index=True)
+
+    df.attrs[SORTED_BY_TIME_ATTR] = False
+    sort_time, df_sorted_path = timed(
+        lambda: xetra_etl.transform_report1(df), args.repeat
+    )
+    df.attrs[SORTED_BY_TIME_ATTR] = all(sorted_flags)
+    presorted_time, df_presorted_path = timed(
+        lambda: xetra_etl.transform_report1(df), args.repeat
+    )
+
+    pd.testing.assert_frame_equal(df_sorted_path, df_presorted_path)
+    print(f"rows={len(df)} files={len(files)} verified_sorted={all(sorted_flags)}")
+    print(f"sortedness check={check_time:.3f}s")
+    print(f"global sort path={sort_time:.3f}s presorted path={presorted_time:.3f}s")
+    print(f"speedup={sort_time / presorted_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    "import src.run": [sys.executable, "-c", "import src.run"],
+    "run --help": [sys.executable, "-m", "src.run", "--help"],
+    "run --dry-run": [sys.executable, "-m", "src.run", "--dry-run"],
+    "import full ETL stack": [
+        sys.executable,
+        "-c",
+        "import src.run, src.transformers.report_engine",
+    ],
+}
+
+
+def timed(command, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Wall-clock startup time of the run.py entry points."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, command in COMMANDS.items():
+        print(f"{name}: {timed(command, args.repeat) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
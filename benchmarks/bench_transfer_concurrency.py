@@ -0,0 +1,99 @@
+import argparse
+import logging
+import threading
+import time
+
+from src.common.concurrency import (
+    BYTES_PER_MB,
+    AdaptiveConcurrencyController,
+    TransferConcurrencyConfig,
+)
+
+
+class SimulatedStore:
+    def __init__(
+        self,
+        latency: float,
+        stream_mb_per_s: float,
+        link_mb_per_s: float,
+        throttle_above: int,
+        throttle_delay: float,
+    ) -> None:
+        self.latency = latency
+        self.stream_mb_per_s = stream_mb_per_s
+        self.link_mb_per_s = link_mb_per_s
+        self.throttle_above = throttle_above
+        self.throttle_delay = throttle_delay
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def get(self, controller: AdaptiveConcurrencyController, size: int) -> bytes:
+        while True:
+            with self._lock:
+                self._in_flight += 1
+                in_flight = self._in_flight
+            try:
+                if in_flight > self.throttle_above:
+                    time.sleep(self.latency)
+                else:
+                    rate = min(self.stream_mb_per_s, self.link_mb_per_s / in_flight)
+                    time.sleep(self.latency + size / BYTES_PER_MB / rate)
+                    return bytes(size)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+            controller.record_throttle()
+            time.sleep(self.throttle_delay)
+
+
+def run(store: SimulatedStore, config: TransferConcurrencyConfig, args) -> str:
+    controller = AdaptiveConcurrencyController("download", config)
+    size = int(args.object_mb * BYTES_PER_MB)
+    start = time.perf_counter()
+    for _ in controller.map(
+        lambda _: store.get(controller, size), range(args.objects), len
+    ):
+        pass
+    elapsed = time.perf_counter() - start
+    stats = controller.stats()
+    return (
+        f"{elapsed:.2f}s {args.objects * args.object_mb / elapsed:.1f} MB/s "
+        f"final concurrency={stats.concurrency} peak={stats.peak_concurrency} "
+        f"throttled={stats.throttled}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fixed vs adaptive transfer concurrency against a simulated "
+        "store with per-request latency, a shared link and a throttling limit."
+    )
+    parser.add_argument("--objects", type=int, default=400)
+    parser.add_argument("--object-mb", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--stream-mb-per-s", type=float, default=25.0)
+    parser.add_argument("--link-mb-per-s", type=float, default=250.0)
+    parser.add_argument("--throttle-above", type=int, default=16)
+    parser.add_argument("--throttle-delay", type=float, default=0.2)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    store = SimulatedStore(
+        args.latency,
+        args.stream_mb_per_s,
+        args.link_mb_per_s,
+        args.throttle_above,
+        args.throttle_delay,
+    )
+    for workers in (4, 16, 32):
+        fixed = TransferConcurrencyConfig(
+            initial_concurrency=workers,
+            min_concurrency=workers,
+            max_concurrency=workers,
+        )
+        print(f"fixed {workers:>2}: {run(store, fixed, args)}")
+    print(f"adaptive: {run(store, TransferConcurrencyConfig(), args)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import logging
+import resource
+import time
+import tracemalloc
+
+from benchmarks.common import SOURCE_CONFIG, make_etl, make_trades
+from src.transformers.xetra_transformer import COMPACT_NUMERIC_ATTR
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Peak memory of transform_report1 relative to its input frame."
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="store prices as scaled integer ticks and downcast volumes",
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    xetra_etl = make_etl(SOURCE_CONFIG._replace(compact_numeric=args.compact))
+    df = make_trades(args.rows)
+    if args.compact:
+        df = xetra_etl._compact_numeric(df)
+        df.attrs[COMPACT_NUMERIC_ATTR] = True
+    input_mb = df.memory_usage(deep=True).sum() / 2**20
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    df_report = xetra_etl.transform_report1(df)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    peak_mb = peak / 2**20
+    print(f"rows={len(df)} report_rows={len(df_report)}")
+    print(f"input={input_mb:.1f} MiB peak_extra={peak_mb:.1f} MiB")
+    print(f"peak_extra/input={peak_mb / input_mb:.2f} time={elapsed:.2f}s")
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+    print(f"process max_rss={max_rss_mb:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+from io import BytesIO
+import logging
+
+import pandas as pd
+
+from benchmarks.common import SOURCE_CONFIG, make_etl, make_hourly_files, timed
+from src.common.constants import ValidationRules
+from src.transformers.validation import XetraValidator
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cost of the validation stage relative to parsing and "
+        "transforming the same hourly files."
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    bodies = [
+        df.to_csv(index=False).encode("utf-8") for df in make_hourly_files(args.rows)
+    ]
+    parse_time, files = timed(
+        lambda: [pd.read_csv(BytesIO(body)) for body in bodies], args.repeat
+    )
+    rules = [rule.value for rule in ValidationRules]
+    validate_time, validated = timed(
+        lambda: [
+            XetraValidator(SOURCE_CONFIG, rules).validate(df, f"file-{index}")
+            for index, df in enumerate(files)
+        ],
+        args.repeat,
+    )
+    df = pd.concat(validated, ignore_index=True)
+    transform_time, _ = timed(
+        lambda: make_etl().transform_report1(df.copy()), args.repeat
+    )
+
+    etl_time = parse_time + transform_time
+    print(f"rows={len(df)} files={len(files)} rules={len(rules)}")
+    print(
+        f"parse={parse_time:.3f}s validation={validate_time:.3f}s "
+        f"transform={transform_time:.3f}s"
+    )
+    print(f"overhead vs parse+transform={validate_time / etl_time:.1%}")
+
+
+if __name__ == "__main__":
+    main()
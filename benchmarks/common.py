@@ -0,0 +1,101 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+from src.common.meta_process import MetaProcess
+from src.transformers.xetra_transformer import (
+    XetraETL,
+    XetraSourceConfig,
+    XetraTargetConfig,
+)
+
+COLUMNS_SRC = [
+    "ISIN",
+    "Mnemonic",
+    "Date",
+    "Time",
+    "StartPrice",
+    "EndPrice",
+    "MinPrice",
+    "MaxPrice",
+    "TradedVolume",
+]
+DATES = ["2021-04-15", "2021-04-16", "2021-04-19", "2021-04-20", "2021-04-21"]
+
+SOURCE_CONFIG = XetraSourceConfig(
+    first_extract_date=DATES[0],
+    columns=COLUMNS_SRC,
+    col_date="Date",
+    col_isin="ISIN",
+    col_time="Time",
+    col_start_price="StartPrice",
+    col_min_price="MinPrice",
+    col_max_price="MaxPrice",
+    col_traded_volume="TradedVolume",
+)
+TARGET_CONFIG = XetraTargetConfig(
+    col_isin="ISIN",
+    col_date="Date",
+    col_opening_price="OpeningPriceEur",
+    col_closing_price="ClosingPriceEur",
+    col_min_price="MinimumPriceEur",
+    col_max_price="MaximumPriceEur",
+    col_daily_trading_volume="DailyTradedVolume",
+    col_change_previous_closing="ChangePrevClosing%",
+    key="report1/xetra_daily_report",
+    key_date_format="%Y-%m-%d %H:%M:%S",
+    format="parquet",
+)
+
+
+def make_hourly_files(rows: int, isins: int = 3000, seed: int = 42) -> list:
+    rng = np.random.default_rng(seed)
+    hours = [f"{hour:02d}" for hour in range(8, 18)]
+    rows_per_file = max(rows // (len(DATES) * len(hours)), 1)
+    files = []
+    for date in DATES:
+        for hour in hours:
+            minutes = np.sort(rng.integers(0, 60, rows_per_file))
+            df = pd.DataFrame(
+                {
+                    "ISIN": [
+                        f"DE{code:010d}"
+                        for code in rng.integers(0, isins, rows_per_file)
+                    ],
+                    "Mnemonic": "MNE",
+                    "Date": date,
+                    "Time": [f"{hour}:{minute:02d}" for minute in minutes],
+                    "StartPrice": rng.uniform(10, 100, rows_per_file).round(2),
+                    "EndPrice": rng.uniform(10, 100, rows_per_file).round(2),
+                    "MinPrice": rng.uniform(5, 10, rows_per_file).round(2),
+                    "MaxPrice": rng.uniform(100, 110, rows_per_file).round(2),
+                    "TradedVolume": rng.integers(1, 10000, rows_per_file),
+                }
+            )
+            files.append(df)
+    return files
+
+
+def make_trades(rows: int, isins: int = 3000, seed: int = 42) -> pd.DataFrame:
+    return pd.concat(make_hourly_files(rows, isins, seed), ignore_index=True)
+
+
+def make_etl(
+    source_config: XetraSourceConfig = SOURCE_CONFIG,
+    target_config: XetraTargetConfig = TARGET_CONFIG,
+) -> XetraETL:
+    with patch.object(MetaProcess, "return_date_list", return_value=[DATES[1], DATES]):
+        return XetraETL(
+            MagicMock(), MagicMock(), "meta_key", source_config, target_config
+        )
+
+
+def timed(func, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
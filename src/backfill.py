@@ -0,0 +1,57 @@
+import argparse
+import logging
+
+from src.run import build_connectors, load_config
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Distributed Xetra backfill: publish date chunks, work on "
+        "them from any number of nodes and commit the finished dates."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    publish = subparsers.add_parser("publish", help="publish backfill work items")
+    publish.add_argument("first_date")
+    publish.add_argument("last_date")
+    work = subparsers.add_parser("work", help="claim and process work items")
+    work.add_argument("--worker-id", default=None)
+    work.add_argument("--max-items", type=int, default=None)
+    subparsers.add_parser("commit", help="merge finished work items into the meta file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from src.transformers.backfill import XetraBackfill, XetraBackfillConfig
+    from src.transformers.xetra_transformer import (
+        XetraSourceConfig,
+        XetraTargetConfig,
+    )
+
+    config = load_config()
+    logger = logging.getLogger(__name__)
+
+    backfill_config = dict(config["backfill"])
+    report_name = backfill_config.pop("report")
+    report = next(
+        report for report in config["reports"] if report["name"] == report_name
+    )
+    backfill = XetraBackfill(
+        *build_connectors(config),
+        meta_key=report["meta_key"],
+        src_args=XetraSourceConfig(**config["source"]),
+        trg_args=XetraTargetConfig(**report["target"]),
+        backfill_args=XetraBackfillConfig(**backfill_config),
+    )
+    logger.info(f"Starting Xetra backfill {args.command}...")
+    if args.command == "publish":
+        backfill.publish(args.first_date, args.last_date)
+    elif args.command == "work":
+        backfill.work(args.worker_id, args.max_items)
+    else:
+        backfill.commit_metadata()
+    logger.info(f"Xetra backfill {args.command} finished.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import logging
+from pathlib import Path
+import shutil
+import tempfile
+import pandas as pd
+import pyarrow as pa  # type: ignore[import-untyped]
+from typing import Iterator, List, Optional
+
+
+class ArrowSpillDataset:
+    def __init__(self, spill_dir: str) -> None:
+        self._logger = logging.getLogger(__name__)
+        Path(spill_dir).mkdir(parents=True, exist_ok=True)
+        self.path = Path(tempfile.mkdtemp(prefix="xetra_spill_", dir=spill_dir))
+        self.files: List[Path] = []
+
+    @property
+    def empty(self) -> bool:
+        return not self.files
+
+    def append(self, df: pd.DataFrame) -> None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        file_path = self.path / f"part-{len(self.files):06d}.arrow"
+        with pa.OSFile(str(file_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        self.files.append(file_path)
+
+    def iter_tables(self, columns: Optional[List[str]] = None) -> Iterator[pa.Table]:
+        for file_path in self.files:
+            with pa.memory_map(str(file_path), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+                yield table.select(columns) if columns else table
+
+    def iter_frames(
+        self, columns: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        for table in self.iter_tables(columns):
+            yield table.to_pandas()
+
+    def to_df(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if self.empty:
+            return pd.DataFrame()
+        return pd.concat(list(self.iter_frames(columns)), ignore_index=True)
+
+    def cleanup(self) -> None:
+        self._logger.info(f"Removing spilled Arrow files in {self.path}")
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.files = []
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .constants import MetaProcessFormat
+from .meta_process import MetaProcess
+from .storage import BucketConnector, LocalBucketConnector, S3ObjectInfo
+from .trading_calendar import DailyCalendar, TradingCalendar
+
+MIRROR_MANIFEST_KEY = ".mirror/manifest.csv"
+
+
+class MirrorStats(NamedTuple):
+    copied: int
+    skipped: int
+    deleted: int
+
+
+class BucketMirror:
+    def __init__(
+        self,
+        source: BucketConnector,
+        mirror: LocalBucketConnector,
+        calendar: Optional[TradingCalendar] = None,
+        max_workers: int = 16,
+        manifest_key: str = MIRROR_MANIFEST_KEY,
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.source = source
+        self.mirror = mirror
+        self.calendar = calendar or DailyCalendar()
+        self.max_workers = max_workers
+        self.manifest_key = manifest_key
+
+    def _read_manifest(self) -> Dict[str, Set[Tuple[str, str, str]]]:
+        df_manifest = MetaProcess.read_csv_or_none(self.mirror, self.manifest_key)
+        recorded: Dict[str, Set[Tuple[str, str, str]]] = {}
+        if df_manifest is not None:
+            for date, key, size, etag in zip(
+                df_manifest[MetaProcessFormat.SOURCE_DATE_COL.value],
+                df_manifest[MetaProcessFormat.MANIFEST_KEY_COL.value],
+                df_manifest[MetaProcessFormat.MANIFEST_SIZE_COL.value],
+                df_manifest[MetaProcessFormat.MANIFEST_ETAG_COL.value],
+            ):
+                recorded.setdefault(date, set()).add((key, size, etag))
+        return recorded
+
+    def _copy(self, obj: S3ObjectInfo) -> None:
+        self.mirror.put_mirrored_object(
+            obj.key, self.source.get_object(obj.key), obj.etag
+        )
+
+    def sync_date(
+        self,
+        date: str,
+        source_objects: List[S3ObjectInfo],
+        recorded: Set[Tuple[str, str, str]],
+        executor: ThreadPoolExecutor,
+    ) -> MirrorStats:
+        present = {obj.key for obj in self.mirror.list_objects_in_prefix(date)}
+        to_copy = [
+            obj
+            for obj in source_objects
+            if obj.key not in present
+            or (obj.key, str(obj.size), obj.etag) not in recorded
+        ]
+        source_keys = {obj.key for obj in source_objects}
+        to_delete = sorted(present - source_keys)
+        list(executor.map(self._copy, to_copy))
+        for key in to_delete:
+            self.mirror.delete_object(key)
+        if to_copy or to_delete or len(recorded) != len(source_objects):
+            MetaProcess.update_manifest(
+                self.mirror, self.manifest_key, {date: source_objects}
+            )
+        return MirrorStats(
+            copied=len(to_copy),
+            skipped=len(source_objects) - len(to_copy),
+            deleted=len(to_delete),
+        )
+
+    def sync(self, first_date: str, last_date: str) -> MirrorStats:
+        dates = [
+            day.strftime(MetaProcessFormat.DATE_FORMAT.value)
+            for day in self.calendar.trading_days(
+                datetime.strptime(
+                    first_date, MetaProcessFormat.DATE_FORMAT.value
+                ).date(),
+                datetime.strptime(
+                    last_date, MetaProcessFormat.DATE_FORMAT.value
+                ).date(),
+            )
+        ]
+        recorded = self._read_manifest()
+        copied = skipped = deleted = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            listings = executor.map(self.source.list_objects_in_prefix, dates)
+            for date, source_objects in zip(dates, listings):
+                stats = self.sync_date(
+                    date, source_objects, recorded.get(date, set()), executor
+                )
+                self._logger.info(
+                    f"Mirrored {date}: {stats.copied} copied, "
+                    f"{stats.skipped} unchanged, {stats.deleted} deleted."
+                )
+                copied += stats.copied
+                skipped += stats.skipped
+                deleted += stats.deleted
+        return MirrorStats(copied=copied, skipped=skipped, deleted=deleted)
@@ -0,0 +1,228 @@
+import collections
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import logging
+import statistics
+import threading
+import time
+from typing import (
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BYTES_PER_MB = 1024 * 1024
+
+
+class TransferConcurrencyConfig(NamedTuple):
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 32
+    increase_step: int = 1
+    decrease_factor: float = 0.5
+    improvement_threshold: float = 0.05
+    latency_spike_factor: float = 3.0
+    min_window: int = 4
+    probe_interval: int = 8
+
+
+class TransferStats(NamedTuple):
+    concurrency: int
+    peak_concurrency: int
+    requests: int
+    megabytes: float
+    seconds: float
+    mb_per_s: float
+    throttled: int
+    backoffs: int
+
+
+class AdaptiveConcurrencyController:
+    def __init__(
+        self,
+        name: str,
+        config: TransferConcurrencyConfig = TransferConcurrencyConfig(),
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.name = name
+        self.config = config
+        self.concurrency = min(
+            max(config.initial_concurrency, config.min_concurrency),
+            config.max_concurrency,
+        )
+        self.peak_concurrency = self.concurrency
+        self._lock = threading.Lock()
+        self._window_start = 0.0
+        self._window_open = False
+        self._window_bytes = 0
+        self._window_latencies: List[float] = []
+        self._window_throttled = False
+        self._last_throughput = 0.0
+        self._probing = False
+        self._recover_to = 0
+        self._hold_windows = 0
+        self._baseline_latency: Optional[float] = None
+        self.requests = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.throttled = 0
+        self.backoffs = 0
+
+    def record_throttle(self) -> None:
+        with self._lock:
+            self._window_throttled = True
+            self.throttled += 1
+
+    def record(self, nbytes: int, latency: float) -> None:
+        with self._lock:
+            now = time.perf_counter()
+            if not self._window_open:
+                self._window_start = now - latency
+                self._window_open = True
+            self._window_bytes += nbytes
+            self._window_latencies.append(latency)
+            self.requests += 1
+            self.bytes += nbytes
+            if len(self._window_latencies) >= max(
+                self.concurrency, self.config.min_window
+            ) and now - self._window_start >= statistics.median(self._window_latencies):
+                self._adjust(now)
+
+    def _close_window(self, now: float) -> None:
+        self.seconds += now - self._window_start
+        self._window_start = now
+        self._window_bytes = 0
+        self._window_latencies = []
+        self._window_throttled = False
+
+    def _adjust(self, now: float) -> None:
+        throughput = self._window_bytes / max(now - self._window_start, 1e-9)
+        latency = statistics.median(self._window_latencies)
+        throttled = self._window_throttled
+        self._close_window(now)
+        if self._baseline_latency is None or latency < self._baseline_latency:
+            self._baseline_latency = latency
+        previous = self.concurrency
+        improved = throughput > self._last_throughput * (
+            1 + self.config.improvement_threshold
+        )
+        probing = False
+        if throttled or latency > self.config.latency_spike_factor * (
+            self._baseline_latency
+        ):
+            self._recover_to = max(
+                self.config.min_concurrency, previous - self.config.increase_step
+            )
+            self.concurrency = max(
+                self.config.min_concurrency,
+                int(self.concurrency * self.config.decrease_factor),
+            )
+            self.backoffs += 1
+        elif self.concurrency < self._recover_to:
+            self.concurrency = min(
+                self._recover_to, self.concurrency + self.config.increase_step
+            )
+            if self.concurrency == self._recover_to:
+                self._hold_windows = self.config.probe_interval
+        elif self._probing and not improved:
+            self.concurrency = max(
+                self.config.min_concurrency,
+                self.concurrency - self.config.increase_step,
+            )
+            self._hold_windows = self.config.probe_interval
+        elif self._hold_windows > 0:
+            self._hold_windows -= 1
+        else:
+            self.concurrency = min(
+                self.config.max_concurrency,
+                self.concurrency + self.config.increase_step,
+            )
+            probing = self.concurrency > previous
+        self._probing = probing
+        self._last_throughput = throughput
+        self.peak_concurrency = max(self.peak_concurrency, self.concurrency)
+        if self.concurrency != previous:
+            self._logger.debug(
+                f"S3 {self.name} concurrency {previous} -> {self.concurrency} "
+                f"({throughput / BYTES_PER_MB:.1f} MB/s, median latency "
+                f"{latency:.3f}s{', throttled' if throttled else ''})"
+            )
+
+    def _timed(self, func: Callable[[T], R], item: T, size: Callable[[R], int]) -> R:
+        start = time.perf_counter()
+        result = func(item)
+        self.record(size(result), time.perf_counter() - start)
+        return result
+
+    def map(
+        self,
+        func: Callable[[T], R],
+        items: Iterable[T],
+        size: Callable[[R], int],
+        admit: Optional[Callable[[T, bool], bool]] = None,
+    ) -> Iterator[R]:
+        items = iter(items)
+        pending: Deque[Future] = collections.deque()
+        waiting: List[T] = []
+        exhausted = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.config.max_concurrency) as pool:
+                try:
+                    while True:
+                        running = sum(not future.done() for future in pending)
+                        while (
+                            not exhausted
+                            and running < self.concurrency
+                            and len(pending)
+                            < self.concurrency + self.config.max_concurrency
+                        ):
+                            if not waiting:
+                                try:
+                                    waiting.append(next(items))
+                                except StopIteration:
+                                    exhausted = True
+                                    break
+                            if admit is not None and not admit(waiting[0], not pending):
+                                break
+                            pending.append(
+                                pool.submit(self._timed, func, waiting.pop(), size)
+                            )
+                            running += 1
+                        if not pending:
+                            return
+                        if pending[0].done():
+                            yield pending.popleft().result()
+                        else:
+                            wait(
+                                [future for future in pending if not future.done()],
+                                return_when=FIRST_COMPLETED,
+                            )
+                finally:
+                    for future in pending:
+                        future.cancel()
+        finally:
+            with self._lock:
+                if self._window_open:
+                    self._close_window(time.perf_counter())
+                    self._window_open = False
+
+    def stats(self) -> TransferStats:
+        with self._lock:
+            megabytes = self.bytes / BYTES_PER_MB
+            return TransferStats(
+                concurrency=self.concurrency,
+                peak_concurrency=self.peak_concurrency,
+                requests=self.requests,
+                megabytes=megabytes,
+                seconds=self.seconds,
+                mb_per_s=megabytes / self.seconds if self.seconds else 0.0,
+                throttled=self.throttled,
+                backoffs=self.backoffs,
+            )
@@ -12,3 +12,63 @@ class MetaProcessFormat(Enum):
     SOURCE_DATE_COL = "source_date"
     PROCESS_COL = "datetime_of_processing"
     FILE_FORMAT = "csv"
+    MANIFEST_SUFFIX = "_manifest"
+    MANIFEST_KEY_COL = "key"
+    MANIFEST_SIZE_COL = "size"
+    MANIFEST_ETAG_COL = "etag"
+
+
+class S3RetryableErrorCodes(Enum):
+    SLOW_DOWN = "SlowDown"
+    THROTTLING = "Throttling"
+    THROTTLING_EXCEPTION = "ThrottlingException"
+    REQUEST_TIMEOUT = "RequestTimeout"
+    INTERNAL_ERROR = "InternalError"
+    SERVICE_UNAVAILABLE = "ServiceUnavailable"
+    SERVICE_UNAVAILABLE_HTTP = "503"
+    INTERNAL_ERROR_HTTP = "500"
+
+
+class S3ConflictErrorCodes(Enum):
+    PRECONDITION_FAILED = "PreconditionFailed"
+    CONDITIONAL_REQUEST_CONFLICT = "ConditionalRequestConflict"
+
+
+class ExecutionBackends(Enum):
+    PANDAS = "pandas"
+    DUCKDB = "duckdb"
+    NUMPY = "numpy"
+
+
+class ValidationRules(Enum):
+    MISSING_ISIN = "missing_isin"
+    BAD_DATE = "bad_date"
+    BAD_TIME = "bad_time"
+    BAD_NUMBER = "bad_number"
+    NEGATIVE_PRICE = "negative_price"
+    NEGATIVE_VOLUME = "negative_volume"
+    MIN_ABOVE_MAX = "min_above_max"
+    DUPLICATE_ROW = "duplicate_row"
+
+
+class QuarantineFormat(Enum):
+    REASON_COL = "reason_codes"
+    SOURCE_KEY_COL = "source_key"
+    RULE_COL = "rule"
+    ROWS_COL = "rows"
+    CHECKED_ROWS = "checked"
+    QUARANTINED_ROWS = "quarantined"
+    ROWS_FILE = "rows"
+    COUNTS_FILE = "counts"
+    DUPLICATES_FILE = "duplicates"
+    ORIGINAL_KEY_COL = "original_key"
+    SIZE_COL = "size"
+    MATCHED_BY_COL = "matched_by"
+    MATCHED_BY_ETAG = "etag"
+    MATCHED_BY_CONTENT = "content"
+
+
+class S3EventFormat(Enum):
+    RECORDS = "Records"
+    EVENT_NAME = "eventName"
+    OBJECT_CREATED_PREFIX = "ObjectCreated:"
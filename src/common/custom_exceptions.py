@@ -4,3 +4,39 @@ class WrongFormatException(Exception):
 
 class WrongMetaFileException(Exception):
     pass
+
+
+class UnknownReportException(Exception):
+    pass
+
+
+class WrongBackendException(Exception):
+    pass
+
+
+class WrongCalendarException(Exception):
+    pass
+
+
+class WrongScheduleException(Exception):
+    pass
+
+
+class LeaseLostException(Exception):
+    pass
+
+
+class MetaConflictException(Exception):
+    pass
+
+
+class IntradayStateConflictException(Exception):
+    pass
+
+
+class WrongResolutionException(Exception):
+    pass
+
+
+class UnknownValidationRuleException(Exception):
+    pass
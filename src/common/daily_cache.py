@@ -0,0 +1,46 @@
+import hashlib
+import logging
+import pandas as pd
+from typing import List, Optional, Tuple
+from botocore.exceptions import ClientError
+
+from .constants import S3FileTypes
+from .storage import BucketConnector, S3ObjectInfo
+
+
+class DailyAggregateCache:
+    def __init__(self, bucket_connector: BucketConnector, prefix: str) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.bucket_connector = bucket_connector
+        self.prefix = prefix.rstrip("/")
+
+    @staticmethod
+    def fingerprint(objects: List[S3ObjectInfo]) -> str:
+        digest = hashlib.sha256()
+        for obj in sorted(objects):
+            digest.update(f"{obj.key}\t{obj.etag}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def key(self, date: str, fingerprint: str) -> str:
+        return f"{self.prefix}/{date}/{fingerprint}.{S3FileTypes.PARQUET.value}"
+
+    def read(self, date: str, fingerprint: str) -> Optional[pd.DataFrame]:
+        try:
+            df = self.bucket_connector.read_parquet_to_df(self.key(date, fingerprint))
+        except ClientError as e:
+            if BucketConnector.get_code_from_client_error(e) == "NoSuchKey":
+                return None
+            raise
+        self._logger.info(f"Daily aggregates for {date} served from cache.")
+        return df
+
+    def write(self, date: str, fingerprint: str, df: pd.DataFrame) -> None:
+        self.bucket_connector.write_df_to_s3(
+            df, self.key(date, fingerprint), S3FileTypes.PARQUET.value
+        )
+
+    def write_many(self, items: List[Tuple[str, str, pd.DataFrame]]) -> None:
+        self.bucket_connector.write_dfs_to_s3(
+            [(df, self.key(date, fingerprint)) for date, fingerprint, df in items],
+            S3FileTypes.PARQUET.value,
+        )
@@ -0,0 +1,82 @@
+import logging
+import sys
+import threading
+import pandas as pd
+from typing import Dict
+
+from .concurrency import BYTES_PER_MB
+
+
+def frame_bytes(df: pd.DataFrame, sample: int = 64) -> int:
+    total = int(df.memory_usage(index=False).sum())
+    rows = len(df)
+    if rows:
+        step = max(rows // sample, 1)
+        for col, dtype in df.dtypes.items():
+            if dtype == object:
+                values = df[col].to_numpy()[::step]
+                total += int(sum(sys.getsizeof(v) for v in values) * rows / len(values))
+    return total
+
+
+class MemoryBudget:
+    def __init__(self, limit_bytes: int, expansion_ratio: float = 5.0) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.limit_bytes = limit_bytes
+        self.initial_expansion_ratio = expansion_ratio
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self._raw_bytes = 0
+        self._parsed_bytes = 0
+        self.reserved = 0
+        self.held = 0
+        self.peak = 0
+        self.deferred = 0
+
+    @property
+    def expansion_ratio(self) -> float:
+        if not self._raw_bytes:
+            return self.initial_expansion_ratio
+        return self._parsed_bytes / self._raw_bytes
+
+    def estimate(self, size: int) -> int:
+        return int(size * (1 + self.expansion_ratio))
+
+    def _reserve(self, nbytes: int) -> None:
+        self.reserved += nbytes
+        self.peak = max(self.peak, self.reserved + self.held)
+
+    def admit(self, key: str, size: int, force: bool = False) -> bool:
+        with self._lock:
+            nbytes = self.estimate(size)
+            if not force and self.reserved + nbytes > self.limit_bytes:
+                self.deferred += 1
+                return False
+            self._in_flight[key] = self._in_flight.get(key, 0) + nbytes
+            self._reserve(nbytes)
+            return True
+
+    def complete(self, key: str, size: int, df: pd.DataFrame) -> None:
+        with self._lock:
+            self.reserved -= self._in_flight.pop(key, 0)
+            self._raw_bytes += size
+            self._parsed_bytes += frame_bytes(df)
+
+    def hold(self, df: pd.DataFrame) -> bool:
+        nbytes = frame_bytes(df)
+        with self._lock:
+            self.held += nbytes
+            self._reserve(nbytes)
+            return self.reserved + self.held >= self.limit_bytes
+
+    def release_held(self) -> None:
+        with self._lock:
+            self.reserved -= self.held
+            self.held = 0
+
+    def log_stats(self) -> None:
+        self._logger.info(
+            f"Memory budget: peak {self.peak / BYTES_PER_MB:.1f} of "
+            f"{self.limit_bytes / BYTES_PER_MB:.1f} MB, {self.deferred} deferred "
+            f"downloads, expansion ratio {self.expansion_ratio:.2f}."
+        )
@@ -1,30 +1,91 @@
 import collections
 from datetime import datetime, timedelta
-from typing import List, Tuple
+import logging
+import os
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 from botocore.exceptions import ClientError
 
 import pandas as pd
 
-from .constants import MetaProcessFormat, S3FileTypes
-from .custom_exceptions import WrongMetaFileException
-from .s3 import S3BucketConnector
+from .constants import MetaProcessFormat, S3ConflictErrorCodes, S3FileTypes
+from .custom_exceptions import MetaConflictException, WrongMetaFileException
+from .storage import BucketConnector, S3ObjectInfo
+from .trading_calendar import DailyCalendar, TradingCalendar
+
+
+class MetaRetryConfig(NamedTuple):
+    max_attempts: int = 10
+    base_delay: float = 0.1
+    max_delay: float = 10.0
 
 
 class MetaProcess:
     @staticmethod
     def get_code_from_client_error(err: ClientError) -> str:
-        error_resp = err.response.get("Error")
-        if not error_resp:
-            return ""
-        code = error_resp.get("Code")
-        return code if code else ""
+        return BucketConnector.get_code_from_client_error(err)
+
+    @classmethod
+    def _read_with_etag_or_none(
+        cls,
+        bucket_connector: BucketConnector,
+        key: str,
+        dtype: Optional[type] = None,
+    ) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        try:
+            return bucket_connector.read_csv_to_df_with_etag(key, dtype=dtype)
+        except ClientError as e:
+            if cls.get_code_from_client_error(e) == "NoSuchKey":
+                return None, None
+            raise
+
+    @classmethod
+    def _conditional_update(
+        cls,
+        bucket_connector: BucketConnector,
+        key: str,
+        merge: Callable[[Optional[pd.DataFrame]], pd.DataFrame],
+        dtype: Optional[type] = None,
+        retry_args: MetaRetryConfig = MetaRetryConfig(),
+    ) -> None:
+        logger = logging.getLogger(__name__)
+        conflict_codes = {code.value for code in S3ConflictErrorCodes}
+        for attempt in range(1, retry_args.max_attempts + 1):
+            df_old, etag = cls._read_with_etag_or_none(bucket_connector, key, dtype)
+            try:
+                bucket_connector.write_df_to_s3(
+                    merge(df_old),
+                    key,
+                    S3FileTypes.CSV.value,
+                    if_match=etag,
+                    if_none_match=etag is None,
+                )
+                return
+            except ClientError as e:
+                if cls.get_code_from_client_error(e) not in conflict_codes:
+                    raise
+            delay = random.uniform(
+                0,
+                min(
+                    retry_args.max_delay,
+                    retry_args.base_delay * 2 ** (attempt - 1),
+                ),
+            )
+            logger.warning(
+                f"{key} was changed by another writer, retrying in {delay:.2f}s "
+                f"(attempt {attempt}/{retry_args.max_attempts})"
+            )
+            time.sleep(delay)
+        raise MetaConflictException
 
     @classmethod
     def update_meta_file(
         cls,
-        bucket_connector: S3BucketConnector,
+        bucket_connector: BucketConnector,
         meta_key: str,
         extract_date_list: List[str],
+        retry_args: MetaRetryConfig = MetaRetryConfig(),
     ) -> None:
         df_new = pd.DataFrame(
             columns=[
@@ -36,40 +97,44 @@ class MetaProcess:
         df_new[MetaProcessFormat.PROCESS_COL.value] = datetime.today().strftime(
             MetaProcessFormat.PROCESS_DATE_FORMAT.value
         )
-        try:
-            df_old = bucket_connector.read_csv_to_df(meta_key)
+
+        def merge(df_old: Optional[pd.DataFrame]) -> pd.DataFrame:
+            if df_old is None:
+                return df_new
             if collections.Counter(df_old.columns) != collections.Counter(
                 df_new.columns
             ):
                 raise WrongMetaFileException
-            df_all = pd.concat([df_old, df_new])
-        except ClientError as e:
-            if cls.get_code_from_client_error(e) == "NoSuchKey":
-                df_all = df_new
-            else:
-                raise
-        bucket_connector.write_df_to_s3(df_all, meta_key, S3FileTypes.CSV.value)
+            return pd.concat([df_old, df_new])
+
+        cls._conditional_update(
+            bucket_connector, meta_key, merge, retry_args=retry_args
+        )
 
     @classmethod
     def return_date_list(
-        cls, bucket_connector: S3BucketConnector, meta_key: str, first_date: str
+        cls,
+        bucket_connector: BucketConnector,
+        meta_key: str,
+        first_date: str,
+        calendar: Optional[TradingCalendar] = None,
     ) -> Tuple[str, List[str]]:
-        start = datetime.strptime(
-            first_date, MetaProcessFormat.DATE_FORMAT.value
-        ).date() - timedelta(days=1)
+        if calendar is None:
+            calendar = DailyCalendar()
+        start = calendar.previous_trading_day(
+            datetime.strptime(first_date, MetaProcessFormat.DATE_FORMAT.value).date()
+        )
         end = datetime(year=2022, month=3, day=20).date()
         try:
             df_meta = bucket_connector.read_csv_to_df(meta_key)
-            dates = [
-                (start + timedelta(days=x)) for x in range(0, (end - start).days + 1)
-            ]
+            dates = calendar.trading_days(start, end)
             src_dates = set(
                 pd.to_datetime(df_meta[MetaProcessFormat.SOURCE_DATE_COL.value]).dt.date
             )
             dates_missing = set(dates[1:]) - src_dates
             if dates_missing:
-                min_date = min(dates_missing) - timedelta(days=1)
-                return_min_date = (min_date + timedelta(days=1)).strftime(
+                min_date = calendar.previous_trading_day(min(dates_missing))
+                return_min_date = min(dates_missing).strftime(
                     MetaProcessFormat.DATE_FORMAT.value
                 )
                 return_dates = [
@@ -85,12 +150,108 @@ class MetaProcess:
         except ClientError as e:
             if cls.get_code_from_client_error(e) == "NoSuchKey":
                 return_dates = [
-                    (start + timedelta(days=d)).strftime(
-                        MetaProcessFormat.DATE_FORMAT.value
-                    )
-                    for d in range(0, (end - start).days + 1)
+                    date.strftime(MetaProcessFormat.DATE_FORMAT.value)
+                    for date in calendar.trading_days(start, end)
                 ]
                 return_min_date = first_date
             else:
                 raise
         return return_min_date, return_dates
+
+    @staticmethod
+    def return_manifest_key(meta_key: str) -> str:
+        root, ext = os.path.splitext(meta_key)
+        return f"{root}{MetaProcessFormat.MANIFEST_SUFFIX.value}{ext}"
+
+    @classmethod
+    def read_csv_or_none(
+        cls, bucket_connector: BucketConnector, key: str
+    ) -> Optional[pd.DataFrame]:
+        try:
+            return bucket_connector.read_csv_to_df(key, dtype=str)
+        except ClientError as e:
+            if cls.get_code_from_client_error(e) == "NoSuchKey":
+                return None
+            raise
+
+    @classmethod
+    def update_manifest(
+        cls,
+        bucket_connector: BucketConnector,
+        manifest_key: str,
+        objects: Dict[str, List[S3ObjectInfo]],
+        retry_args: MetaRetryConfig = MetaRetryConfig(),
+    ) -> None:
+        df_new = pd.DataFrame(
+            [
+                (date, obj.key, obj.size, obj.etag)
+                for date, date_objects in objects.items()
+                for obj in date_objects
+            ],
+            columns=[
+                MetaProcessFormat.SOURCE_DATE_COL.value,
+                MetaProcessFormat.MANIFEST_KEY_COL.value,
+                MetaProcessFormat.MANIFEST_SIZE_COL.value,
+                MetaProcessFormat.MANIFEST_ETAG_COL.value,
+            ],
+        )
+
+        def merge(df_old: Optional[pd.DataFrame]) -> pd.DataFrame:
+            if df_old is None:
+                return df_new
+            if collections.Counter(df_old.columns) != collections.Counter(
+                df_new.columns
+            ):
+                raise WrongMetaFileException
+            df_old = df_old[
+                ~df_old[MetaProcessFormat.SOURCE_DATE_COL.value].isin(objects)
+            ]
+            return pd.concat([df_old, df_new]) if not df_new.empty else df_old
+
+        cls._conditional_update(
+            bucket_connector, manifest_key, merge, dtype=str, retry_args=retry_args
+        )
+
+    @classmethod
+    def return_changed_dates(
+        cls,
+        src_bucket_connector: BucketConnector,
+        trg_bucket_connector: BucketConnector,
+        meta_key: str,
+        lookback_days: int,
+    ) -> List[str]:
+        logger = logging.getLogger(__name__)
+        df_meta = cls.read_csv_or_none(trg_bucket_connector, meta_key)
+        if df_meta is None or df_meta.empty:
+            return []
+        processed_dates = sorted(set(df_meta[MetaProcessFormat.SOURCE_DATE_COL.value]))
+        since = (
+            datetime.strptime(processed_dates[-1], MetaProcessFormat.DATE_FORMAT.value)
+            - timedelta(days=lookback_days)
+        ).strftime(MetaProcessFormat.DATE_FORMAT.value)
+        df_manifest = cls.read_csv_or_none(
+            trg_bucket_connector, cls.return_manifest_key(meta_key)
+        )
+        recorded: Dict[str, set] = collections.defaultdict(set)
+        if df_manifest is not None:
+            for date, key, size, etag in zip(
+                df_manifest[MetaProcessFormat.SOURCE_DATE_COL.value],
+                df_manifest[MetaProcessFormat.MANIFEST_KEY_COL.value],
+                df_manifest[MetaProcessFormat.MANIFEST_SIZE_COL.value],
+                df_manifest[MetaProcessFormat.MANIFEST_ETAG_COL.value],
+            ):
+                recorded[date].add((key, size, etag))
+        affected_dates = set()
+        for position, date in enumerate(processed_dates):
+            if date < since:
+                continue
+            current = {
+                (obj.key, str(obj.size), obj.etag)
+                for obj in src_bucket_connector.list_objects_in_prefix(date)
+            }
+            if current != recorded[date]:
+                logger.info(f"Source files for {date} changed since processing.")
+                affected_dates.add(date)
+                if position + 1 < len(processed_dates):
+                    affected_dates.add(processed_dates[position + 1])
+        return sorted(affected_dates)
@@ -0,0 +1,91 @@
+import logging
+import pandas as pd
+from typing import List, Tuple
+from botocore.exceptions import ClientError
+
+from .constants import S3FileTypes
+from .storage import BucketConnector
+
+
+class RollingWindowState:
+    def __init__(
+        self,
+        bucket_connector: BucketConnector,
+        key: str,
+        windows: List[int],
+        col_isin: str,
+        col_date: str,
+        col_price: str,
+        col_moving_average: str = "MovingAvg{}d",
+        col_volatility: str = "Volatility{}d",
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.bucket_connector = bucket_connector
+        self.key = key
+        self.windows = sorted(set(windows))
+        self.col_isin = col_isin
+        self.col_date = col_date
+        self.col_price = col_price
+        self.col_moving_average = col_moving_average
+        self.col_volatility = col_volatility
+        self.capacity = self.windows[-1] + 1
+
+    @property
+    def metric_columns(self) -> List[str]:
+        return [
+            col.format(window)
+            for window in self.windows
+            for col in (self.col_moving_average, self.col_volatility)
+        ]
+
+    def read(self) -> pd.DataFrame:
+        try:
+            return self.bucket_connector.read_parquet_to_df(self.key)
+        except ClientError as e:
+            if BucketConnector.get_code_from_client_error(e) != "NoSuchKey":
+                raise
+        self._logger.info(f"No rolling window state at {self.key}, starting empty.")
+        return pd.DataFrame(columns=[self.col_isin, self.col_date, self.col_price])
+
+    def write(self, df_state: pd.DataFrame) -> None:
+        self.bucket_connector.write_df_to_s3(
+            df_state, self.key, S3FileTypes.PARQUET.value
+        )
+        self._logger.info(f"Rolling window state written to {self.key}.")
+
+    def apply(
+        self, df: pd.DataFrame, df_state: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        keys = [self.col_isin, self.col_date]
+        df_new = df[keys + [self.col_price]].dropna(subset=[self.col_price])
+        frames = [df_state, df_new] if not df_state.empty else [df_new]
+        df_history = (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates(subset=keys, keep="last")
+            .sort_values(by=keys, kind="stable", ignore_index=True)
+        )
+        isins = df_history[self.col_isin]
+        prices = df_history[self.col_price]
+        returns = (prices / prices.groupby(isins).shift(1) - 1) * 100
+        for window in self.windows:
+            df_history[self.col_moving_average.format(window)] = (
+                prices.groupby(isins)
+                .rolling(window, min_periods=window)
+                .mean()
+                .droplevel(0)
+            )
+            df_history[self.col_volatility.format(window)] = (
+                returns.groupby(isins)
+                .rolling(window, min_periods=window)
+                .std()
+                .droplevel(0)
+            )
+        df = df.merge(
+            df_history[keys + self.metric_columns], on=keys, how="left", sort=False
+        )
+        df_state = (
+            df_history.groupby(self.col_isin)
+            .tail(self.capacity)[keys + [self.col_price]]
+            .reset_index(drop=True)
+        )
+        return df, df_state
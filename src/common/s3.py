@@ -1,18 +1,82 @@
+import collections
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import os
+import random
+import threading
+import time
 import boto3
-from io import StringIO, BytesIO
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
 import logging
-import pandas as pd
-from typing import List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
-from .constants import S3FileTypes
-from .custom_exceptions import WrongFormatException
+from .concurrency import (
+    AdaptiveConcurrencyController,
+    TransferConcurrencyConfig,
+    TransferStats,
+)
+from .constants import S3RetryableErrorCodes
+from .storage import BucketConnector, S3ObjectInfo
 
+T = TypeVar("T")
 
-class S3BucketConnector:
-    def __init__(self, endpoint_url: str, bucket: str) -> None:
+THROTTLING_ERROR_CODES = {
+    S3RetryableErrorCodes.SLOW_DOWN.value,
+    S3RetryableErrorCodes.THROTTLING.value,
+    S3RetryableErrorCodes.THROTTLING_EXCEPTION.value,
+    S3RetryableErrorCodes.SERVICE_UNAVAILABLE_HTTP.value,
+}
+
+
+class S3RetryConfig(NamedTuple):
+    max_attempts: int = 5
+    base_delay: float = 0.1
+    max_delay: float = 10.0
+    hedge_enabled: bool = True
+    hedge_percentile: float = 95.0
+    hedge_min_samples: int = 20
+    hedge_window: int = 200
+    hedge_max_workers: int = 4
+
+
+class S3BucketConnector(BucketConnector):
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        retry_args: S3RetryConfig = S3RetryConfig(),
+        transfer_args: TransferConcurrencyConfig = TransferConcurrencyConfig(),
+    ) -> None:
         self._logger = logging.getLogger(__name__)
         self.endpoint_url = endpoint_url
+        self.retry_args = retry_args
+        self.download_controller = AdaptiveConcurrencyController(
+            "download", transfer_args
+        )
+        self.upload_controller = AdaptiveConcurrencyController("upload", transfer_args)
+        self._connect(bucket)
+        self._throttle_streak = 0
+        self._throttle_lock = threading.Lock()
+        self._get_latencies: collections.deque = collections.deque(
+            maxlen=retry_args.hedge_window
+        )
+        self._hedge_executor = ThreadPoolExecutor(
+            max_workers=retry_args.hedge_max_workers + transfer_args.max_concurrency
+        )
+
+    def _connect(self, bucket: str) -> None:
         self.role_credentials = boto3.client("sts").assume_role(
             RoleArn=os.getenv("ROLE_ARN"),
             RoleSessionName="XetraRunnerSession",
@@ -20,46 +84,192 @@ class S3BucketConnector:
 
         self._s3 = boto3.resource(
             service_name="s3",
-            endpoint_url=endpoint_url,
+            endpoint_url=self.endpoint_url,
             aws_access_key_id=self.role_credentials["AccessKeyId"],
             aws_secret_access_key=self.role_credentials["SecretAccessKey"],
             aws_session_token=self.role_credentials["SessionToken"],
+            config=Config(retries={"total_max_attempts": 1, "mode": "standard"}),
         )
         self._bucket = self._s3.Bucket(bucket)
 
-    def list_files_in_prefix(self, prefix: str) -> List[str]:
-        files = [obj.key for obj in self._bucket.objects.filter(Prefix=prefix)]
-        return files
+    def refresh_credentials(
+        self, min_validity: timedelta = timedelta(minutes=10)
+    ) -> None:
+        expiration = self.role_credentials["Expiration"]
+        if expiration - datetime.now(timezone.utc) < min_validity:
+            self._logger.info("Role credentials expire soon, assuming role again.")
+            self._connect(self._bucket.name)
+
+    def location(self, key: str) -> str:
+        return f"{self.endpoint_url}/{self._bucket.name}/{key}"
+
+    def _is_retryable(self, err: Exception) -> bool:
+        if isinstance(err, (ConnectionError, HTTPClientError)):
+            return True
+        if isinstance(err, ClientError):
+            retryable_codes = {code.value for code in S3RetryableErrorCodes}
+            return self.get_code_from_client_error(err) in retryable_codes
+        return False
+
+    def _backoff_delay(self, attempt: int) -> float:
+        exponent = attempt - 1 + self._throttle_streak
+        cap = min(self.retry_args.max_delay, self.retry_args.base_delay * 2**exponent)
+        return random.uniform(0, cap)
+
+    def _call_with_retries(self, request: Callable[[], T]) -> T:
+        attempt = 1
+        while True:
+            try:
+                result = request()
+                with self._throttle_lock:
+                    self._throttle_streak = max(self._throttle_streak - 1, 0)
+                return result
+            except (ClientError, ConnectionError, HTTPClientError) as e:
+                if not self._is_retryable(e) or attempt >= self.retry_args.max_attempts:
+                    raise
+                if (
+                    isinstance(e, ClientError)
+                    and self.get_code_from_client_error(e) in THROTTLING_ERROR_CODES
+                ):
+                    with self._throttle_lock:
+                        self._throttle_streak += 1
+                    self.download_controller.record_throttle()
+                    self.upload_controller.record_throttle()
+                delay = self._backoff_delay(attempt)
+                self._logger.warning(
+                    f"S3 request failed with {e!r}, retrying in {delay:.2f}s "
+                    f"(attempt {attempt}/{self.retry_args.max_attempts})"
+                )
+                time.sleep(delay)
+                attempt += 1
 
-    def read_csv_to_df(
-        self, key: str, encoding: str = "utf-8", delimeter: str = ","
-    ) -> pd.DataFrame:
-        self._logger.info(f"Reading file {self.endpoint_url}/{self._bucket.name}/{key}")
-        csv_obj = self._bucket.Object(key=key).get().get("Body").read().decode(encoding)
-        data = StringIO(csv_obj)
-        df = pd.read_csv(data, delimiter=delimeter)
-        return df
+    def _hedge_threshold(self) -> Optional[float]:
+        if (
+            not self.retry_args.hedge_enabled
+            or len(self._get_latencies) < self.retry_args.hedge_min_samples
+        ):
+            return None
+        latencies = sorted(self._get_latencies)
+        index = round(self.retry_args.hedge_percentile / 100 * (len(latencies) - 1))
+        return latencies[index]
 
-    def write_df_to_s3(
+    def _get_object_body(self, key: str) -> bytes:
+        start = time.perf_counter()
+        body = self._s3.meta.client.get_object(Bucket=self._bucket.name, Key=key)[
+            "Body"
+        ].read()
+        self._get_latencies.append(time.perf_counter() - start)
+        return body
+
+    def _first_result(self, futures: List[Future]) -> bytes:
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        assert error is not None
+        raise error
+
+    def get_object(self, key: str) -> bytes:
+        threshold = self._hedge_threshold()
+        if threshold is None:
+            return self._call_with_retries(lambda: self._get_object_body(key))
+        primary = self._hedge_executor.submit(
+            self._call_with_retries, lambda: self._get_object_body(key)
+        )
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+        self._logger.info(
+            f"GET {key} exceeded {threshold:.3f}s, sending hedged request"
+        )
+        hedge = self._hedge_executor.submit(
+            self._call_with_retries, lambda: self._get_object_body(key)
+        )
+        return self._first_result([primary, hedge])
+
+    def get_objects(
+        self,
+        keys: Iterable[str],
+        admit: Optional[Callable[[str, bool], bool]] = None,
+    ) -> Iterator[Tuple[str, bytes]]:
+        return self.download_controller.map(
+            lambda key: (key, self.get_object(key)),
+            keys,
+            lambda item: len(item[1]),
+            admit,
+        )
+
+    def _put_item(self, item: Tuple[str, bytes]) -> Tuple[str, bytes]:
+        self.put_object(*item)
+        return item
+
+    def put_objects(self, items: Iterable[Tuple[str, bytes]]) -> None:
+        for _ in self.upload_controller.map(
+            self._put_item, items, lambda item: len(item[1])
+        ):
+            pass
+
+    def transfer_stats(self) -> Dict[str, TransferStats]:
+        return {
+            self.download_controller.name: self.download_controller.stats(),
+            self.upload_controller.name: self.upload_controller.stats(),
+        }
+
+    def list_objects_in_prefix(self, prefix: str) -> List[S3ObjectInfo]:
+        paginator = self._s3.meta.client.get_paginator("list_objects_v2")
+        objects = self._call_with_retries(
+            lambda: [
+                S3ObjectInfo(
+                    key=obj["Key"], size=obj["Size"], etag=obj["ETag"].strip('"')
+                )
+                for page in paginator.paginate(Bucket=self._bucket.name, Prefix=prefix)
+                for obj in page.get("Contents", [])
+            ]
+        )
+        return objects
+
+    def get_object_range(self, key: str, start: int, end: int) -> bytes:
+        if end <= start:
+            return b""
+        return self._call_with_retries(
+            lambda: self._s3.meta.client.get_object(
+                Bucket=self._bucket.name, Key=key, Range=f"bytes={start}-{end - 1}"
+            )["Body"].read()
+        )
+
+    def _get_object_body_with_etag(self, key: str) -> Tuple[bytes, str]:
+        response = self._s3.meta.client.get_object(Bucket=self._bucket.name, Key=key)
+        return response["Body"].read(), response["ETag"].strip('"')
+
+    def get_object_with_etag(self, key: str) -> Tuple[bytes, str]:
+        return self._call_with_retries(lambda: self._get_object_body_with_etag(key))
+
+    def put_object(
         self,
-        df: pd.DataFrame,
         key: str,
-        ext: str,
-    ) -> None:
-        if df.empty:
-            self._logger.info("The dataframe is empty! No file will be written!")
-            return
-        out_buffer = BytesIO()
-        if ext == S3FileTypes.PARQUET.value:
-            df.to_parquet(out_buffer, index=False)
-        elif ext == S3FileTypes.CSV.value:
-            df.to_csv(out_buffer, index=False)
-        else:
-            self._logger.warn(
-                f"The file format {ext} is not supported to be written to s3!"
+        body: bytes,
+        if_match: Optional[str] = None,
+        if_none_match: bool = False,
+    ) -> str:
+        conditions: Dict[str, Any] = {}
+        if if_match is not None:
+            conditions["IfMatch"] = f'"{if_match}"'
+        if if_none_match:
+            conditions["IfNoneMatch"] = "*"
+        response = self._call_with_retries(
+            lambda: self._s3.meta.client.put_object(
+                Bucket=self._bucket.name, Body=body, Key=key, **conditions
+            )
+        )
+        return response["ETag"].strip('"')
+
+    def delete_object(self, key: str) -> None:
+        self._call_with_retries(
+            lambda: self._s3.meta.client.delete_object(
+                Bucket=self._bucket.name, Key=key
             )
-            raise WrongFormatException
-        self._logger.info(
-            f"Writing file to {self.endpoint_url}/{self._bucket.name}/{key}"
         )
-        self._bucket.put_object(Body=out_buffer.getvalue(), Key=key)
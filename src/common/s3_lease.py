@@ -0,0 +1,109 @@
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from .constants import S3ConflictErrorCodes
+from .custom_exceptions import LeaseLostException
+from .storage import BucketConnector
+
+
+class S3Lease:
+    def __init__(
+        self,
+        bucket_connector: BucketConnector,
+        prefix: str,
+        worker_id: str,
+        lease_seconds: float = 900.0,
+        now: Callable[[], float] = time.time,
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.bucket_connector = bucket_connector
+        self.prefix = prefix.rstrip("/")
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.now = now
+        self._etags: Dict[str, str] = {}
+
+    def _claim_key(self, item: str) -> str:
+        return f"{self.prefix}/{item}"
+
+    @staticmethod
+    def _is_lost(err: ClientError) -> bool:
+        return BucketConnector.get_code_from_client_error(err) in {
+            code.value for code in S3ConflictErrorCodes
+        } | {"NoSuchKey"}
+
+    def _write_claim(
+        self, item: str, expires_at: float, etag: Optional[str] = None
+    ) -> str:
+        return self.bucket_connector.put_object(
+            self._claim_key(item),
+            f"{self.worker_id} {expires_at!r}".encode("utf-8"),
+            if_match=etag,
+            if_none_match=etag is None,
+        )
+
+    def read_claim(self, item: str) -> Optional[Tuple[str, float, str]]:
+        try:
+            body, etag = self.bucket_connector.get_object_with_etag(
+                self._claim_key(item)
+            )
+        except ClientError as e:
+            if BucketConnector.get_code_from_client_error(e) == "NoSuchKey":
+                return None
+            raise
+        worker_id, expires_at = body.decode("utf-8").rsplit(" ", 1)
+        return worker_id, float(expires_at), etag
+
+    def _claim(self, item: str, etag: Optional[str]) -> bool:
+        try:
+            self._etags[item] = self._write_claim(
+                item, self.now() + self.lease_seconds, etag
+            )
+        except ClientError as e:
+            if not self._is_lost(e):
+                raise
+            return False
+        self._logger.info(f"Worker {self.worker_id} acquired lease on {item}")
+        return True
+
+    def acquire(self, item: str) -> bool:
+        if self._claim(item, None):
+            return True
+        claim = self.read_claim(item)
+        if claim is None:
+            return self._claim(item, None)
+        worker_id, expires_at, etag = claim
+        if worker_id == self.worker_id:
+            self._etags[item] = etag
+            return True
+        if expires_at > self.now():
+            return False
+        self._logger.info(f"Reclaiming expired lease of {worker_id} on {item}")
+        return self._claim(item, etag)
+
+    def renew(self, item: str) -> None:
+        etag = self._etags.pop(item, None)
+        if etag is not None:
+            try:
+                self._etags[item] = self._write_claim(
+                    item, self.now() + self.lease_seconds, etag
+                )
+                return
+            except ClientError as e:
+                if not self._is_lost(e):
+                    raise
+        self._logger.warning(f"Worker {self.worker_id} lost lease on {item}!")
+        raise LeaseLostException
+
+    def release(self, item: str) -> None:
+        etag = self._etags.pop(item, None)
+        if etag is None:
+            return
+        try:
+            self._write_claim(item, 0.0, etag)
+        except ClientError as e:
+            if not self._is_lost(e):
+                raise
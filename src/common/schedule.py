@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Callable, FrozenSet, List, Optional
+
+from .custom_exceptions import WrongScheduleException
+
+CRON_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+CRON_MAX_LOOKAHEAD = timedelta(days=4 * 366)
+
+
+class CronSchedule:
+    def __init__(
+        self,
+        minutes: FrozenSet[int],
+        hours: FrozenSet[int],
+        days: FrozenSet[int],
+        months: FrozenSet[int],
+        weekdays: FrozenSet[int],
+        day_or_weekday: bool = False,
+    ) -> None:
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        self.weekdays = weekdays
+        self.day_or_weekday = day_or_weekday
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> FrozenSet[int]:
+        values: List[int] = []
+        for part in field.split(","):
+            value_range, _, step = part.partition("/")
+            if value_range == "*":
+                start, end = low, high
+            elif "-" in value_range:
+                start, end = (int(value) for value in value_range.split("-", 1))
+            else:
+                start = int(value_range)
+                end = high if step else start
+            if start < low or end > high or start > end:
+                raise ValueError(part)
+            values.extend(range(start, end + 1, int(step) if step else 1))
+        return frozenset(values)
+
+    @classmethod
+    def from_expression(cls, expression: str) -> "CronSchedule":
+        fields = expression.split()
+        try:
+            if len(fields) != len(CRON_FIELD_RANGES):
+                raise ValueError(expression)
+            minutes, hours, days, months, weekdays = [
+                cls._parse_field(field, low, high)
+                for field, (low, high) in zip(fields, CRON_FIELD_RANGES)
+            ]
+        except ValueError:
+            logging.getLogger(__name__).warning(
+                f"The schedule {expression} is not a valid cron expression!"
+            )
+            raise WrongScheduleException
+        return cls(
+            minutes,
+            hours,
+            days,
+            months,
+            frozenset(weekday % 7 for weekday in weekdays),
+            day_or_weekday=not fields[2].startswith("*")
+            and not fields[4].startswith("*"),
+        )
+
+    def matches_day(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.day_or_weekday:
+            return day or weekday
+        return day and weekday
+
+    def matches(self, moment: datetime) -> bool:
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.month in self.months
+            and self.matches_day(moment)
+        )
+
+    def next_run(self, after: datetime) -> datetime:
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        while not self.matches(moment):
+            if moment - after > CRON_MAX_LOOKAHEAD:
+                raise WrongScheduleException
+            if moment.month not in self.months or not self.matches_day(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            else:
+                moment += timedelta(minutes=1)
+        return moment
+
+
+class ScheduledRunner:
+    def __init__(
+        self,
+        schedule: CronSchedule,
+        job: Callable[[], None],
+        now: Callable[[], datetime] = datetime.now,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.schedule = schedule
+        self.job = job
+        self.now = now
+        self.sleep = sleep
+
+    def run(self, max_runs: Optional[int] = None) -> None:
+        runs = 0
+        while max_runs is None or runs < max_runs:
+            next_run = self.schedule.next_run(self.now())
+            self._logger.info(f"Next scheduled run at {next_run}.")
+            delay = (next_run - self.now()).total_seconds()
+            if delay > 0:
+                self.sleep(delay)
+            try:
+                self.job()
+            except Exception:
+                self._logger.exception("Scheduled run failed.")
+            runs += 1
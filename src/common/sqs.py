@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple
+from urllib.parse import unquote_plus
+import boto3
+
+from .constants import S3EventFormat
+from .s3 import S3ObjectInfo
+
+
+class SQSMessage(NamedTuple):
+    message_id: str
+    receipt_handle: str
+    objects: List[S3ObjectInfo]
+
+
+class SQSQueueConnector:
+    def __init__(self, endpoint_url: str, queue_url: str) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.endpoint_url = endpoint_url
+        self.queue_url = queue_url
+        self._connect()
+
+    def _connect(self) -> None:
+        self.role_credentials = boto3.client("sts").assume_role(
+            RoleArn=os.getenv("ROLE_ARN"),
+            RoleSessionName="XetraRunnerSession",
+        )["Credentials"]
+
+        self._sqs = boto3.client(
+            service_name="sqs",
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=self.role_credentials["AccessKeyId"],
+            aws_secret_access_key=self.role_credentials["SecretAccessKey"],
+            aws_session_token=self.role_credentials["SessionToken"],
+        )
+
+    def refresh_credentials(
+        self, min_validity: timedelta = timedelta(minutes=10)
+    ) -> None:
+        expiration = self.role_credentials["Expiration"]
+        if expiration - datetime.now(timezone.utc) < min_validity:
+            self._logger.info("Role credentials expire soon, assuming role again.")
+            self._connect()
+
+    @staticmethod
+    def parse_s3_event(body: str) -> List[S3ObjectInfo]:
+        event = json.loads(body)
+        objects = []
+        for record in event.get(S3EventFormat.RECORDS.value, []):
+            if not record.get(S3EventFormat.EVENT_NAME.value, "").startswith(
+                S3EventFormat.OBJECT_CREATED_PREFIX.value
+            ):
+                continue
+            s3_object = record["s3"]["object"]
+            objects.append(
+                S3ObjectInfo(
+                    key=unquote_plus(s3_object["key"]),
+                    size=s3_object.get("size", 0),
+                    etag=s3_object.get("eTag", "").strip('"'),
+                )
+            )
+        return objects
+
+    def receive_messages(
+        self, max_messages: int = 10, wait_time_seconds: int = 20
+    ) -> List[SQSMessage]:
+        response = self._sqs.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=wait_time_seconds,
+        )
+        messages = []
+        for message in response.get("Messages", []):
+            try:
+                objects = self.parse_s3_event(message["Body"])
+            except (ValueError, KeyError, TypeError, AttributeError):
+                self._logger.warning(
+                    f"Message {message['MessageId']} is not an S3 event, dropping it."
+                )
+                objects = []
+            messages.append(
+                SQSMessage(
+                    message_id=message["MessageId"],
+                    receipt_handle=message["ReceiptHandle"],
+                    objects=objects,
+                )
+            )
+        return messages
+
+    def delete_messages(self, messages: List[SQSMessage]) -> None:
+        for start in range(0, len(messages), 10):
+            entries: List[Dict[str, str]] = [
+                {"Id": str(i), "ReceiptHandle": message.receipt_handle}
+                for i, message in enumerate(messages[start : start + 10])
+            ]
+            response = self._sqs.delete_message_batch(
+                QueueUrl=self.queue_url, Entries=entries
+            )
+            for failure in response.get("Failed", []):
+                self._logger.warning(
+                    f"Could not delete message {failure['Id']}: {failure['Message']}"
+                )
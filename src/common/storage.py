@@ -0,0 +1,400 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import fcntl
+import hashlib
+from io import BytesIO, StringIO
+import logging
+import mmap
+import os
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+import uuid
+
+from botocore.exceptions import ClientError
+import pandas as pd
+
+from .concurrency import TransferStats
+from .constants import S3ConflictErrorCodes, S3FileTypes
+from .custom_exceptions import WrongFormatException
+
+LOCAL_LOCK_FILE = ".storage.lock"
+LOCAL_ETAG_SUFFIX = ".etag"
+
+
+class S3ObjectInfo(NamedTuple):
+    key: str
+    size: int
+    etag: str
+
+
+ParquetCompression = Literal["snappy", "gzip", "brotli", "lz4", "zstd"]
+
+
+class ParquetWriteConfig(NamedTuple):
+    compression: Optional[ParquetCompression] = "snappy"
+    compression_level: Optional[int] = None
+    row_group_size: Optional[int] = None
+    sort_by: Optional[List[str]] = None
+    use_dictionary: Union[bool, List[str]] = True
+    write_statistics: Union[bool, List[str]] = True
+
+
+class BucketConnector(ABC):
+    _logger: logging.Logger
+
+    @staticmethod
+    def get_code_from_client_error(err: ClientError) -> str:
+        error_resp = err.response.get("Error")
+        if not error_resp:
+            return ""
+        code = error_resp.get("Code")
+        return code if code else ""
+
+    @abstractmethod
+    def location(self, key: str) -> str: ...
+
+    @abstractmethod
+    def get_object(self, key: str) -> bytes: ...
+
+    @abstractmethod
+    def get_object_range(self, key: str, start: int, end: int) -> bytes: ...
+
+    @abstractmethod
+    def get_object_with_etag(self, key: str) -> Tuple[bytes, str]: ...
+
+    @abstractmethod
+    def list_objects_in_prefix(self, prefix: str) -> List[S3ObjectInfo]: ...
+
+    @abstractmethod
+    def put_object(
+        self,
+        key: str,
+        body: bytes,
+        if_match: Optional[str] = None,
+        if_none_match: bool = False,
+    ) -> str: ...
+
+    @abstractmethod
+    def delete_object(self, key: str) -> None: ...
+
+    def refresh_credentials(self, *args, **kwargs) -> None:
+        pass
+
+    def get_objects(
+        self,
+        keys: Iterable[str],
+        admit: Optional[Callable[[str, bool], bool]] = None,
+    ) -> Iterator[Tuple[str, bytes]]:
+        for key in keys:
+            if admit is not None:
+                admit(key, True)
+            yield key, self.get_object(key)
+
+    def put_objects(self, items: Iterable[Tuple[str, bytes]]) -> None:
+        for key, body in items:
+            self.put_object(key, body)
+
+    def transfer_stats(self) -> Dict[str, TransferStats]:
+        return {}
+
+    def list_files_in_prefix(self, prefix: str) -> List[str]:
+        files = [obj.key for obj in self.list_objects_in_prefix(prefix)]
+        return files
+
+    def read_csv_to_df(
+        self,
+        key: str,
+        encoding: str = "utf-8",
+        delimeter: str = ",",
+        dtype: Optional[type] = None,
+    ) -> pd.DataFrame:
+        self._logger.info(f"Reading file {self.location(key)}")
+        data = StringIO(self.get_object(key).decode(encoding))
+        df = pd.read_csv(data, delimiter=delimeter, dtype=dtype)
+        return df
+
+    def read_csv_to_dfs(
+        self,
+        keys: Iterable[str],
+        encoding: str = "utf-8",
+        delimeter: str = ",",
+        dtype: Optional[type] = None,
+        admit: Optional[Callable[[str, bool], bool]] = None,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        for key, body in self.get_objects(keys, admit):
+            self._logger.info(f"Reading file {self.location(key)}")
+            data = StringIO(body.decode(encoding))
+            yield key, pd.read_csv(data, delimiter=delimeter, dtype=dtype)
+
+    def read_csv_to_df_with_etag(
+        self,
+        key: str,
+        encoding: str = "utf-8",
+        delimeter: str = ",",
+        dtype: Optional[type] = None,
+    ) -> Tuple[pd.DataFrame, str]:
+        self._logger.info(f"Reading file {self.location(key)}")
+        body, etag = self.get_object_with_etag(key)
+        data = StringIO(body.decode(encoding))
+        df = pd.read_csv(data, delimiter=delimeter, dtype=dtype)
+        return df, etag
+
+    def read_parquet_to_df(self, key: str) -> pd.DataFrame:
+        self._logger.info(f"Reading file {self.location(key)}")
+        return pd.read_parquet(BytesIO(self.get_object(key)))
+
+    def read_parquet_to_df_with_etag(self, key: str) -> Tuple[pd.DataFrame, str]:
+        self._logger.info(f"Reading file {self.location(key)}")
+        body, etag = self.get_object_with_etag(key)
+        return pd.read_parquet(BytesIO(body)), etag
+
+    def write_df_to_s3(
+        self,
+        df: pd.DataFrame,
+        key: str,
+        ext: str,
+        if_match: Optional[str] = None,
+        if_none_match: bool = False,
+        parquet_args: ParquetWriteConfig = ParquetWriteConfig(),
+    ) -> None:
+        if df.empty:
+            self._logger.info("The dataframe is empty! No file will be written!")
+            return
+        body = self._serialize_df(df, ext, parquet_args)
+        self._logger.info(f"Writing file to {self.location(key)}")
+        self.put_object(key, body, if_match, if_none_match)
+
+    def write_dfs_to_s3(
+        self,
+        items: Iterable[Tuple[pd.DataFrame, str]],
+        ext: str,
+        parquet_args: ParquetWriteConfig = ParquetWriteConfig(),
+    ) -> None:
+        bodies = []
+        for df, key in items:
+            if df.empty:
+                self._logger.info(f"The dataframe for {key} is empty! Skipping it.")
+                continue
+            bodies.append((key, self._serialize_df(df, ext, parquet_args)))
+            self._logger.info(f"Writing file to {self.location(key)}")
+        self.put_objects(bodies)
+
+    def _serialize_df(
+        self, df: pd.DataFrame, ext: str, parquet_args: ParquetWriteConfig
+    ) -> bytes:
+        out_buffer = BytesIO()
+        if ext == S3FileTypes.PARQUET.value:
+            if parquet_args.sort_by:
+                df = df.sort_values(
+                    parquet_args.sort_by, kind="stable", ignore_index=True
+                )
+            df.to_parquet(
+                out_buffer,
+                engine="pyarrow",
+                index=False,
+                compression=parquet_args.compression,
+                compression_level=parquet_args.compression_level,
+                row_group_size=parquet_args.row_group_size,
+                use_dictionary=parquet_args.use_dictionary,
+                write_statistics=parquet_args.write_statistics,
+            )
+        elif ext == S3FileTypes.CSV.value:
+            df.to_csv(out_buffer, index=False)
+        else:
+            self._logger.warn(
+                f"The file format {ext} is not supported to be written to s3!"
+            )
+            raise WrongFormatException
+        return out_buffer.getvalue()
+
+
+class LocalBucketConnector(BucketConnector):
+    def __init__(self, root: str, bucket: str, memory_map: bool = False) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.root = os.path.abspath(os.path.join(root, bucket))
+        self.memory_map = memory_map
+        self._etags: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def _client_error(code: str, operation: str) -> ClientError:
+        return ClientError({"Error": {"Code": code}}, operation)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def _existing_path(self, key: str, operation: str) -> str:
+        path = self._path(key)
+        if not os.path.isfile(path):
+            raise self._client_error("NoSuchKey", operation)
+        return path
+
+    @staticmethod
+    def _etag_path(path: str) -> str:
+        directory, name = os.path.split(path)
+        return os.path.join(directory, f".{name}{LOCAL_ETAG_SUFFIX}")
+
+    def _etag(self, path: str, cached: bool = True) -> str:
+        local_etag = self._local_etag(path, cached)
+        try:
+            with open(self._etag_path(path)) as file:
+                recorded_etag, source_etag = file.read().split()
+        except (FileNotFoundError, ValueError):
+            return local_etag
+        return source_etag if recorded_etag == local_etag else local_etag
+
+    def _local_etag(self, path: str, cached: bool = True) -> str:
+        stat = os.stat(path)
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if cached and self._etags.get(path, (None,))[0] == signature:
+            return self._etags[path][1]
+        digest = hashlib.md5()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        self._etags[path] = (signature, digest.hexdigest())
+        return digest.hexdigest()
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        with open(os.path.join(self.root, LOCAL_LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def location(self, key: str) -> str:
+        return self._path(key)
+
+    def get_object(self, key: str) -> bytes:
+        with open(self._existing_path(key, "GetObject"), "rb") as file:
+            return file.read()
+
+    def get_object_range(self, key: str, start: int, end: int) -> bytes:
+        with open(self._existing_path(key, "GetObject"), "rb") as file:
+            if self.memory_map:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return b""
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return mapped[start:end]
+            file.seek(start)
+            return file.read(max(end - start, 0))
+
+    def get_object_with_etag(self, key: str) -> Tuple[bytes, str]:
+        path = self._existing_path(key, "GetObject")
+        with self._lock():
+            return self.get_object(key), self._etag(path, cached=False)
+
+    def _object_info(self, path: str) -> S3ObjectInfo:
+        key = os.path.relpath(path, self.root).replace(os.sep, "/")
+        return S3ObjectInfo(key, os.path.getsize(path), self._etag(path))
+
+    def list_objects_in_prefix(self, prefix: str) -> List[S3ObjectInfo]:
+        directory, _, name_prefix = prefix.rpartition("/")
+        search_root = self._path(directory) if directory else self.root
+        if not os.path.isdir(search_root):
+            return []
+        objects = []
+        for entry in os.scandir(search_root):
+            if entry.name.startswith(".") or not entry.name.startswith(name_prefix):
+                continue
+            if entry.is_file():
+                objects.append(self._object_info(entry.path))
+                continue
+            for dirpath, dirnames, filenames in os.walk(entry.path):
+                dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+                objects.extend(
+                    self._object_info(os.path.join(dirpath, filename))
+                    for filename in filenames
+                    if not filename.startswith(".")
+                )
+        return sorted(objects)
+
+    def put_object(
+        self,
+        key: str,
+        body: bytes,
+        if_match: Optional[str] = None,
+        if_none_match: bool = False,
+    ) -> str:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = os.path.join(
+            os.path.dirname(path), f".{os.path.basename(path)}.{uuid.uuid4().hex}"
+        )
+        with open(temp_path, "wb") as file:
+            file.write(body)
+        with self._lock():
+            exists = os.path.isfile(path)
+            if (if_none_match and exists) or (
+                if_match is not None
+                and (not exists or self._etag(path, cached=False) != if_match)
+            ):
+                os.remove(temp_path)
+                raise self._client_error(
+                    S3ConflictErrorCodes.PRECONDITION_FAILED.value, "PutObject"
+                )
+            os.replace(temp_path, path)
+            return self._etag(path, cached=False)
+
+    def put_mirrored_object(self, key: str, body: bytes, etag: str) -> str:
+        local_etag = self.put_object(key, body)
+        etag_path = self._etag_path(self._path(key))
+        temp_path = f"{etag_path}.{uuid.uuid4().hex}"
+        with open(temp_path, "w") as file:
+            file.write(f"{local_etag} {etag}")
+        os.replace(temp_path, etag_path)
+        return etag
+
+    def delete_object(self, key: str) -> None:
+        for path in [self._path(key), self._etag_path(self._path(key))]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def read_csv_to_df(
+        self,
+        key: str,
+        encoding: str = "utf-8",
+        delimeter: str = ",",
+        dtype: Optional[type] = None,
+    ) -> pd.DataFrame:
+        path = self._existing_path(key, "GetObject")
+        self._logger.info(f"Reading file {path}")
+        return pd.read_csv(
+            path,
+            encoding=encoding,
+            delimiter=delimeter,
+            dtype=dtype,
+            memory_map=self.memory_map,
+        )
+
+    def read_csv_to_dfs(
+        self,
+        keys: Iterable[str],
+        encoding: str = "utf-8",
+        delimeter: str = ",",
+        dtype: Optional[type] = None,
+        admit: Optional[Callable[[str, bool], bool]] = None,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        for key in keys:
+            if admit is not None:
+                admit(key, True)
+            yield key, self.read_csv_to_df(key, encoding, delimeter, dtype)
+
+    def read_parquet_to_df(self, key: str) -> pd.DataFrame:
+        path = self._existing_path(key, "GetObject")
+        self._logger.info(f"Reading file {path}")
+        return pd.read_parquet(path, memory_map=self.memory_map)
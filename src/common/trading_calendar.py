@@ -0,0 +1,63 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import logging
+from pathlib import Path
+import pandas as pd
+from typing import FrozenSet, Iterable, List
+
+from .constants import MetaProcessFormat
+from .custom_exceptions import WrongCalendarException
+
+CALENDAR_DATA_DIR = Path(__file__).resolve().parent / "data"
+
+TRADING_CALENDARS = {
+    "xetra": CALENDAR_DATA_DIR / "xetra_holidays.csv",
+}
+
+
+class TradingCalendar:
+    def __init__(
+        self, holidays: Iterable[date] = (), weekend: Iterable[int] = (5, 6)
+    ) -> None:
+        self.holidays: FrozenSet[date] = frozenset(holidays)
+        self.weekend: FrozenSet[int] = frozenset(weekend)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "TradingCalendar":
+        df = pd.read_csv(path)
+        holidays = [
+            datetime.strptime(day, MetaProcessFormat.DATE_FORMAT.value).date()
+            for day in df["date"]
+        ]
+        return cls(holidays)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def from_name(cls, name: str) -> "TradingCalendar":
+        if name not in TRADING_CALENDARS:
+            logging.getLogger(__name__).warning(
+                f"The trading calendar {name} is not supported!"
+            )
+            raise WrongCalendarException
+        return cls.from_csv(TRADING_CALENDARS[name])
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() not in self.weekend and day not in self.holidays
+
+    def previous_trading_day(self, day: date) -> date:
+        day -= timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def trading_days(self, start: date, end: date) -> List[date]:
+        return [
+            start + timedelta(days=x)
+            for x in range(0, (end - start).days + 1)
+            if self.is_trading_day(start + timedelta(days=x))
+        ]
+
+
+class DailyCalendar(TradingCalendar):
+    def __init__(self) -> None:
+        super().__init__(weekend=())
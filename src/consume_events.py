@@ -0,0 +1,44 @@
+import argparse
+import logging
+
+from src.run import build_connectors, build_report_engine, load_config
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Consume S3 object-created notifications and run the "
+        "intraday Xetra ETL for the announced source files."
+    )
+    parser.add_argument(
+        "--max-polls",
+        type=int,
+        default=None,
+        help="stop after this many polls (default: run forever)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from src.common.sqs import SQSQueueConnector
+    from src.transformers.event_consumer import XetraEventConsumer
+
+    config = load_config()
+    logger = logging.getLogger(__name__)
+
+    events_config = dict(config["events"])
+    queue = SQSQueueConnector(
+        endpoint_url=events_config.pop("endpoint_url"),
+        queue_url=events_config.pop("queue_url"),
+    )
+    logger.info("Starting Xetra event consumer...")
+    XetraEventConsumer(
+        queue=queue,
+        report_engine=build_report_engine(config, *build_connectors(config)),
+        **events_config,
+    ).run(args.max_polls)
+    logger.info("Xetra event consumer finished.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import logging
+
+from src.run import load_config
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Mirror Xetra source dates onto local disk, transferring only "
+        "new or changed objects."
+    )
+    parser.add_argument("first_date")
+    parser.add_argument("last_date")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=None,
+        help="parallel transfers (default: mirror.max_workers from the config)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from src.common.bucket_mirror import BucketMirror
+    from src.common.s3 import S3BucketConnector, S3RetryConfig
+    from src.common.storage import LocalBucketConnector
+    from src.common.trading_calendar import TradingCalendar
+
+    config = load_config()
+    logger = logging.getLogger(__name__)
+
+    s3_config = config["s3"]
+    mirror_config = config["mirror"]
+    trading_calendar = config["source"].get("trading_calendar")
+    bucket_mirror = BucketMirror(
+        source=S3BucketConnector(
+            endpoint_url=s3_config["src_endpoint_url"],
+            bucket=s3_config["src_bucket"],
+            retry_args=S3RetryConfig(**s3_config.get("retry", {})),
+        ),
+        mirror=LocalBucketConnector(
+            root=mirror_config["root"], bucket=s3_config["src_bucket"]
+        ),
+        calendar=(
+            TradingCalendar.from_name(trading_calendar) if trading_calendar else None
+        ),
+        max_workers=args.max_workers or mirror_config["max_workers"],
+    )
+    logger.info(f"Mirroring Xetra source {args.first_date} to {args.last_date}...")
+    stats = bucket_mirror.sync(args.first_date, args.last_date)
+    logger.info(
+        f"Xetra mirror finished: {stats.copied} copied, {stats.skipped} unchanged, "
+        f"{stats.deleted} deleted."
+    )
+
+
+if __name__ == "__main__":
+    main()
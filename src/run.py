@@ -1,47 +1,185 @@
+import argparse
+from datetime import datetime
 import logging
 import logging.config
 from pathlib import Path
-import yaml
+from typing import TYPE_CHECKING, Tuple
 
-from src.common.s3 import S3BucketConnector
-from src.transformers.xetra_transformer import (
-    XetraETL,
-    XetraSourceConfig,
-    XetraTargetConfig,
-)
+from src.common.constants import MetaProcessFormat
 
+if TYPE_CHECKING:
+    from src.common.storage import BucketConnector
+    from src.transformers.report_engine import XetraReportEngine
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Xetra ETL job.")
+    parser.add_argument(
+        "--intraday",
+        action="store_true",
+        help="fold new hourly files into running aggregates and publish "
+        "provisional reports",
+    )
+    parser.add_argument(
+        "--date",
+        default=None,
+        help="source date for --intraday (default: today, resolved at each run)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="stay resident and run the job on the configured cron schedule",
+    )
+    parser.add_argument(
+        "--schedule",
+        default=None,
+        help="cron expression overriding daemon.schedule from the config",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="validate the config and print the planned runs without touching S3",
+    )
+    return parser.parse_args(argv)
+
+
+def load_config() -> dict:
+    import yaml
 
-def main():
     base_dir = Path(__file__).resolve().parent.parent
     config_path = base_dir / "configs/xetra_report1_config.yml"
     config = yaml.safe_load(open(config_path))
+    logging.config.dictConfig(config["logging"])
+    return config
 
-    log_config = config["logging"]
-    logging.config.dictConfig(log_config)
-    logger = logging.getLogger(__name__)
+
+def build_connectors(config: dict) -> Tuple["BucketConnector", "BucketConnector"]:
+    from src.common.concurrency import TransferConcurrencyConfig
+    from src.common.s3 import S3BucketConnector, S3RetryConfig
+    from src.common.storage import LocalBucketConnector
 
     s3_config = config["s3"]
-    s3_bucket_src = S3BucketConnector(
-        endpoint_url=s3_config["src_endpoint_url"], bucket=s3_config["src_bucket"]
-    )
-    s3_bucket_trg = S3BucketConnector(
-        endpoint_url=s3_config["trg_endpoint_url"], bucket=s3_config["trg_bucket"]
+    retry_config = S3RetryConfig(**s3_config.get("retry", {}))
+    transfer_config = TransferConcurrencyConfig(**s3_config.get("transfer", {}))
+
+    def build_connector(side: str) -> "BucketConnector":
+        local_root = s3_config.get(f"{side}_local_root")
+        if local_root:
+            return LocalBucketConnector(
+                root=local_root,
+                bucket=s3_config[f"{side}_bucket"],
+                memory_map=s3_config.get("local_memory_map", False),
+            )
+        return S3BucketConnector(
+            endpoint_url=s3_config[f"{side}_endpoint_url"],
+            bucket=s3_config[f"{side}_bucket"],
+            retry_args=retry_config,
+            transfer_args=transfer_config,
+        )
+
+    return build_connector("src"), build_connector("trg")
+
+
+def build_report_engine(
+    config: dict,
+    s3_bucket_src: "BucketConnector",
+    s3_bucket_trg: "BucketConnector",
+) -> "XetraReportEngine":
+    from src.transformers.report_engine import XetraReportConfig, XetraReportEngine
+    from src.transformers.xetra_transformer import (
+        XetraSourceConfig,
+        XetraTargetConfig,
     )
 
     source_config = XetraSourceConfig(**config["source"])
-    target_config = XetraTargetConfig(**config["target"])
-    meta_config = config["meta"]
+    report_configs = [
+        XetraReportConfig(
+            name=report["name"],
+            transform=report["transform"],
+            meta_key=report["meta_key"],
+            target=XetraTargetConfig(**report["target"]),
+        )
+        for report in config["reports"]
+    ]
+    engine_config = config.get("engine", {})
 
-    logger.info("Starting Xetra ETL job...")
-    xetra_etl = XetraETL(
+    return XetraReportEngine(
         s3_bucket_src=s3_bucket_src,
         s3_bucket_trg=s3_bucket_trg,
-        meta_key=meta_config["key"],
         src_args=source_config,
-        trg_args=target_config,
+        reports=report_configs,
+        **engine_config,
     )
-    xetra_etl.etl_report1()
-    logger.info("Xetra ETL job finished.")
+
+
+def run_job(
+    config: dict,
+    args: argparse.Namespace,
+    s3_bucket_src: "BucketConnector",
+    s3_bucket_trg: "BucketConnector",
+) -> None:
+    report_engine = build_report_engine(config, s3_bucket_src, s3_bucket_trg)
+    if args.intraday:
+        report_engine.run_intraday(
+            args.date or datetime.today().strftime(MetaProcessFormat.DATE_FORMAT.value)
+        )
+    else:
+        report_engine.run()
+
+
+def run_daemon(config: dict, args: argparse.Namespace) -> None:
+    from src.common.schedule import CronSchedule, ScheduledRunner
+
+    logger = logging.getLogger(__name__)
+    schedule = CronSchedule.from_expression(
+        args.schedule or config["daemon"]["schedule"]
+    )
+    s3_bucket_src, s3_bucket_trg = build_connectors(config)
+
+    def job() -> None:
+        s3_bucket_src.refresh_credentials()
+        s3_bucket_trg.refresh_credentials()
+        logger.info("Starting scheduled Xetra ETL run...")
+        run_job(config, args, s3_bucket_src, s3_bucket_trg)
+        logger.info("Scheduled Xetra ETL run finished.")
+
+    ScheduledRunner(schedule, job).run()
+
+
+def dry_run(config: dict, args: argparse.Namespace) -> None:
+    logger = logging.getLogger(__name__)
+    mode = "intraday for " + (args.date or "today") if args.intraday else "daily"
+    for report in config["reports"]:
+        logger.info(
+            f"Would run {mode} report {report['name']} "
+            f"({report['transform']}) into {report['target']['key']}"
+        )
+    if args.daemon:
+        from src.common.schedule import CronSchedule
+
+        schedule = CronSchedule.from_expression(
+            args.schedule or config["daemon"]["schedule"]
+        )
+        next_run = datetime.now()
+        for _ in range(3):
+            next_run = schedule.next_run(next_run)
+            logger.info(f"Would run at {next_run}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config()
+    logger = logging.getLogger(__name__)
+
+    if args.dry_run:
+        dry_run(config, args)
+    elif args.daemon:
+        logger.info("Starting Xetra ETL daemon...")
+        run_daemon(config, args)
+    else:
+        logger.info("Starting Xetra ETL job...")
+        run_job(config, args, *build_connectors(config))
+        logger.info("Xetra ETL job finished.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,284 @@
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds  # type: ignore[import-untyped]
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Type, Union
+
+from ..common.arrow_spill import ArrowSpillDataset
+from ..common.constants import ExecutionBackends
+
+if TYPE_CHECKING:
+    from .xetra_transformer import XetraExtract, XetraSourceConfig, XetraTargetConfig
+
+DUCKDB_INTEGER_TYPES = {"TINYINT", "SMALLINT", "INTEGER", "BIGINT"}
+ROW_NUMBER_COL = "rn"
+OPEN_TIME_COL = "OpenTime"
+CLOSE_TIME_COL = "CloseTime"
+
+
+class DuckDBBackend:
+    def __init__(
+        self, src_args: "XetraSourceConfig", trg_args: "XetraTargetConfig"
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.src_args = src_args
+        self.trg_args = trg_args
+
+    def _connect(self) -> Any:
+        import duckdb
+
+        config: Dict[str, Any] = {}
+        if self.src_args.backend_threads:
+            config["threads"] = self.src_args.backend_threads
+        if self.src_args.backend_memory_limit:
+            config["memory_limit"] = self.src_args.backend_memory_limit
+        if self.src_args.spill_dir:
+            config["temp_directory"] = self.src_args.spill_dir
+        return duckdb.connect(config=config)
+
+    def _volume_sum(self, con: Any) -> str:
+        col_volume = self.src_args.col_traded_volume
+        volume_type = con.sql(f'SELECT "{col_volume}" FROM src LIMIT 0').types[0]
+        if str(volume_type) in DUCKDB_INTEGER_TYPES:
+            return f'CAST(sum("{col_volume}") AS BIGINT)'
+        return f'sum("{col_volume}")'
+
+    def aggregate_daily(self, extract: "XetraExtract") -> pd.DataFrame:
+        src, trg = self.src_args, self.trg_args
+        rn = ROW_NUMBER_COL
+        con = self._connect()
+        try:
+            if isinstance(extract, ArrowSpillDataset):
+                source = ds.dataset([str(path) for path in extract.files], format="ipc")
+            else:
+                source = extract
+            con.register("src", source)
+            query = f"""
+                SELECT
+                    "{src.col_isin}",
+                    "{src.col_date}",
+                    first("{src.col_start_price}" ORDER BY "{src.col_time}", {rn})
+                        FILTER (WHERE "{src.col_start_price}" IS NOT NULL)
+                        AS "{trg.col_opening_price}",
+                    last("{src.col_start_price}" ORDER BY "{src.col_time}", {rn})
+                        FILTER (WHERE "{src.col_start_price}" IS NOT NULL)
+                        AS "{trg.col_closing_price}",
+                    min("{src.col_min_price}") AS "{trg.col_min_price}",
+                    max("{src.col_max_price}") AS "{trg.col_max_price}",
+                    {self._volume_sum(con)} AS "{trg.col_daily_trading_volume}"
+                FROM (SELECT *, row_number() OVER () AS {rn} FROM src)
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+            """
+            self._logger.info("Running report 1 aggregation with DuckDB backend...")
+            return con.execute(query).df()
+        finally:
+            con.close()
+
+
+def _time_codes(times: np.ndarray) -> np.ndarray:
+    codes, uniques = pd.factorize(pd.Series(times), sort=True)
+    codes[codes < 0] = len(uniques)
+    return codes
+
+
+def _time_order(group_ids: np.ndarray, times: np.ndarray) -> np.ndarray:
+    return np.argsort(group_ids * (int(times.max()) + 1) + times, kind="stable")
+
+
+def _boundary_rows(
+    sorted_ids: np.ndarray, sorted_values: np.ndarray, last: bool
+) -> np.ndarray:
+    if sorted_values.dtype.kind == "f":
+        rows = np.flatnonzero(~np.isnan(sorted_values))
+    else:
+        rows = np.arange(len(sorted_values))
+    if not len(rows):
+        return rows
+    ids = sorted_ids[rows]
+    if last:
+        boundary = np.append(ids[1:] != ids[:-1], True)
+    else:
+        boundary = np.insert(ids[1:] != ids[:-1], 0, True)
+    return rows[boundary]
+
+
+def _take_by_group(
+    sorted_ids: np.ndarray,
+    sorted_values: np.ndarray,
+    rows: np.ndarray,
+    groups: np.ndarray,
+) -> np.ndarray:
+    result = np.full(
+        len(groups),
+        np.nan,
+        dtype=object if sorted_values.dtype.kind == "O" else np.float64,
+    )
+    result[np.searchsorted(groups, sorted_ids[rows])] = sorted_values[rows]
+    if sorted_values.dtype.kind in "iu" and len(rows) == len(groups):
+        return result.astype(sorted_values.dtype)
+    return result
+
+
+def ohlcv_kernel(
+    group_ids: np.ndarray,
+    open_times: np.ndarray,
+    open_prices: np.ndarray,
+    close_times: np.ndarray,
+    close_prices: np.ndarray,
+    min_prices: np.ndarray,
+    max_prices: np.ndarray,
+    volumes: np.ndarray,
+    labels: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, ...]:
+    order = _time_order(group_ids, open_times)
+    sorted_ids = group_ids[order]
+    starts = np.flatnonzero(np.insert(sorted_ids[1:] != sorted_ids[:-1], 0, True))
+    groups = sorted_ids[starts]
+    if close_times is open_times:
+        close_order, close_ids = order, sorted_ids
+    else:
+        close_order = _time_order(group_ids, close_times)
+        close_ids = group_ids[close_order]
+    sorted_open, sorted_close = open_prices[order], close_prices[close_order]
+    open_rows = _boundary_rows(sorted_ids, sorted_open, last=False)
+    close_rows = _boundary_rows(close_ids, sorted_close, last=True)
+    volumes = volumes[order]
+    if volumes.dtype.kind == "f":
+        volumes = np.nan_to_num(volumes)
+    else:
+        volumes = volumes.astype(np.int64)
+    result = (
+        groups,
+        _take_by_group(sorted_ids, sorted_open, open_rows, groups),
+        _take_by_group(close_ids, sorted_close, close_rows, groups),
+        np.fmin.reduceat(min_prices[order], starts),
+        np.fmax.reduceat(max_prices[order], starts),
+        np.add.reduceat(volumes, starts),
+    )
+    if labels is None:
+        return result
+    return result + (
+        _take_by_group(sorted_ids, labels[order], open_rows, groups),
+        _take_by_group(close_ids, labels[close_order], close_rows, groups),
+    )
+
+
+class NumPyBackend:
+    def __init__(
+        self, src_args: "XetraSourceConfig", trg_args: "XetraTargetConfig"
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.src_args = src_args
+        self.trg_args = trg_args
+
+    def _aggregate(
+        self,
+        df: pd.DataFrame,
+        col_open_time: str,
+        col_open: str,
+        col_close_time: str,
+        col_close: str,
+        col_min: str,
+        col_max: str,
+        col_volume: str,
+        include_times: bool = False,
+    ) -> pd.DataFrame:
+        trg = self.trg_args
+        isin_codes, isins = pd.factorize(df[self.src_args.col_isin], sort=True)
+        date_codes, dates = pd.factorize(df[self.src_args.col_date], sort=True)
+        valid = (isin_codes >= 0) & (date_codes >= 0)
+        group_ids = isin_codes[valid].astype(np.int64) * len(dates) + date_codes[valid]
+        columns = [
+            self.src_args.col_isin,
+            self.src_args.col_date,
+            trg.col_opening_price,
+            trg.col_closing_price,
+            trg.col_min_price,
+            trg.col_max_price,
+            trg.col_daily_trading_volume,
+        ] + ([OPEN_TIME_COL, CLOSE_TIME_COL] if include_times else [])
+        if not len(group_ids):
+            return pd.DataFrame(columns=columns)
+        open_times = _time_codes(df[col_open_time].to_numpy()[valid])
+        close_times = (
+            open_times
+            if col_close_time == col_open_time
+            else _time_codes(df[col_close_time].to_numpy()[valid])
+        )
+        groups, *measures = ohlcv_kernel(
+            group_ids,
+            open_times,
+            df[col_open].to_numpy()[valid],
+            close_times,
+            df[col_close].to_numpy()[valid],
+            df[col_min].to_numpy()[valid],
+            df[col_max].to_numpy()[valid],
+            df[col_volume].to_numpy()[valid],
+            labels=(
+                df[self.src_args.col_time].to_numpy()[valid] if include_times else None
+            ),
+        )
+        return pd.DataFrame(
+            dict(
+                zip(
+                    columns,
+                    [isins.take(groups // len(dates)), dates.take(groups % len(dates))]
+                    + measures,
+                )
+            )
+        )
+
+    def aggregate_daily(self, extract: "XetraExtract") -> pd.DataFrame:
+        src, trg = self.src_args, self.trg_args
+        self._logger.info("Running report 1 aggregation with NumPy backend...")
+        if not isinstance(extract, ArrowSpillDataset):
+            return self._aggregate(
+                extract,
+                src.col_time,
+                src.col_start_price,
+                src.col_time,
+                src.col_start_price,
+                src.col_min_price,
+                src.col_max_price,
+                src.col_traded_volume,
+            )
+        columns = [
+            src.col_isin,
+            src.col_date,
+            src.col_time,
+            src.col_start_price,
+            src.col_min_price,
+            src.col_max_price,
+            src.col_traded_volume,
+        ]
+        partials = [
+            self._aggregate(
+                df,
+                src.col_time,
+                src.col_start_price,
+                src.col_time,
+                src.col_start_price,
+                src.col_min_price,
+                src.col_max_price,
+                src.col_traded_volume,
+                include_times=True,
+            )
+            for df in extract.iter_frames(columns)
+        ]
+        return self._aggregate(
+            pd.concat(partials, ignore_index=True),
+            OPEN_TIME_COL,
+            trg.col_opening_price,
+            CLOSE_TIME_COL,
+            trg.col_closing_price,
+            trg.col_min_price,
+            trg.col_max_price,
+            trg.col_daily_trading_volume,
+        )
+
+
+BACKENDS: Dict[str, Type[Union[DuckDBBackend, NumPyBackend]]] = {
+    ExecutionBackends.DUCKDB.value: DuckDBBackend,
+    ExecutionBackends.NUMPY.value: NumPyBackend,
+}
@@ -0,0 +1,202 @@
+from datetime import datetime
+import logging
+import os
+import socket
+import time
+from typing import List, NamedTuple, Optional
+import uuid
+
+import pandas as pd
+
+from ..common.arrow_spill import ArrowSpillDataset
+from ..common.constants import MetaProcessFormat, S3FileTypes
+from ..common.custom_exceptions import LeaseLostException
+from ..common.meta_process import MetaProcess
+from ..common.storage import BucketConnector
+from ..common.s3_lease import S3Lease
+from ..common.trading_calendar import DailyCalendar, TradingCalendar
+from .xetra_transformer import XetraETL, XetraSourceConfig, XetraTargetConfig
+
+BACKFILL_ITEMS_DIR = "items"
+BACKFILL_LEASES_DIR = "leases"
+BACKFILL_DONE_DIR = "done"
+
+
+class XetraBackfillConfig(NamedTuple):
+    prefix: str = "backfill/report1"
+    chunk_days: int = 20
+    lease_seconds: float = 900.0
+    poll_seconds: float = 60.0
+
+
+class XetraBackfill:
+    def __init__(
+        self,
+        s3_bucket_src: BucketConnector,
+        s3_bucket_trg: BucketConnector,
+        meta_key: str,
+        src_args: XetraSourceConfig,
+        trg_args: XetraTargetConfig,
+        backfill_args: XetraBackfillConfig = XetraBackfillConfig(),
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.s3_bucket_src = s3_bucket_src
+        self.s3_bucket_trg = s3_bucket_trg
+        self.meta_key = meta_key
+        self.src_args = src_args
+        self.trg_args = trg_args
+        self.backfill_args = backfill_args
+        self.calendar = (
+            TradingCalendar.from_name(self.src_args.trading_calendar)
+            if self.src_args.trading_calendar
+            else DailyCalendar()
+        )
+
+    def _key(self, directory: str, item: str = "") -> str:
+        return f"{self.backfill_args.prefix}/{directory}/{item}"
+
+    def _list_items(self, directory: str) -> List[str]:
+        prefix = self._key(directory)
+        return sorted(
+            obj.key[len(prefix) :].rsplit(".", 1)[0]
+            for obj in self.s3_bucket_trg.list_objects_in_prefix(prefix)
+        )
+
+    def _read_dates(self, key: str) -> List[str]:
+        df = self.s3_bucket_trg.read_csv_to_df(key, dtype=str)
+        return list(df[MetaProcessFormat.SOURCE_DATE_COL.value])
+
+    def _write_dates(self, key: str, dates: List[str]) -> None:
+        self.s3_bucket_trg.write_df_to_s3(
+            pd.DataFrame({MetaProcessFormat.SOURCE_DATE_COL.value: dates}),
+            key,
+            S3FileTypes.CSV.value,
+        )
+
+    def publish(self, first_date: str, last_date: str) -> List[str]:
+        dates = [
+            day.strftime(MetaProcessFormat.DATE_FORMAT.value)
+            for day in self.calendar.trading_days(
+                datetime.strptime(
+                    first_date, MetaProcessFormat.DATE_FORMAT.value
+                ).date(),
+                datetime.strptime(
+                    last_date, MetaProcessFormat.DATE_FORMAT.value
+                ).date(),
+            )
+        ]
+        items = []
+        for start in range(0, len(dates), self.backfill_args.chunk_days):
+            chunk = dates[start : start + self.backfill_args.chunk_days]
+            item = f"{chunk[0]}_{chunk[-1]}"
+            self._write_dates(
+                self._key(BACKFILL_ITEMS_DIR, f"{item}.{S3FileTypes.CSV.value}"),
+                chunk,
+            )
+            items.append(item)
+        self._logger.info(f"Published {len(items)} backfill work items.")
+        return items
+
+    def _is_done(self, item: str) -> bool:
+        return bool(
+            self.s3_bucket_trg.list_objects_in_prefix(
+                self._key(BACKFILL_DONE_DIR, f"{item}.{S3FileTypes.CSV.value}")
+            )
+        )
+
+    def pending_items(self) -> List[str]:
+        done = set(self._list_items(BACKFILL_DONE_DIR))
+        return [
+            item for item in self._list_items(BACKFILL_ITEMS_DIR) if item not in done
+        ]
+
+    def process_item(self, item: str, lease: S3Lease) -> None:
+        dates = self._read_dates(
+            self._key(BACKFILL_ITEMS_DIR, f"{item}.{S3FileTypes.CSV.value}")
+        )
+        previous_date = self.calendar.previous_trading_day(
+            datetime.strptime(dates[0], MetaProcessFormat.DATE_FORMAT.value).date()
+        ).strftime(MetaProcessFormat.DATE_FORMAT.value)
+        xetra_etl = XetraETL(
+            self.s3_bucket_src,
+            self.s3_bucket_trg,
+            self.meta_key,
+            self.src_args,
+            self.trg_args._replace(key=f"{self.trg_args.key}_backfill_{item}"),
+            date_window=(dates[0], [previous_date] + dates),
+        )
+        extracted = xetra_etl.extract(xetra_etl.read_daily_cache())
+        try:
+            lease.renew(item)
+            df = xetra_etl.transform_report1(extracted)
+        finally:
+            if isinstance(extracted, ArrowSpillDataset):
+                extracted.cleanup()
+        lease.renew(item)
+        xetra_etl.write_report(df)
+        self._write_dates(
+            self._key(BACKFILL_DONE_DIR, f"{item}.{S3FileTypes.CSV.value}"), dates
+        )
+        self._logger.info(f"Backfill item {item} done.")
+
+    def work(
+        self, worker_id: Optional[str] = None, max_items: Optional[int] = None
+    ) -> int:
+        worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        lease = S3Lease(
+            self.s3_bucket_trg,
+            self._key(BACKFILL_LEASES_DIR).rstrip("/"),
+            worker_id,
+            self.backfill_args.lease_seconds,
+        )
+        processed = 0
+        while max_items is None or processed < max_items:
+            pending = self.pending_items()
+            if not pending:
+                break
+            claimed = next((item for item in pending if lease.acquire(item)), None)
+            if claimed is None:
+                time.sleep(self.backfill_args.poll_seconds)
+                continue
+            try:
+                if self._is_done(claimed):
+                    continue
+                self.process_item(claimed, lease)
+                processed += 1
+            except LeaseLostException:
+                continue
+            finally:
+                lease.release(claimed)
+        self._logger.info(f"Worker {worker_id} processed {processed} items.")
+        return processed
+
+    def commit_metadata(self) -> List[str]:
+        df_meta = MetaProcess.read_csv_or_none(self.s3_bucket_trg, self.meta_key)
+        processed = (
+            set()
+            if df_meta is None
+            else set(df_meta[MetaProcessFormat.SOURCE_DATE_COL.value])
+        )
+        dates = sorted(
+            {
+                date
+                for item in self._list_items(BACKFILL_DONE_DIR)
+                for date in self._read_dates(
+                    self._key(BACKFILL_DONE_DIR, f"{item}.{S3FileTypes.CSV.value}")
+                )
+            }
+            - processed
+        )
+        if dates:
+            XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.src_args,
+                self.trg_args,
+                date_window=(dates[0], dates),
+            ).commit_metadata()
+        self._logger.info(f"Committed {len(dates)} backfilled dates to the meta file.")
+        return dates
@@ -0,0 +1,204 @@
+from functools import reduce
+import logging
+from math import gcd
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from ..common.arrow_spill import ArrowSpillDataset
+from ..common.custom_exceptions import WrongResolutionException
+from .backends import CLOSE_TIME_COL, OPEN_TIME_COL, _time_codes, ohlcv_kernel
+
+if TYPE_CHECKING:
+    from .xetra_transformer import XetraExtract, XetraSourceConfig, XetraTargetConfig
+
+BAR_START_COL = "BarStart"
+MINUTES_PER_DAY = 24 * 60
+BAR_TIME_LABELS = np.array(
+    [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(MINUTES_PER_DAY)],
+    dtype=object,
+)
+
+
+def _minutes_of_day(times: np.ndarray) -> np.ndarray:
+    codes, uniques = pd.factorize(pd.Series(times))
+    labels = pd.Series(uniques, dtype=object).astype(str)
+    minutes = (
+        pd.to_numeric(labels.str[:2], errors="coerce") * 60
+        + pd.to_numeric(labels.str[3:5], errors="coerce")
+    ).to_numpy(dtype=np.float64)
+    return np.append(minutes, np.nan)[codes]
+
+
+class OHLCVBarEngine:
+    def __init__(
+        self,
+        src_args: "XetraSourceConfig",
+        trg_args: "XetraTargetConfig",
+        resolutions: List[int],
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        if not resolutions or any(
+            not 0 < resolution <= MINUTES_PER_DAY for resolution in resolutions
+        ):
+            self._logger.warning(f"The bar resolutions {resolutions} are not valid!")
+            raise WrongResolutionException
+        self.src_args = src_args
+        self.trg_args = trg_args
+        self.resolutions = sorted(set(resolutions))
+        self.base_resolution = reduce(gcd, self.resolutions)
+        self.plan: List[Tuple[int, int]] = []
+        derived = [self.base_resolution]
+        for resolution in self.resolutions:
+            if resolution == self.base_resolution:
+                continue
+            source = max(r for r in derived if resolution % r == 0)
+            self.plan.append((resolution, source))
+            derived.append(resolution)
+
+    def _aggregate(
+        self,
+        isins: np.ndarray,
+        dates: np.ndarray,
+        starts: np.ndarray,
+        open_times: np.ndarray,
+        open_prices: np.ndarray,
+        close_times: Optional[np.ndarray],
+        close_prices: np.ndarray,
+        min_prices: np.ndarray,
+        max_prices: np.ndarray,
+        volumes: np.ndarray,
+        labels: Optional[np.ndarray] = None,
+    ) -> pd.DataFrame:
+        trg = self.trg_args
+        isin_codes, isin_values = pd.factorize(pd.Series(isins), sort=True)
+        date_codes, date_values = pd.factorize(pd.Series(dates), sort=True)
+        start_codes, start_values = pd.factorize(pd.Series(starts), sort=True)
+        valid = (isin_codes >= 0) & (date_codes >= 0) & (start_codes >= 0)
+        group_ids = (
+            isin_codes[valid].astype(np.int64) * len(date_values) + date_codes[valid]
+        ) * len(start_values) + start_codes[valid]
+        columns = [
+            trg.col_isin,
+            trg.col_date,
+            BAR_START_COL,
+            trg.col_opening_price,
+            trg.col_closing_price,
+            trg.col_min_price,
+            trg.col_max_price,
+            trg.col_daily_trading_volume,
+        ] + ([OPEN_TIME_COL, CLOSE_TIME_COL] if labels is not None else [])
+        if not len(group_ids):
+            return pd.DataFrame(columns=columns)
+        open_times = open_times[valid]
+        groups, *measures = ohlcv_kernel(
+            group_ids,
+            open_times,
+            open_prices[valid],
+            open_times if close_times is None else close_times[valid],
+            close_prices[valid],
+            min_prices[valid],
+            max_prices[valid],
+            volumes[valid],
+            labels=None if labels is None else labels[valid],
+        )
+        day_groups = groups // len(start_values)
+        return pd.DataFrame(
+            dict(
+                zip(
+                    columns,
+                    [
+                        isin_values.take(day_groups // len(date_values)),
+                        date_values.take(day_groups % len(date_values)),
+                        start_values.take(groups % len(start_values)),
+                    ]
+                    + measures,
+                )
+            )
+        )
+
+    def _base_bars(self, df: pd.DataFrame, include_times: bool = False) -> pd.DataFrame:
+        src = self.src_args
+        times = df[src.col_time].to_numpy()
+        starts = _minutes_of_day(times) // self.base_resolution * self.base_resolution
+        return self._aggregate(
+            df[src.col_isin].to_numpy(),
+            df[src.col_date].to_numpy(),
+            starts,
+            _time_codes(times),
+            df[src.col_start_price].to_numpy(),
+            None,
+            df[src.col_start_price].to_numpy(),
+            df[src.col_min_price].to_numpy(),
+            df[src.col_max_price].to_numpy(),
+            df[src.col_traded_volume].to_numpy(),
+            labels=times if include_times else None,
+        )
+
+    def _combine_partials(self, partials: List[pd.DataFrame]) -> pd.DataFrame:
+        trg = self.trg_args
+        df = pd.concat(partials, ignore_index=True)
+        return self._aggregate(
+            df[trg.col_isin].to_numpy(),
+            df[trg.col_date].to_numpy(),
+            df[BAR_START_COL].to_numpy(),
+            _time_codes(df[OPEN_TIME_COL].to_numpy()),
+            df[trg.col_opening_price].to_numpy(),
+            _time_codes(df[CLOSE_TIME_COL].to_numpy()),
+            df[trg.col_closing_price].to_numpy(),
+            df[trg.col_min_price].to_numpy(),
+            df[trg.col_max_price].to_numpy(),
+            df[trg.col_daily_trading_volume].to_numpy(),
+        )
+
+    def _roll_up(self, df: pd.DataFrame, resolution: int) -> pd.DataFrame:
+        trg = self.trg_args
+        starts = df[BAR_START_COL].to_numpy()
+        return self._aggregate(
+            df[trg.col_isin].to_numpy(),
+            df[trg.col_date].to_numpy(),
+            starts // resolution * resolution,
+            starts.astype(np.int64),
+            df[trg.col_opening_price].to_numpy(),
+            None,
+            df[trg.col_closing_price].to_numpy(),
+            df[trg.col_min_price].to_numpy(),
+            df[trg.col_max_price].to_numpy(),
+            df[trg.col_daily_trading_volume].to_numpy(),
+        )
+
+    def bars(self, extract: "XetraExtract") -> pd.DataFrame:
+        src, trg = self.src_args, self.trg_args
+        self._logger.info(
+            f"Building OHLCV bars at {self.resolutions} minutes from "
+            f"{self.base_resolution} minute base bars..."
+        )
+        if isinstance(extract, ArrowSpillDataset):
+            columns = [
+                src.col_isin,
+                src.col_date,
+                src.col_time,
+                src.col_start_price,
+                src.col_min_price,
+                src.col_max_price,
+                src.col_traded_volume,
+            ]
+            df_base = self._combine_partials(
+                [
+                    self._base_bars(df, include_times=True)
+                    for df in extract.iter_frames(columns)
+                ]
+            )
+        else:
+            df_base = self._base_bars(extract)
+        levels: Dict[int, pd.DataFrame] = {self.base_resolution: df_base}
+        for resolution, source in self.plan:
+            levels[resolution] = self._roll_up(levels[source], resolution)
+        frames = []
+        for resolution in self.resolutions:
+            df_level = levels[resolution]
+            starts = df_level.pop(BAR_START_COL).to_numpy(dtype=np.int64)
+            df_level.insert(0, trg.col_bar_resolution, resolution)
+            df_level.insert(3, trg.col_bar_time, BAR_TIME_LABELS[starts])
+            frames.append(df_level)
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,114 @@
+from datetime import datetime
+import logging
+import time
+from typing import Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from ..common.constants import MetaProcessFormat
+from ..common.s3 import S3ObjectInfo
+from ..common.sqs import SQSMessage, SQSQueueConnector
+from .report_engine import XetraReportEngine
+
+
+class XetraEventConsumer:
+    def __init__(
+        self,
+        queue: SQSQueueConnector,
+        report_engine: XetraReportEngine,
+        batch_size: int = 100,
+        max_messages: int = 10,
+        wait_time_seconds: int = 20,
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        self.queue = queue
+        self.report_engine = report_engine
+        self.batch_size = batch_size
+        self.max_messages = max_messages
+        self.wait_time_seconds = wait_time_seconds
+
+    @staticmethod
+    def object_date(obj: S3ObjectInfo) -> Optional[str]:
+        date = obj.key.split("/", 1)[0]
+        try:
+            datetime.strptime(date, MetaProcessFormat.DATE_FORMAT.value)
+        except ValueError:
+            return None
+        return date
+
+    @classmethod
+    def group_objects_by_date(
+        cls,
+        objects: List[S3ObjectInfo],
+    ) -> Dict[str, List[S3ObjectInfo]]:
+        grouped: Dict[str, Dict[str, S3ObjectInfo]] = {}
+        for obj in objects:
+            date = cls.object_date(obj)
+            if date is not None:
+                grouped.setdefault(date, {})[obj.key] = obj
+        return {date: list(grouped[date].values()) for date in sorted(grouped)}
+
+    def receive_batch(self) -> List[SQSMessage]:
+        messages: List[SQSMessage] = []
+        wait_time_seconds = self.wait_time_seconds
+        while len(messages) < self.batch_size:
+            received = self.queue.receive_messages(
+                max_messages=min(self.max_messages, self.batch_size - len(messages)),
+                wait_time_seconds=wait_time_seconds,
+            )
+            if not received:
+                break
+            messages.extend(received)
+            wait_time_seconds = 0
+        return messages
+
+    def refresh_credentials(self) -> None:
+        self.queue.refresh_credentials()
+        self.report_engine.s3_bucket_src.refresh_credentials()
+        self.report_engine.s3_bucket_trg.refresh_credentials()
+
+    def poll_once(self) -> int:
+        try:
+            self.refresh_credentials()
+            messages = self.receive_batch()
+        except ClientError:
+            self._logger.exception("Receiving messages failed, polling again.")
+            time.sleep(self.wait_time_seconds)
+            return 0
+        if not messages:
+            return 0
+        events = self.group_objects_by_date(
+            [obj for message in messages for obj in message.objects]
+        )
+        self._logger.info(
+            f"Received {len(messages)} messages for {len(events)} source dates."
+        )
+        failed_dates = set()
+        for date, objects in events.items():
+            try:
+                self.report_engine.run_intraday(date, objects)
+            except Exception:
+                self._logger.exception(
+                    f"Intraday run for {date} failed, its messages will be "
+                    "redelivered."
+                )
+                failed_dates.add(date)
+        done = [
+            message
+            for message in messages
+            if not any(self.object_date(obj) in failed_dates for obj in message.objects)
+        ]
+        if done:
+            try:
+                self.queue.delete_messages(done)
+            except ClientError:
+                self._logger.exception(
+                    "Deleting messages failed, they will be redelivered."
+                )
+        return len(messages)
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            self.poll_once()
+            polls += 1
@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import pandas as pd
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from ..common.arrow_spill import ArrowSpillDataset
+from ..common.custom_exceptions import UnknownReportException
+from ..common.storage import BucketConnector, S3ObjectInfo
+from .xetra_transformer import (
+    XetraETL,
+    XetraExtract,
+    XetraSourceConfig,
+    XetraTargetConfig,
+)
+
+ReportTransform = Callable[[XetraETL, XetraExtract], pd.DataFrame]
+
+REPORT_TRANSFORMS: Dict[str, ReportTransform] = {
+    "report1": XetraETL.transform_report1,
+    "bars": XetraETL.transform_bars,
+}
+
+
+def register_report_transform(name: str, transform: ReportTransform) -> None:
+    REPORT_TRANSFORMS[name] = transform
+
+
+class XetraReportConfig(NamedTuple):
+    name: str
+    transform: str
+    meta_key: str
+    target: XetraTargetConfig
+
+
+class XetraReportEngine:
+    def __init__(
+        self,
+        s3_bucket_src: BucketConnector,
+        s3_bucket_trg: BucketConnector,
+        src_args: XetraSourceConfig,
+        reports: List[XetraReportConfig],
+        max_workers: int = 4,
+    ) -> None:
+        self._logger = logging.getLogger(__name__)
+        for report in reports:
+            if report.transform not in REPORT_TRANSFORMS:
+                self._logger.warning(
+                    f"Report {report.name} uses unknown transform {report.transform}!"
+                )
+                raise UnknownReportException
+        self.reports = reports
+        self.max_workers = max_workers
+        self.s3_bucket_src = s3_bucket_src
+        self.s3_bucket_trg = s3_bucket_trg
+        self.etls = {
+            report.name: XetraETL(
+                s3_bucket_src=s3_bucket_src,
+                s3_bucket_trg=s3_bucket_trg,
+                meta_key=report.meta_key,
+                src_args=src_args,
+                trg_args=report.target,
+            )
+            for report in reports
+        }
+        self.extract_date_list = sorted(
+            {date for etl in self.etls.values() for date in etl.read_daily_cache()}
+        )
+
+    def extract(self) -> XetraExtract:
+        if not self.etls:
+            return pd.DataFrame()
+        extractor = next(iter(self.etls.values()))
+        df = extractor.extract(self.extract_date_list)
+        for etl in self.etls.values():
+            for date, objects in extractor.day_objects.items():
+                etl.day_objects.setdefault(date, objects)
+        return df
+
+    def _run_report(self, report: XetraReportConfig, df: XetraExtract) -> None:
+        etl = self.etls[report.name]
+        self._logger.info(f"Running report {report.name}...")
+        df_report = REPORT_TRANSFORMS[report.transform](etl, df)
+        etl.load(df_report)
+        self._logger.info(f"Report {report.name} finished.")
+
+    def run(self) -> None:
+        df = self.extract()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._run_report, report, df)
+                    for report in self.reports
+                ]
+                for future in as_completed(futures):
+                    future.result()
+        finally:
+            if isinstance(df, ArrowSpillDataset):
+                df.cleanup()
+        self.log_transfer_stats()
+
+    def log_transfer_stats(self) -> None:
+        for side, connector in (
+            ("source", self.s3_bucket_src),
+            ("target", self.s3_bucket_trg),
+        ):
+            for direction, stats in connector.transfer_stats().items():
+                if stats.requests:
+                    self._logger.info(
+                        f"S3 {side} {direction}: concurrency {stats.concurrency} "
+                        f"(peak {stats.peak_concurrency}), {stats.requests} requests, "
+                        f"{stats.megabytes:.1f} MB at {stats.mb_per_s:.1f} MB/s, "
+                        f"{stats.throttled} throttled, {stats.backoffs} backoffs."
+                    )
+
+    def run_intraday(
+        self, date: str, objects: Optional[List[S3ObjectInfo]] = None
+    ) -> None:
+        etls = [
+            self.etls[report.name]
+            for report in self.reports
+            if report.transform == "report1" and report.target.intraday_state_key
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(etl.etl_report1_intraday, date, objects) for etl in etls
+            ]
+            for future in as_completed(futures):
+                future.result()
+        self.log_transfer_stats()
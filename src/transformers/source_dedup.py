@@ -0,0 +1,93 @@
+from datetime import datetime
+import hashlib
+import logging
+import pandas as pd
+from typing import Dict, List, Tuple
+
+from ..common.constants import MetaProcessFormat, QuarantineFormat, S3FileTypes
+from ..common.storage import BucketConnector, S3ObjectInfo
+
+
+class DuplicateSourceFilter:
+    def __init__(self) -> None:
+        self._logger = logging.getLogger(__name__)
+        self._by_etag: Dict[Tuple[int, str], str] = {}
+        self._by_size: Dict[int, List[S3ObjectInfo]] = {}
+        self._by_content: Dict[str, str] = {}
+        self.duplicates: List[Tuple[S3ObjectInfo, str, str]] = []
+
+    @staticmethod
+    def _is_multipart(obj: S3ObjectInfo) -> bool:
+        return "-" in obj.etag
+
+    def _add_duplicate(self, obj: S3ObjectInfo, original_key: str, match: str) -> None:
+        self._logger.warning(
+            f"Skipping source file {obj.key}, duplicate of {original_key} "
+            f"by {match}."
+        )
+        self.duplicates.append((obj, original_key, match))
+
+    def filter_objects(self, objects: List[S3ObjectInfo]) -> List[S3ObjectInfo]:
+        kept = []
+        for obj in objects:
+            original_key = self._by_etag.setdefault((obj.size, obj.etag), obj.key)
+            if original_key == obj.key:
+                if obj not in self._by_size.setdefault(obj.size, []):
+                    self._by_size[obj.size].append(obj)
+                    kept.append(obj)
+            else:
+                self._add_duplicate(
+                    obj, original_key, QuarantineFormat.MATCHED_BY_ETAG.value
+                )
+        return kept
+
+    def _needs_content_hash(self, obj: S3ObjectInfo) -> bool:
+        return any(
+            other.key != obj.key
+            and other.etag != obj.etag
+            and (self._is_multipart(obj) or self._is_multipart(other))
+            for other in self._by_size.get(obj.size, [])
+        )
+
+    def is_duplicate(self, obj: S3ObjectInfo, df: pd.DataFrame) -> bool:
+        if not self._needs_content_hash(obj):
+            return False
+        digest = hashlib.sha256(
+            pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()
+        ).hexdigest()
+        original_key = self._by_content.setdefault(digest, obj.key)
+        if original_key == obj.key:
+            return False
+        self._add_duplicate(
+            obj, original_key, QuarantineFormat.MATCHED_BY_CONTENT.value
+        )
+        return True
+
+    def duplicates_df(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [
+                (obj.key, original_key, obj.size, match)
+                for obj, original_key, match in self.duplicates
+            ],
+            columns=[
+                QuarantineFormat.SOURCE_KEY_COL.value,
+                QuarantineFormat.ORIGINAL_KEY_COL.value,
+                QuarantineFormat.SIZE_COL.value,
+                QuarantineFormat.MATCHED_BY_COL.value,
+            ],
+        )
+
+    def write(self, bucket_connector: BucketConnector, prefix: str) -> None:
+        if not self.duplicates:
+            return
+        stamp = datetime.today().strftime(MetaProcessFormat.PROCESS_DATE_FORMAT.value)
+        bucket_connector.write_df_to_s3(
+            self.duplicates_df(),
+            f"{prefix}/{QuarantineFormat.DUPLICATES_FILE.value}_{stamp}."
+            f"{S3FileTypes.CSV.value}",
+            S3FileTypes.CSV.value,
+        )
+        self._logger.info(
+            f"Skipped {len(self.duplicates)} duplicate source files, "
+            f"{sum(obj.size for obj, _, _ in self.duplicates)} bytes."
+        )
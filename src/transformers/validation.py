@@ -0,0 +1,219 @@
+from datetime import datetime
+import logging
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+
+from ..common.constants import (
+    MetaProcessFormat,
+    QuarantineFormat,
+    S3FileTypes,
+    ValidationRules,
+)
+from ..common.custom_exceptions import UnknownValidationRuleException
+from ..common.storage import BucketConnector
+
+if TYPE_CHECKING:
+    from .xetra_transformer import XetraSourceConfig
+
+
+class ValidationFrame:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+        self._codes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._numeric: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def codes(self, col: str) -> Tuple[np.ndarray, np.ndarray]:
+        if col not in self._codes:
+            values = self.df[col].to_numpy()
+            if (
+                len(values)
+                and values[0] == values[-1]
+                and values[0] == values[0]
+                and (values == values[0]).all()
+            ):
+                self._codes[col] = (np.zeros(len(values), dtype=np.intp), values[:1])
+            else:
+                codes, uniques = pd.factorize(self.df[col])
+                self._codes[col] = (codes, uniques.to_numpy())
+        return self._codes[col]
+
+    def numeric(self, col: str) -> np.ndarray:
+        if col not in self._numeric:
+            if pd.api.types.is_numeric_dtype(self.df[col]):
+                values = self.df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values = pd.to_numeric(self.df[col], errors="coerce").to_numpy(
+                    dtype=np.float64
+                )
+            self._numeric[col] = values
+        return self._numeric[col]
+
+    def bad_format(self, col: str, fmt: str) -> np.ndarray:
+        codes, uniques = self.codes(col)
+        bad = pd.to_datetime(
+            pd.Series(uniques, dtype=object), format=fmt, errors="coerce"
+        ).isna()
+        return np.append(bad.to_numpy(), True)[codes]
+
+
+ValidationRule = Callable[[ValidationFrame, "XetraSourceConfig"], np.ndarray]
+
+
+def _price_cols(src_args: "XetraSourceConfig") -> List[str]:
+    return [src_args.col_start_price, src_args.col_min_price, src_args.col_max_price]
+
+
+def _missing_isin(frame: ValidationFrame, src_args: "XetraSourceConfig") -> np.ndarray:
+    return pd.isna(frame.df[src_args.col_isin].to_numpy())
+
+
+def _bad_date(frame: ValidationFrame, src_args: "XetraSourceConfig") -> np.ndarray:
+    return frame.bad_format(src_args.col_date, MetaProcessFormat.DATE_FORMAT.value)
+
+
+def _bad_time(frame: ValidationFrame, src_args: "XetraSourceConfig") -> np.ndarray:
+    return frame.bad_format(src_args.col_time, "%H:%M")
+
+
+def _bad_number(frame: ValidationFrame, src_args: "XetraSourceConfig") -> np.ndarray:
+    bad = np.zeros(len(frame), dtype=bool)
+    for col in _price_cols(src_args) + [src_args.col_traded_volume]:
+        if not pd.api.types.is_numeric_dtype(frame.df[col]):
+            bad |= frame.df[col].notna().to_numpy() & np.isnan(frame.numeric(col))
+    return bad
+
+
+def _negative_price(
+    frame: ValidationFrame, src_args: "XetraSourceConfig"
+) -> np.ndarray:
+    bad = np.zeros(len(frame), dtype=bool)
+    for col in _price_cols(src_args):
+        bad |= frame.numeric(col) < 0
+    return bad
+
+
+def _negative_volume(
+    frame: ValidationFrame, src_args: "XetraSourceConfig"
+) -> np.ndarray:
+    return frame.numeric(src_args.col_traded_volume) < 0
+
+
+def _min_above_max(frame: ValidationFrame, src_args: "XetraSourceConfig") -> np.ndarray:
+    return frame.numeric(src_args.col_min_price) > frame.numeric(src_args.col_max_price)
+
+
+def _duplicate_row(frame: ValidationFrame, src_args: "XetraSourceConfig") -> np.ndarray:
+    key = np.zeros(len(frame), dtype=np.uint64)
+    for col in _price_cols(src_args) + [src_args.col_traded_volume]:
+        bits = (frame.numeric(col) + 0.0).view(np.uint64)
+        key = (key ^ bits) * np.uint64(0x100000001B3)
+    candidates = pd.Series(key).duplicated(keep=False).to_numpy()
+    duplicated = np.zeros(len(frame), dtype=bool)
+    if candidates.any():
+        duplicated[candidates] = frame.df[candidates].duplicated().to_numpy()
+    return duplicated
+
+
+VALIDATION_RULES: Dict[str, ValidationRule] = {
+    ValidationRules.MISSING_ISIN.value: _missing_isin,
+    ValidationRules.BAD_DATE.value: _bad_date,
+    ValidationRules.BAD_TIME.value: _bad_time,
+    ValidationRules.BAD_NUMBER.value: _bad_number,
+    ValidationRules.NEGATIVE_PRICE.value: _negative_price,
+    ValidationRules.NEGATIVE_VOLUME.value: _negative_volume,
+    ValidationRules.MIN_ABOVE_MAX.value: _min_above_max,
+    ValidationRules.DUPLICATE_ROW.value: _duplicate_row,
+}
+
+
+class XetraValidator:
+    def __init__(self, src_args: "XetraSourceConfig", rules: List[str]) -> None:
+        self._logger = logging.getLogger(__name__)
+        for rule in rules:
+            if rule not in VALIDATION_RULES:
+                self._logger.warning(f"The validation rule {rule} is not supported!")
+                raise UnknownValidationRuleException
+        self.src_args = src_args
+        self.rules = rules
+        self.reset()
+
+    def reset(self) -> None:
+        self.checked = 0
+        self.counts: Dict[str, int] = {rule: 0 for rule in self.rules}
+        self.quarantined: List[pd.DataFrame] = []
+
+    def validate(self, df: pd.DataFrame, source_key: str) -> pd.DataFrame:
+        frame = ValidationFrame(df)
+        masks = [
+            (rule, VALIDATION_RULES[rule](frame, self.src_args)) for rule in self.rules
+        ]
+        self.checked += len(df)
+        bad = np.zeros(len(df), dtype=bool)
+        for _, mask in masks:
+            bad |= mask
+        if bad.any():
+            reasons = np.full(int(bad.sum()), "", dtype=object)
+            for rule, mask in masks:
+                self.counts[rule] += int(mask.sum())
+                hit = mask[bad]
+                reasons[hit] = reasons[hit] + f"{rule};"
+            self.quarantined.append(
+                df[bad].assign(
+                    **{
+                        QuarantineFormat.REASON_COL.value: pd.Series(
+                            reasons, index=df.index[bad]
+                        ).str.rstrip(";"),
+                        QuarantineFormat.SOURCE_KEY_COL.value: source_key,
+                    }
+                )
+            )
+            df = df[~bad]
+        for col in _price_cols(self.src_args) + [self.src_args.col_traded_volume]:
+            if col in df and not pd.api.types.is_numeric_dtype(df[col]):
+                df = df.assign(**{col: pd.to_numeric(df[col], errors="coerce")})
+        return df
+
+    @property
+    def quarantined_rows(self) -> int:
+        return sum(len(df) for df in self.quarantined)
+
+    def counts_df(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [(QuarantineFormat.CHECKED_ROWS.value, self.checked)]
+            + [(QuarantineFormat.QUARANTINED_ROWS.value, self.quarantined_rows)]
+            + list(self.counts.items()),
+            columns=[
+                QuarantineFormat.RULE_COL.value,
+                QuarantineFormat.ROWS_COL.value,
+            ],
+        )
+
+    def write(self, bucket_connector: BucketConnector, prefix: str) -> None:
+        if not self.checked:
+            return
+        stamp = datetime.today().strftime(MetaProcessFormat.PROCESS_DATE_FORMAT.value)
+        if self.quarantined:
+            df = pd.concat(self.quarantined, ignore_index=True)
+            bucket_connector.write_df_to_s3(
+                df.astype(
+                    {col: "string" for col in df.columns if df[col].dtype == object}
+                ),
+                f"{prefix}/{QuarantineFormat.ROWS_FILE.value}_{stamp}."
+                f"{S3FileTypes.PARQUET.value}",
+                S3FileTypes.PARQUET.value,
+            )
+        bucket_connector.write_df_to_s3(
+            self.counts_df(),
+            f"{prefix}/{QuarantineFormat.COUNTS_FILE.value}_{stamp}."
+            f"{S3FileTypes.CSV.value}",
+            S3FileTypes.CSV.value,
+        )
+        self._logger.info(
+            f"Validated {self.checked} rows, quarantined {self.quarantined_rows}: "
+            + ", ".join(f"{rule}={count}" for rule, count in self.counts.items())
+        )
+        self.reset()
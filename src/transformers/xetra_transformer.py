@@ -1,10 +1,52 @@
 from datetime import datetime
 import logging
+import numpy as np
 import pandas as pd
-from typing import NamedTuple, List
+import tempfile
+from typing import Dict, Iterator, NamedTuple, List, Optional, Tuple, Union
+from botocore.exceptions import ClientError
 
-from ..common.s3 import S3BucketConnector
+from ..common.arrow_spill import ArrowSpillDataset
+from ..common.constants import (
+    ExecutionBackends,
+    MetaProcessFormat,
+    S3ConflictErrorCodes,
+    S3FileTypes,
+)
+from ..common.custom_exceptions import (
+    IntradayStateConflictException,
+    WrongBackendException,
+    WrongResolutionException,
+)
+from ..common.concurrency import BYTES_PER_MB
+from ..common.daily_cache import DailyAggregateCache
+from ..common.storage import (
+    BucketConnector,
+    ParquetCompression,
+    ParquetWriteConfig,
+    S3ObjectInfo,
+)
+from ..common.memory_budget import MemoryBudget
 from ..common.meta_process import MetaProcess
+from ..common.rolling_state import RollingWindowState
+from ..common.trading_calendar import DailyCalendar, TradingCalendar
+from .backends import (
+    BACKENDS,
+    CLOSE_TIME_COL,
+    OPEN_TIME_COL,
+    DuckDBBackend,
+    NumPyBackend,
+)
+from .bars import OHLCVBarEngine
+from .source_dedup import DuplicateSourceFilter
+from .validation import XetraValidator
+
+SORTED_BY_TIME_ATTR = "sorted_by_time"
+COMPACT_NUMERIC_ATTR = "compact_numeric"
+INTRADAY_AGGREGATES_FILE = "aggregates.parquet"
+INTRADAY_CONSUMED_ATTR = "consumed"
+
+XetraExtract = Union[pd.DataFrame, ArrowSpillDataset]
 
 
 class XetraSourceConfig(NamedTuple):
@@ -17,6 +59,19 @@ class XetraSourceConfig(NamedTuple):
     col_min_price: str
     col_max_price: str
     col_traded_volume: str
+    spill_dir: Optional[str] = None
+    backend: str = ExecutionBackends.PANDAS.value
+    backend_threads: Optional[int] = None
+    backend_memory_limit: Optional[str] = None
+    trading_calendar: Optional[str] = None
+    change_lookback_days: Optional[int] = None
+    compact_numeric: bool = False
+    price_decimals: int = 4
+    validation_rules: Optional[List[str]] = None
+    quarantine_key: Optional[str] = None
+    deduplicate_sources: bool = True
+    memory_budget_mb: Optional[float] = None
+    memory_expansion_ratio: float = 5.0
 
 
 class XetraTargetConfig(NamedTuple):
@@ -31,16 +86,32 @@ class XetraTargetConfig(NamedTuple):
     key: str
     key_date_format: str
     format: str
+    daily_cache_key: Optional[str] = None
+    intraday_state_key: Optional[str] = None
+    parquet_compression: Optional[ParquetCompression] = "snappy"
+    parquet_compression_level: Optional[int] = None
+    parquet_row_group_size: Optional[int] = None
+    parquet_sort_by: Optional[List[str]] = None
+    parquet_use_dictionary: Union[bool, List[str]] = True
+    parquet_write_statistics: Union[bool, List[str]] = True
+    bar_resolutions: Optional[List[int]] = None
+    col_bar_resolution: str = "ResolutionMinutes"
+    col_bar_time: str = "BarTime"
+    rolling_state_key: Optional[str] = None
+    rolling_windows: Optional[List[int]] = None
+    col_moving_average: str = "MovingAvg{}d"
+    col_volatility: str = "Volatility{}d"
 
 
 class XetraETL:
     def __init__(
         self,
-        s3_bucket_src: S3BucketConnector,
-        s3_bucket_trg: S3BucketConnector,
+        s3_bucket_src: BucketConnector,
+        s3_bucket_trg: BucketConnector,
         meta_key: str,
         src_args: XetraSourceConfig,
         trg_args: XetraTargetConfig,
+        date_window: Optional[Tuple[str, List[str]]] = None,
     ) -> None:
         self._logger = logging.getLogger(__name__)
         self.s3_bucket_src = s3_bucket_src
@@ -48,77 +119,457 @@ class XetraETL:
         self.meta_key = meta_key
         self.src_args = src_args
         self.trg_args = trg_args
-        self.extract_date, self.extract_date_list = MetaProcess.return_date_list(
-            self.s3_bucket_trg, self.meta_key, self.src_args.first_extract_date
+        self.calendar = (
+            TradingCalendar.from_name(self.src_args.trading_calendar)
+            if self.src_args.trading_calendar
+            else None
+        )
+        self.extract_date, self.extract_date_list = date_window or (
+            MetaProcess.return_date_list(
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.src_args.first_extract_date,
+                self.calendar,
+            )
         )
         self.meta_update_list = [
             date for date in self.extract_date_list if date >= self.extract_date
         ]
+        self.changed_report_dates: List[str] = []
+        if date_window is None and self.src_args.change_lookback_days is not None:
+            self._schedule_changed_dates(
+                MetaProcess.return_changed_dates(
+                    self.s3_bucket_src,
+                    self.s3_bucket_trg,
+                    self.meta_key,
+                    self.src_args.change_lookback_days,
+                )
+            )
+        self.day_objects: Dict[str, List[S3ObjectInfo]] = {}
+        self.daily_cache = (
+            DailyAggregateCache(self.s3_bucket_trg, self.trg_args.daily_cache_key)
+            if self.trg_args.daily_cache_key
+            else None
+        )
+        self.day_fingerprints: Dict[str, str] = {}
+        self.cached_days: Dict[str, pd.DataFrame] = {}
+        self.rolling_state = (
+            RollingWindowState(
+                self.s3_bucket_trg,
+                self.trg_args.rolling_state_key,
+                self.trg_args.rolling_windows,
+                self.trg_args.col_isin,
+                self.trg_args.col_date,
+                self.trg_args.col_closing_price,
+                self.trg_args.col_moving_average,
+                self.trg_args.col_volatility,
+            )
+            if self.trg_args.rolling_state_key and self.trg_args.rolling_windows
+            else None
+        )
+        self.rolling_state_update: Optional[pd.DataFrame] = None
+        self.validator = (
+            XetraValidator(self.src_args, self.src_args.validation_rules)
+            if self.src_args.validation_rules
+            else None
+        )
+        self.source_filter: Optional[DuplicateSourceFilter] = None
+        self.memory_budget: Optional[MemoryBudget] = None
 
-    def extract(self) -> pd.DataFrame:
-        files = [
-            key
-            for date in self.extract_date_list
-            for key in self.s3_bucket_src.list_files_in_prefix(date)
+    def _schedule_changed_dates(self, affected_dates: List[str]) -> None:
+        if not affected_dates:
+            return
+        calendar = self.calendar or DailyCalendar()
+        dates = set(self.extract_date_list)
+        for date in affected_dates:
+            previous_date = calendar.previous_trading_day(
+                datetime.strptime(date, MetaProcessFormat.DATE_FORMAT.value).date()
+            ).strftime(MetaProcessFormat.DATE_FORMAT.value)
+            dates.update((previous_date, date))
+        self.extract_date_list = sorted(dates)
+        self.changed_report_dates = [
+            date for date in affected_dates if date not in self.meta_update_list
         ]
+        self.meta_update_list = sorted(set(self.meta_update_list) | set(affected_dates))
+        self._logger.info(
+            f"Rescheduled {len(affected_dates)} dates with changed source files."
+        )
+
+    def list_source_objects(self, date: str) -> List[S3ObjectInfo]:
+        if date not in self.day_objects:
+            self.day_objects[date] = self.s3_bucket_src.list_objects_in_prefix(date)
+        return self.day_objects[date]
+
+    def read_daily_cache(self) -> List[str]:
+        if self.daily_cache is None:
+            return self.extract_date_list
+        missing_dates = []
+        for date in self.extract_date_list:
+            fingerprint = DailyAggregateCache.fingerprint(
+                self.list_source_objects(date)
+            )
+            self.day_fingerprints[date] = fingerprint
+            df_cached = self.daily_cache.read(date, fingerprint)
+            if df_cached is None:
+                missing_dates.append(date)
+            else:
+                self.cached_days[date] = df_cached
+        self._logger.info(
+            f"Daily aggregate cache: {len(self.cached_days)} hits, "
+            f"{len(missing_dates)} misses."
+        )
+        return missing_dates
+
+    def _filter_sources(self, objects: List[S3ObjectInfo]) -> List[S3ObjectInfo]:
+        if self.validator is not None:
+            self.validator.reset()
+        if not self.src_args.deduplicate_sources:
+            self.source_filter = None
+            return objects
+        self.source_filter = DuplicateSourceFilter()
+        return self.source_filter.filter_objects(objects)
+
+    def _check_source(self, obj: S3ObjectInfo, df: pd.DataFrame) -> pd.DataFrame:
+        if self.source_filter is not None and self.source_filter.is_duplicate(obj, df):
+            return pd.DataFrame()
+        if self.validator is not None and not df.empty:
+            df = self.validator.validate(df, obj.key)
+        return df
+
+    def _read_source(self, obj: S3ObjectInfo) -> pd.DataFrame:
+        return self._check_source(obj, self.s3_bucket_src.read_csv_to_df(obj.key))
+
+    def _read_sources(
+        self, objects: List[S3ObjectInfo], budget: Optional[MemoryBudget] = None
+    ) -> Iterator[pd.DataFrame]:
+        by_key = {obj.key: obj for obj in objects}
+        admit = (
+            (lambda key, force: budget.admit(key, by_key[key].size, force))
+            if budget is not None
+            else None
+        )
+        for key, df in self.s3_bucket_src.read_csv_to_dfs(by_key, admit=admit):
+            if budget is not None:
+                budget.complete(key, by_key[key].size, df)
+            yield self._check_source(by_key[key], df)
+
+    def _spill_extract(
+        self, df_list: List[pd.DataFrame], budget: MemoryBudget
+    ) -> ArrowSpillDataset:
+        spill_dir = self.src_args.spill_dir or tempfile.gettempdir()
+        self._logger.warning(
+            f"Memory budget of {self.src_args.memory_budget_mb} MB reached, "
+            f"spilling the extract to {spill_dir}."
+        )
+        dataset = ArrowSpillDataset(spill_dir)
+        for df in df_list:
+            dataset.append(
+                self._restore_numeric(df) if self.src_args.compact_numeric else df
+            )
+        budget.release_held()
+        return dataset
+
+    def _write_quarantine(self, date: str) -> None:
+        if not self.src_args.quarantine_key:
+            return
+        prefix = f"{self.src_args.quarantine_key}/{date}"
+        if self.validator is not None:
+            self.validator.write(self.s3_bucket_trg, prefix)
+        if self.source_filter is not None:
+            self.source_filter.write(self.s3_bucket_trg, prefix)
+
+    def extract(self, date_list: Optional[List[str]] = None) -> XetraExtract:
+        if date_list is None:
+            date_list = self.extract_date_list
+        objects = self._filter_sources(
+            [obj for date in date_list for obj in self.list_source_objects(date)]
+        )
         self._logger.info("Extracting Xetra source files started...")
+        budget = self.memory_budget = (
+            MemoryBudget(
+                int(self.src_args.memory_budget_mb * BYTES_PER_MB),
+                self.src_args.memory_expansion_ratio,
+            )
+            if self.src_args.memory_budget_mb
+            else None
+        )
+        dataset = (
+            ArrowSpillDataset(self.src_args.spill_dir)
+            if self.src_args.spill_dir
+            else None
+        )
         df_list = []
-        for file in files:
-            df = self.s3_bucket_src.read_csv_to_df(file)
-            if not df.empty:
-                df_list.append(df)
+        last_times: Dict[str, str] = {}
+        sorted_by_time = True
+        for df in self._read_sources(objects, budget):
+            if df.empty:
+                continue
+            if dataset is not None:
+                dataset.append(df)
+                continue
+            sorted_by_time = sorted_by_time and self._continues_time_order(
+                df, last_times
+            )
+            if self.src_args.compact_numeric:
+                df = self._compact_numeric(df)
+            df_list.append(df)
+            if budget is not None and budget.hold(df):
+                dataset = self._spill_extract(df_list, budget)
+                df_list = []
+        self._write_quarantine(
+            "_".join(sorted({min(date_list), max(date_list)}))
+            if date_list
+            else self.extract_date
+        )
+        if budget is not None:
+            budget.log_stats()
+        if dataset is not None:
+            self._logger.info(
+                f"Extracting Xetra source files finished, spilled to {dataset.path}."
+            )
+            return dataset
         if not df_list:
             df = pd.DataFrame()
         else:
             df = pd.concat(df_list, ignore_index=True)
+            df.attrs[SORTED_BY_TIME_ATTR] = sorted_by_time
+            df.attrs[COMPACT_NUMERIC_ATTR] = self.src_args.compact_numeric
         self._logger.info("Extracting Xetra source files finished.")
         return df
 
-    def transform_report1(self, df: pd.DataFrame) -> pd.DataFrame:
-        if df.empty:
-            self._logger.info(
-                "The dataframe is empty. No transformations will be applied."
-            )
-            return df
+    def _compact_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        scale = 10**self.src_args.price_decimals
+        int32_info = np.iinfo(np.int32)
+        for col in [
+            self.src_args.col_start_price,
+            self.src_args.col_min_price,
+            self.src_args.col_max_price,
+        ]:
+            if col not in df:
+                continue
+            ticks = (df[col] * scale).round()
+            if ticks.isna().any():
+                df[col] = ticks
+            elif int32_info.min <= ticks.min() and ticks.max() <= int32_info.max:
+                df[col] = ticks.astype(np.int32)
+            else:
+                df[col] = ticks.astype(np.int64)
+        col_volume = self.src_args.col_traded_volume
+        if col_volume in df and not df[col_volume].isna().any():
+            df[col_volume] = pd.to_numeric(df[col_volume], downcast="integer")
+        return df
 
-        self._logger.info(
-            "Applying transformations to Xetra source data for report 1 started..."
-        )
+    def _restore_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        scale = 10**self.src_args.price_decimals
+        for col in [
+            self.src_args.col_start_price,
+            self.src_args.col_min_price,
+            self.src_args.col_max_price,
+        ]:
+            if col in df:
+                df[col] = df[col].astype(np.float64) / scale
+        col_volume = self.src_args.col_traded_volume
+        if col_volume in df and pd.api.types.is_integer_dtype(df[col_volume]):
+            df[col_volume] = df[col_volume].astype(np.int64)
+        return df
 
-        df = df.loc[:, self.src_args.columns]
-        df[self.trg_args.col_opening_price] = (
-            df.sort_values(by=[self.src_args.col_time])
-            .groupby([self.src_args.col_isin, self.src_args.col_date])[
-                self.src_args.col_start_price
+    def _expand_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
+        scale = 10**self.src_args.price_decimals
+        for col in [
+            self.trg_args.col_opening_price,
+            self.trg_args.col_closing_price,
+            self.trg_args.col_min_price,
+            self.trg_args.col_max_price,
+        ]:
+            df[col] = df[col].astype(np.float64) / scale
+        col_volume = self.trg_args.col_daily_trading_volume
+        if pd.api.types.is_integer_dtype(df[col_volume]):
+            df[col_volume] = df[col_volume].astype(np.int64)
+        return df
+
+    def _continues_time_order(
+        self, df: pd.DataFrame, last_times: Dict[str, str]
+    ) -> bool:
+        if self.src_args.col_time not in df or self.src_args.col_date not in df:
+            return False
+        times = df[self.src_args.col_time]
+        dates = df[self.src_args.col_date]
+        date = dates.iloc[0]
+        if dates.iloc[-1] != date or not dates.is_monotonic_increasing:
+            return False
+        if not times.is_monotonic_increasing:
+            return False
+        if date in last_times and times.iloc[0] < last_times[date]:
+            return False
+        last_times[date] = times.iloc[-1]
+        return True
+
+    def _aggregate_daily(
+        self, df: pd.DataFrame, include_times: bool = False, presorted: bool = False
+    ) -> pd.DataFrame:
+        keys = [self.src_args.col_isin, self.src_args.col_date]
+        grouped = df.groupby(keys)
+        if presorted:
+            grouped_prices = grouped
+        else:
+            order = (
+                df[self.src_args.col_time]
+                .reset_index(drop=True)
+                .sort_values(kind="stable")
+                .index.to_numpy()
+            )
+            price_cols = keys + [self.src_args.col_time, self.src_args.col_start_price]
+            df_prices = df.iloc[order, df.columns.get_indexer(price_cols)]
+            grouped_prices = df_prices.groupby(keys)
+        df_daily = (
+            grouped[
+                [
+                    self.src_args.col_min_price,
+                    self.src_args.col_max_price,
+                    self.src_args.col_traded_volume,
+                ]
             ]
-            .transform("first")
+            .agg(
+                {
+                    self.src_args.col_min_price: "min",
+                    self.src_args.col_max_price: "max",
+                    self.src_args.col_traded_volume: "sum",
+                }
+            )
+            .rename(
+                columns={
+                    self.src_args.col_min_price: self.trg_args.col_min_price,
+                    self.src_args.col_max_price: self.trg_args.col_max_price,
+                    self.src_args.col_traded_volume: (
+                        self.trg_args.col_daily_trading_volume
+                    ),
+                }
+            )
         )
-        df[self.trg_args.col_closing_price] = (
-            df.sort_values(by=[self.src_args.col_time])
-            .groupby([self.src_args.col_isin, self.src_args.col_date])[
-                self.src_args.col_start_price
-            ]
-            .transform("last")
-        )
-        df.rename(
-            columns={
-                self.src_args.col_min_price: self.trg_args.col_min_price,
-                self.src_args.col_max_price: self.trg_args.col_max_price,
-                self.src_args.col_traded_volume: self.trg_args.col_daily_trading_volume,
-            },
-            inplace=True,
-        )
-        df = df.groupby(
-            [self.src_args.col_isin, self.src_args.col_date], as_index=False
-        ).agg(
+        start_prices = grouped_prices[self.src_args.col_start_price]
+        df_daily.insert(0, self.trg_args.col_opening_price, start_prices.first())
+        df_daily.insert(1, self.trg_args.col_closing_price, start_prices.last())
+        if include_times:
+            times = grouped_prices[self.src_args.col_time]
+            df_daily[OPEN_TIME_COL] = times.first()
+            df_daily[CLOSE_TIME_COL] = times.last()
+        return df_daily.reset_index()
+
+    def _combine_daily_partials(
+        self, partials: List[pd.DataFrame], include_times: bool = False
+    ) -> pd.DataFrame:
+        keys = [self.src_args.col_isin, self.src_args.col_date]
+        open_cols = [self.trg_args.col_opening_price]
+        close_cols = [self.trg_args.col_closing_price]
+        if include_times:
+            open_cols.append(OPEN_TIME_COL)
+            close_cols.append(CLOSE_TIME_COL)
+        df = pd.concat(partials, ignore_index=True)
+        df_open = (
+            df.sort_values(by=[OPEN_TIME_COL], kind="stable")
+            .groupby(keys)[open_cols]
+            .first()
+        )
+        df_close = (
+            df.sort_values(by=[CLOSE_TIME_COL], kind="stable")
+            .groupby(keys)[close_cols]
+            .last()
+        )
+        df_rest = df.groupby(keys).agg(
             {
-                self.trg_args.col_opening_price: "min",
-                self.trg_args.col_closing_price: "min",
                 self.trg_args.col_min_price: "min",
                 self.trg_args.col_max_price: "max",
                 self.trg_args.col_daily_trading_volume: "sum",
             }
         )
+        return pd.concat([df_open, df_close, df_rest], axis=1).reset_index()
+
+    def _transform_report1_spilled(self, dataset: ArrowSpillDataset) -> pd.DataFrame:
+        columns = [
+            self.src_args.col_isin,
+            self.src_args.col_date,
+            self.src_args.col_time,
+            self.src_args.col_start_price,
+            self.src_args.col_min_price,
+            self.src_args.col_max_price,
+            self.src_args.col_traded_volume,
+        ]
+        partials = [
+            self._aggregate_daily(
+                df,
+                include_times=True,
+                presorted=df[self.src_args.col_time].is_monotonic_increasing,
+            )
+            for df in dataset.iter_frames(columns)
+        ]
+        return self._combine_daily_partials(partials)
+
+    def _backend(self) -> Union[DuckDBBackend, NumPyBackend]:
+        if self.src_args.backend not in BACKENDS:
+            self._logger.warning(
+                f"The execution backend {self.src_args.backend} is not supported!"
+            )
+            raise WrongBackendException
+        return BACKENDS[self.src_args.backend](self.src_args, self.trg_args)
+
+    def _aggregate_report1(self, df: XetraExtract) -> pd.DataFrame:
+        if df.empty:
+            return pd.DataFrame()
+        if isinstance(df, ArrowSpillDataset):
+            if self.src_args.backend != ExecutionBackends.PANDAS.value:
+                return self._backend().aggregate_daily(df)
+            return self._transform_report1_spilled(df)
+        if self.src_args.backend != ExecutionBackends.PANDAS.value:
+            df_daily = self._backend().aggregate_daily(df)
+        else:
+            df_daily = self._aggregate_daily(
+                df, presorted=df.attrs.get(SORTED_BY_TIME_ATTR, False)
+            )
+        if df.attrs.get(COMPACT_NUMERIC_ATTR, False):
+            df_daily = self._expand_numeric(df_daily)
+        return df_daily
+
+    def _apply_daily_cache(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.daily_cache is None:
+            return df
+        frames = list(self.cached_days.values())
+        if not df.empty:
+            self.daily_cache.write_many(
+                [
+                    (
+                        date,
+                        fingerprint,
+                        df[df[self.src_args.col_date] == date].reset_index(drop=True),
+                    )
+                    for date, fingerprint in self.day_fingerprints.items()
+                    if date not in self.cached_days
+                ]
+            )
+            frames.append(df[~df[self.src_args.col_date].isin(self.cached_days)])
+        if not frames:
+            return df
+        return pd.concat(frames, ignore_index=True).sort_values(
+            by=[self.src_args.col_isin, self.src_args.col_date],
+            kind="stable",
+            ignore_index=True,
+        )
+
+    def transform_report1(self, df: XetraExtract) -> pd.DataFrame:
+        if df.empty and not self.cached_days:
+            self._logger.info(
+                "The dataframe is empty. No transformations will be applied."
+            )
+            return pd.DataFrame() if isinstance(df, ArrowSpillDataset) else df
+
+        self._logger.info(
+            "Applying transformations to Xetra source data for report 1 started..."
+        )
+        df = self._apply_daily_cache(self._aggregate_report1(df))
+        return self._finalize_report1(df)
+
+    def _finalize_report1(
+        self, df: pd.DataFrame, min_date: Optional[str] = None
+    ) -> pd.DataFrame:
         df[self.trg_args.col_change_previous_closing] = (
             df.sort_values(by=[self.trg_args.col_date])
             .groupby([self.trg_args.col_isin])[self.trg_args.col_opening_price]
@@ -132,26 +583,220 @@ class XetraETL:
             / df[self.trg_args.col_change_previous_closing]
             * 100
         )
-        df = df.round(decimals=2)
-        df = df[df.Date >= self.extract_date].reset_index(drop=True)
+        if self.rolling_state is not None:
+            df, self.rolling_state_update = self.rolling_state.apply(
+                df, self.rolling_state.read()
+            )
+        df = df[
+            (df[self.trg_args.col_date] >= (min_date or self.extract_date))
+            | df[self.trg_args.col_date].isin(self.changed_report_dates)
+        ]
+        df = df.round(decimals=2).reset_index(drop=True)
         self._logger.info("Applying transformations to Xetra source data finished.")
         return df
 
-    def load(self, df: pd.DataFrame) -> None:
+    def transform_bars(self, df: XetraExtract) -> pd.DataFrame:
+        if not self.trg_args.bar_resolutions:
+            self._logger.warning("No bar resolutions are configured!")
+            raise WrongResolutionException
+        if df.empty:
+            self._logger.info(
+                "The dataframe is empty. No transformations will be applied."
+            )
+            return pd.DataFrame()
+
+        self._logger.info("Building OHLCV bars from Xetra source data started...")
+        df_bars = OHLCVBarEngine(
+            self.src_args, self.trg_args, self.trg_args.bar_resolutions
+        ).bars(df)
+        if not isinstance(df, ArrowSpillDataset) and df.attrs.get(
+            COMPACT_NUMERIC_ATTR, False
+        ):
+            df_bars = self._expand_numeric(df_bars)
+        df_bars = df_bars[
+            (df_bars[self.trg_args.col_date] >= self.extract_date)
+            | df_bars[self.trg_args.col_date].isin(self.changed_report_dates)
+        ]
+        df_bars = df_bars.round(decimals=2).reset_index(drop=True)
+        self._logger.info("Building OHLCV bars from Xetra source data finished.")
+        return df_bars
+
+    def _parquet_args(self) -> ParquetWriteConfig:
+        return ParquetWriteConfig(
+            compression=self.trg_args.parquet_compression,
+            compression_level=self.trg_args.parquet_compression_level,
+            row_group_size=self.trg_args.parquet_row_group_size,
+            sort_by=self.trg_args.parquet_sort_by,
+            use_dictionary=self.trg_args.parquet_use_dictionary,
+            write_statistics=self.trg_args.parquet_write_statistics,
+        )
+
+    def write_report(self, df: pd.DataFrame) -> None:
         key = "{}_{}.{}".format(
             self.trg_args.key,
             datetime.today().strftime(self.trg_args.key_date_format),
             self.trg_args.format,
         )
-        self.s3_bucket_trg.write_df_to_s3(df, key, self.trg_args.format)
+        self.s3_bucket_trg.write_df_to_s3(
+            df, key, self.trg_args.format, parquet_args=self._parquet_args()
+        )
         self._logger.info("Xetra target data successfully written.")
 
+    def commit_metadata(self) -> None:
         MetaProcess.update_meta_file(
             self.s3_bucket_trg, self.meta_key, self.meta_update_list
         )
         self._logger.info("Xetra meta file successfully updated.")
 
+        if self.src_args.change_lookback_days is not None:
+            MetaProcess.update_manifest(
+                self.s3_bucket_trg,
+                MetaProcess.return_manifest_key(self.meta_key),
+                {
+                    date: self.list_source_objects(date)
+                    for date in self.meta_update_list
+                },
+            )
+            self._logger.info("Xetra source manifest successfully updated.")
+
+    def write_rolling_state(self) -> None:
+        if self.rolling_state is not None and self.rolling_state_update is not None:
+            self.rolling_state.write(self.rolling_state_update)
+
+    def load(self, df: pd.DataFrame) -> None:
+        self.write_report(df)
+        self.write_rolling_state()
+        self.commit_metadata()
+
+    def _intraday_state_key(self, date: str, name: str) -> str:
+        return f"{self.trg_args.intraday_state_key}/{date}/{name}"
+
+    def _read_intraday_state(
+        self, date: str
+    ) -> Tuple[pd.DataFrame, Dict[str, S3ObjectInfo], Optional[str]]:
+        try:
+            df_state, etag = self.s3_bucket_trg.read_parquet_to_df_with_etag(
+                self._intraday_state_key(date, INTRADAY_AGGREGATES_FILE)
+            )
+        except ClientError as e:
+            if MetaProcess.get_code_from_client_error(e) != "NoSuchKey":
+                raise
+            return pd.DataFrame(), {}, None
+        consumed = {
+            key: S3ObjectInfo(key, int(size), etag)
+            for key, size, etag in df_state.attrs.pop(INTRADAY_CONSUMED_ATTR, [])
+        }
+        return df_state, consumed, etag
+
+    def _write_intraday_state(
+        self,
+        date: str,
+        df_state: pd.DataFrame,
+        consumed: Dict[str, S3ObjectInfo],
+        etag: Optional[str],
+    ) -> None:
+        df_write = df_state.copy(deep=False)
+        df_write.attrs = {
+            INTRADAY_CONSUMED_ATTR: [list(obj) for obj in consumed.values()]
+        }
+        try:
+            self.s3_bucket_trg.write_df_to_s3(
+                df_write,
+                self._intraday_state_key(date, INTRADAY_AGGREGATES_FILE),
+                S3FileTypes.PARQUET.value,
+                if_match=etag,
+                if_none_match=etag is None,
+            )
+        except ClientError as e:
+            if MetaProcess.get_code_from_client_error(e) not in {
+                code.value for code in S3ConflictErrorCodes
+            }:
+                raise
+            self._logger.warning(
+                f"Intraday state for {date} was changed by another writer."
+            )
+            raise IntradayStateConflictException(date) from e
+
+    def etl_report1_intraday(
+        self, date: str, objects: Optional[List[S3ObjectInfo]] = None
+    ) -> None:
+        df_state, consumed, etag = self._read_intraday_state(date)
+        if objects is None or any(
+            obj.key in consumed and consumed[obj.key].etag != obj.etag
+            for obj in objects
+        ):
+            objects = self.s3_bucket_src.list_objects_in_prefix(date)
+            self.day_objects[date] = objects
+        objects = list({obj.key: obj for obj in objects}.values())
+        if any(
+            obj.key in consumed and consumed[obj.key].etag != obj.etag
+            for obj in objects
+        ):
+            self._logger.info(
+                f"Consumed hourly files for {date} changed, rebuilding the day."
+            )
+            df_state, consumed = pd.DataFrame(), {}
+        new_objects = [
+            obj
+            for obj in self._filter_sources(
+                list(consumed.values())
+                + [obj for obj in objects if obj.key not in consumed]
+            )
+            if obj.key not in consumed
+        ]
+        if not new_objects:
+            self._logger.info(f"No new hourly files for {date}.")
+            return
+
+        self._logger.info(f"Folding {len(new_objects)} new hourly files for {date}...")
+        partials = [] if df_state.empty else [df_state]
+        for obj in new_objects:
+            df = self._read_source(obj)
+            if not df.empty:
+                partials.append(
+                    self._aggregate_daily(
+                        df,
+                        include_times=True,
+                        presorted=df[self.src_args.col_time].is_monotonic_increasing,
+                    )
+                )
+            consumed[obj.key] = obj
+        if partials:
+            df_state = self._combine_daily_partials(partials, include_times=True)
+        if df_state.empty:
+            self._write_quarantine(date)
+            return
+        self._write_intraday_state(date, df_state, consumed, etag)
+        self._write_quarantine(date)
+
+        previous_date = (
+            (self.calendar or DailyCalendar())
+            .previous_trading_day(
+                datetime.strptime(date, MetaProcessFormat.DATE_FORMAT.value).date()
+            )
+            .strftime(MetaProcessFormat.DATE_FORMAT.value)
+        )
+        df_previous, _, _ = self._read_intraday_state(previous_date)
+        df = pd.concat([df_previous, df_state], ignore_index=True).drop(
+            columns=[OPEN_TIME_COL, CLOSE_TIME_COL]
+        )
+        df = self._finalize_report1(df, min_date=date)
+        key = "{}_provisional_{}_{}.{}".format(
+            self.trg_args.key,
+            date,
+            datetime.today().strftime(self.trg_args.key_date_format),
+            self.trg_args.format,
+        )
+        self.s3_bucket_trg.write_df_to_s3(
+            df, key, self.trg_args.format, parquet_args=self._parquet_args()
+        )
+        self._logger.info(f"Xetra provisional report for {date} successfully written.")
+
     def etl_report1(self) -> None:
-        df = self.extract()
-        df = self.transform_report1(df)
+        extracted = self.extract(self.read_daily_cache())
+        try:
+            df = self.transform_report1(extracted)
+        finally:
+            if isinstance(extracted, ArrowSpillDataset):
+                extracted.cleanup()
         self.load(df)
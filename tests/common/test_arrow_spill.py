@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.common.arrow_spill import ArrowSpillDataset
+
+
+class TestArrowSpillDatasetMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df1 = pd.DataFrame([["A", 1.5], ["B", 2.5]], columns=["col1", "col2"])
+        self.df2 = pd.DataFrame([["C", 3.5]], columns=["col1", "col2"])
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_empty(self):
+        dataset = ArrowSpillDataset(self.tmp_dir.name)
+
+        self.assertTrue(dataset.empty)
+        self.assertTrue(dataset.to_df().empty)
+
+    def test_append_writes_ipc_files(self):
+        dataset = ArrowSpillDataset(self.tmp_dir.name)
+
+        dataset.append(self.df1)
+        dataset.append(self.df2)
+
+        self.assertFalse(dataset.empty)
+        self.assertEqual(
+            sorted(os.listdir(dataset.path)),
+            [
+                "part-000000.arrow",
+                "part-000001.arrow",
+            ],
+        )
+
+    def test_iter_frames_columns(self):
+        dataset = ArrowSpillDataset(self.tmp_dir.name)
+        dataset.append(self.df1)
+        dataset.append(self.df2)
+
+        frames = list(dataset.iter_frames(["col2"]))
+
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(list(frames[0].columns), ["col2"])
+        self.assertTrue(self.df2[["col2"]].equals(frames[1]))
+
+    def test_to_df(self):
+        df_exp = pd.concat([self.df1, self.df2], ignore_index=True)
+        dataset = ArrowSpillDataset(self.tmp_dir.name)
+        dataset.append(self.df1)
+        dataset.append(self.df2)
+
+        df_result = dataset.to_df()
+
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_cleanup(self):
+        dataset = ArrowSpillDataset(self.tmp_dir.name)
+        dataset.append(self.df1)
+
+        dataset.cleanup()
+
+        self.assertFalse(dataset.path.exists())
+        self.assertTrue(dataset.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+from src.common.bucket_mirror import BucketMirror, MirrorStats
+from src.common.s3 import S3BucketConnector
+from src.common.storage import LocalBucketConnector
+
+
+class TestBucketMirrorMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3_endpoint_url = "https://s3.eu-central-1.amazonaws.com"
+        self.s3_bucket_name = "src-bucket"
+        self.s3 = boto3.resource("s3", endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        self.s3_bucket = self.s3.Bucket(self.s3_bucket_name)
+        self.s3_bucket_conn = S3BucketConnector(
+            self.s3_endpoint_url, self.s3_bucket_name
+        )
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.local_conn = LocalBucketConnector(self.temp_dir.name, self.s3_bucket_name)
+        self.bucket_mirror = BucketMirror(
+            self.s3_bucket_conn, self.local_conn, max_workers=4
+        )
+        for key in [
+            "2021-04-16/2021-04-16_BINS_XETR08.csv",
+            "2021-04-16/2021-04-16_BINS_XETR09.csv",
+            "2021-04-17/2021-04-17_BINS_XETR08.csv",
+            "2021-04-19/2021-04-19_BINS_XETR08.csv",
+        ]:
+            self.s3_bucket.put_object(Body=f"content of {key}", Key=key)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        self.mock.stop()
+
+    def test_sync(self):
+        stats = self.bucket_mirror.sync("2021-04-16", "2021-04-17")
+
+        self.assertEqual(MirrorStats(copied=3, skipped=0, deleted=0), stats)
+        self.assertEqual(
+            b"content of 2021-04-16/2021-04-16_BINS_XETR09.csv",
+            self.local_conn.get_object("2021-04-16/2021-04-16_BINS_XETR09.csv"),
+        )
+        self.assertEqual([], self.local_conn.list_files_in_prefix("2021-04-19"))
+
+    def test_sync_keeps_source_etags(self):
+        source_objects = [
+            obj._replace(etag=f"{obj.etag}-2")
+            for obj in self.s3_bucket_conn.list_objects_in_prefix("2021-04-16")
+        ]
+
+        with patch.object(
+            self.s3_bucket_conn, "list_objects_in_prefix", return_value=source_objects
+        ):
+            self.bucket_mirror.sync("2021-04-16", "2021-04-16")
+
+        self.assertEqual(
+            source_objects, self.local_conn.list_objects_in_prefix("2021-04-16")
+        )
+
+    def test_sync_only_changed(self):
+        self.bucket_mirror.sync("2021-04-16", "2021-04-19")
+        self.s3_bucket.put_object(
+            Body="corrected", Key="2021-04-16/2021-04-16_BINS_XETR08.csv"
+        )
+        self.s3_bucket.delete_objects(
+            Delete={"Objects": [{"Key": "2021-04-17/2021-04-17_BINS_XETR08.csv"}]}
+        )
+
+        with patch.object(
+            self.s3_bucket_conn, "get_object", wraps=self.s3_bucket_conn.get_object
+        ) as get_mock:
+            stats = self.bucket_mirror.sync("2021-04-16", "2021-04-19")
+
+        self.assertEqual(MirrorStats(copied=1, skipped=2, deleted=1), stats)
+        get_mock.assert_called_once_with("2021-04-16/2021-04-16_BINS_XETR08.csv")
+        self.assertEqual(
+            b"corrected",
+            self.local_conn.get_object("2021-04-16/2021-04-16_BINS_XETR08.csv"),
+        )
+        self.assertEqual([], self.local_conn.list_files_in_prefix("2021-04-17"))
+
+    def test_sync_resume(self):
+        self.bucket_mirror.sync("2021-04-16", "2021-04-16")
+
+        stats = self.bucket_mirror.sync("2021-04-16", "2021-04-19")
+
+        self.assertEqual(MirrorStats(copied=2, skipped=2, deleted=0), stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
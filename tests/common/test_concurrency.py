@@ -0,0 +1,154 @@
+import threading
+import time
+import unittest
+from typing import List
+from unittest.mock import patch
+
+from src.common.concurrency import (
+    BYTES_PER_MB,
+    AdaptiveConcurrencyController,
+    TransferConcurrencyConfig,
+)
+
+
+class TestAdaptiveConcurrencyController(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = [0.0]
+        self.patcher = patch(
+            "src.common.concurrency.time.perf_counter", lambda: self.clock[0]
+        )
+        self.patcher.start()
+        self.controller = AdaptiveConcurrencyController(
+            "download",
+            TransferConcurrencyConfig(
+                initial_concurrency=1, max_concurrency=16, min_window=1
+            ),
+        )
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+
+    def run_window(self, megabytes: float, latency: float = 1.0) -> None:
+        requests = self.controller.concurrency
+        self.clock[0] += latency
+        for _ in range(requests):
+            self.controller.record(int(megabytes * BYTES_PER_MB / requests), latency)
+
+    def test_ramps_up_until_throughput_plateaus(self):
+        for _ in range(10):
+            self.run_window(min(self.controller.concurrency, 4))
+
+        self.assertEqual(4, self.controller.concurrency)
+        self.assertEqual(5, self.controller.peak_concurrency)
+        self.assertEqual(0, self.controller.backoffs)
+
+    def test_backs_off_on_throttling_and_recovers(self):
+        for _ in range(5):
+            self.run_window(self.controller.concurrency)
+        self.assertEqual(6, self.controller.concurrency)
+
+        self.controller.record_throttle()
+        self.run_window(self.controller.concurrency)
+
+        self.assertEqual(3, self.controller.concurrency)
+        self.assertEqual(1, self.controller.backoffs)
+        self.assertEqual(1, self.controller.throttled)
+
+        for _ in range(2):
+            self.run_window(self.controller.concurrency)
+        self.assertEqual(5, self.controller.concurrency)
+        for _ in range(8):
+            self.run_window(self.controller.concurrency)
+        self.assertEqual(5, self.controller.concurrency)
+        self.run_window(self.controller.concurrency)
+        self.assertEqual(6, self.controller.concurrency)
+
+    def test_backs_off_on_latency_spike(self):
+        for _ in range(5):
+            self.run_window(self.controller.concurrency)
+
+        self.run_window(self.controller.concurrency + 1, latency=5.0)
+
+        self.assertEqual(3, self.controller.concurrency)
+        self.assertEqual(6, self.controller.peak_concurrency)
+
+    def test_stats(self):
+        for _ in range(3):
+            self.run_window(2)
+
+        stats = self.controller.stats()
+
+        self.assertEqual(1, stats.concurrency)
+        self.assertEqual(4, stats.requests)
+        self.assertAlmostEqual(6.0, stats.megabytes, places=3)
+        self.assertAlmostEqual(2.0, stats.mb_per_s, places=3)
+
+
+class TestAdaptiveConcurrencyControllerMap(unittest.TestCase):
+    def test_map_preserves_order(self):
+        controller = AdaptiveConcurrencyController(
+            "download", TransferConcurrencyConfig(initial_concurrency=3)
+        )
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def transfer(item: int) -> bytes:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.001 * (item % 3))
+            with lock:
+                in_flight[0] -= 1
+            return bytes(item)
+
+        results = list(controller.map(transfer, range(20), len))
+
+        self.assertEqual([bytes(item) for item in range(20)], results)
+        self.assertLessEqual(in_flight[1], controller.peak_concurrency)
+        self.assertEqual(20, controller.stats().requests)
+
+    def test_map_admission(self):
+        controller = AdaptiveConcurrencyController(
+            "download", TransferConcurrencyConfig(initial_concurrency=4)
+        )
+        lock = threading.Lock()
+        in_flight = [0, 0]
+        admitted: List[int] = []
+
+        def admit(item: int, force: bool) -> bool:
+            if in_flight[0] >= 2 and not force:
+                return False
+            admitted.append(item)
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            return True
+
+        def transfer(item: int) -> bytes:
+            time.sleep(0.001)
+            return bytes(item)
+
+        results = []
+        for result in controller.map(transfer, range(10), len, admit):
+            results.append(result)
+            with lock:
+                in_flight[0] -= 1
+
+        self.assertEqual([bytes(item) for item in range(10)], results)
+        self.assertEqual(list(range(10)), admitted)
+        self.assertLessEqual(in_flight[1], 2)
+
+    def test_map_raises(self):
+        controller = AdaptiveConcurrencyController("upload")
+
+        def transfer(item: int) -> bytes:
+            if item == 2:
+                raise ValueError(item)
+            return b"x"
+
+        with self.assertRaises(ValueError):
+            list(controller.map(transfer, range(10), len))
+
+
+if __name__ == "__main__":
+    unittest.main()
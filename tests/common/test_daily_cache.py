@@ -0,0 +1,72 @@
+import unittest
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+
+from src.common.daily_cache import DailyAggregateCache
+from src.common.s3 import S3BucketConnector, S3ObjectInfo
+
+
+class TestDailyAggregateCacheMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3_endpoint_url = "https://s3.eu-central-1.amazonaws.com"
+        self.s3_bucket_name = "test-bucket"
+        self.s3 = boto3.resource("s3", endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        self.s3_bucket_conn = S3BucketConnector(
+            self.s3_endpoint_url,
+            self.s3_bucket_name,
+        )
+        self.cache = DailyAggregateCache(self.s3_bucket_conn, "cache/report1/")
+        self.objects = [
+            S3ObjectInfo("2021-04-17/2021-04-17_BINS_XETR13.csv", 10, "etag1"),
+            S3ObjectInfo("2021-04-17/2021-04-17_BINS_XETR14.csv", 12, "etag2"),
+        ]
+
+    def tearDown(self) -> None:
+        self.mock.stop()
+
+    def test_fingerprint_order_independent(self):
+        self.assertEqual(
+            DailyAggregateCache.fingerprint(self.objects),
+            DailyAggregateCache.fingerprint(self.objects[::-1]),
+        )
+
+    def test_fingerprint_etag_change(self):
+        objects_changed = [self.objects[0], self.objects[1]._replace(etag="etag3")]
+
+        self.assertNotEqual(
+            DailyAggregateCache.fingerprint(self.objects),
+            DailyAggregateCache.fingerprint(objects_changed),
+        )
+
+    def test_key(self):
+        key_exp = "cache/report1/2021-04-17/abc.parquet"
+
+        self.assertEqual(key_exp, self.cache.key("2021-04-17", "abc"))
+
+    def test_read_miss(self):
+        self.assertIsNone(self.cache.read("2021-04-17", "abc"))
+
+    def test_write_read(self):
+        df_exp = pd.DataFrame(
+            [["AT0000A0E9W5", "2021-04-17", 20.21, 1088]],
+            columns=["ISIN", "Date", "OpeningPriceEur", "DailyTradedVolume"],
+        )
+        fingerprint = DailyAggregateCache.fingerprint(self.objects)
+
+        self.cache.write("2021-04-17", fingerprint, df_exp)
+        df_result = self.cache.read("2021-04-17", fingerprint)
+
+        self.assertTrue(df_exp.equals(df_result))
+        self.assertIsNone(self.cache.read("2021-04-17", "other"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import pandas as pd
+
+from src.common.memory_budget import MemoryBudget, frame_bytes
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def setUp(self) -> None:
+        self.df = pd.DataFrame(
+            {
+                "ISIN": ["AT0000A0E9W5", "DE000A0DJ6J9", "DE000A0D6554"] * 10,
+                "StartPrice": [20.1, 21.5, 19.0] * 10,
+                "TradedVolume": [5, 10, 2] * 10,
+            }
+        )
+        self.budget = MemoryBudget(limit_bytes=1000, expansion_ratio=4.0)
+
+    def test_frame_bytes(self):
+        self.assertEqual(
+            int(self.df.memory_usage(deep=True, index=False).sum()),
+            frame_bytes(self.df),
+        )
+        self.assertEqual(0, frame_bytes(self.df.iloc[0:0]))
+
+    def test_admit(self):
+        self.assertTrue(self.budget.admit("a.csv", 100))
+        self.assertEqual(500, self.budget.reserved)
+        self.assertTrue(self.budget.admit("b.csv", 100))
+        self.assertFalse(self.budget.admit("c.csv", 100))
+        self.assertEqual(1, self.budget.deferred)
+
+        self.assertTrue(self.budget.admit("c.csv", 100, force=True))
+        self.assertEqual(1500, self.budget.reserved)
+        self.assertEqual(1500, self.budget.peak)
+
+    def test_complete(self):
+        self.budget.admit("a.csv", 100)
+
+        self.budget.complete("a.csv", 100, self.df)
+
+        self.assertEqual(0, self.budget.reserved)
+        self.assertAlmostEqual(frame_bytes(self.df) / 100, self.budget.expansion_ratio)
+
+    def test_hold(self):
+        df = self.df.iloc[:3]
+        nbytes = frame_bytes(df)
+        budget = MemoryBudget(limit_bytes=4 * nbytes)
+
+        self.assertFalse(budget.hold(df))
+        self.assertTrue(budget.hold(df))
+        self.assertEqual(2 * nbytes, budget.held)
+
+        budget.release_held()
+
+        self.assertEqual(0, budget.held)
+        self.assertEqual(0, budget.reserved)
+        self.assertEqual(4 * nbytes, budget.peak)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,15 +2,21 @@ from datetime import datetime, timedelta
 from io import StringIO
 import os
 import unittest
+from unittest.mock import patch
 
 import boto3
+from botocore.exceptions import ClientError
 from moto import mock_aws
 import pandas as pd
 
 from src.common.constants import MetaProcessFormat
-from src.common.custom_exceptions import WrongMetaFileException
-from src.common.meta_process import MetaProcess
-from src.common.s3 import S3BucketConnector
+from src.common.custom_exceptions import (
+    MetaConflictException,
+    WrongMetaFileException,
+)
+from src.common.meta_process import MetaProcess, MetaRetryConfig
+from src.common.s3 import S3BucketConnector, S3ObjectInfo
+from src.common.trading_calendar import TradingCalendar
 
 
 class TestMetaProcessMethods(unittest.TestCase):
@@ -131,6 +137,59 @@ class TestMetaProcessMethods(unittest.TestCase):
 
         self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": meta_key}]})
 
+    def test_update_meta_file_concurrent_writer(self):
+        date_list_other = ["2021-04-12"]
+        date_list_new = ["2021-04-16", "2021-04-17"]
+        meta_key = "meta.csv"
+        MetaProcess.update_meta_file(self.s3_bucket_conn, meta_key, ["2021-04-10"])
+        read_with_etag = self.s3_bucket_conn.read_csv_to_df_with_etag
+        calls = []
+
+        def racing_read(*args, **kwargs):
+            result = read_with_etag(*args, **kwargs)
+            calls.append(args)
+            if len(calls) == 1:
+                MetaProcess.update_meta_file(
+                    self.s3_bucket_conn, meta_key, date_list_other
+                )
+            return result
+
+        with patch.object(
+            self.s3_bucket_conn, "read_csv_to_df_with_etag", side_effect=racing_read
+        ):
+            with patch("src.common.meta_process.time.sleep"):
+                MetaProcess.update_meta_file(
+                    self.s3_bucket_conn, meta_key, date_list_new
+                )
+
+        df_meta_result = self.s3_bucket_conn.read_csv_to_df(meta_key)
+        self.assertEqual(
+            ["2021-04-10"] + date_list_other + date_list_new,
+            list(df_meta_result[MetaProcessFormat.SOURCE_DATE_COL.value]),
+        )
+        self.assertEqual(len(calls), 3)
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": meta_key}]})
+
+    def test_update_meta_file_conflict_exhausted(self):
+        client = self.s3_bucket_conn._s3.meta.client
+        error = ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+
+        with patch.object(client, "put_object", side_effect=error) as put_mock:
+            with patch("src.common.meta_process.time.sleep") as sleep_mock:
+                with self.assertRaises(MetaConflictException):
+                    MetaProcess.update_meta_file(
+                        self.s3_bucket_conn,
+                        "meta.csv",
+                        ["2021-04-16"],
+                        retry_args=MetaRetryConfig(max_attempts=3, max_delay=0.15),
+                    )
+
+        self.assertEqual(put_mock.call_count, 3)
+        self.assertTrue(
+            all(0 <= call.args[0] <= 0.15 for call in sleep_mock.call_args_list)
+        )
+
     def test_return_date_list_no_meta_file(self):
         date_list_exp = [
             (self.today - timedelta(days=day)).strftime(
@@ -242,6 +301,129 @@ class TestMetaProcessMethods(unittest.TestCase):
 
         self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": meta_key}]})
 
+    def test_return_date_list_calendar_no_meta_file(self):
+        date_list_exp = ["2022-03-11"] + [self.dates[day] for day in range(6, 1, -1)]
+        min_date_exp = self.dates[6]
+
+        meta_key = "meta.csv"
+
+        min_date_return, date_list_return = MetaProcess.return_date_list(
+            self.s3_bucket_conn,
+            meta_key,
+            self.dates[6],
+            TradingCalendar.from_name("xetra"),
+        )
+
+        self.assertEqual(date_list_exp, date_list_return)
+        self.assertEqual(min_date_exp, min_date_return)
+
+    def test_return_date_list_calendar_meta_file_ok(self):
+        date_list_exp = [self.dates[5], self.dates[3], self.dates[2]]
+        min_date_exp = self.dates[3]
+
+        meta_key = "meta.csv"
+        meta_content = (
+            f"{MetaProcessFormat.SOURCE_DATE_COL.value},"
+            f"{MetaProcessFormat.PROCESS_COL.value}\n"
+            f"{self.dates[6]},{self.dates[0]}\n"
+            f"{self.dates[5]},{self.dates[0]}"
+        )
+        self.s3_bucket.put_object(Body=meta_content, Key=meta_key)
+        calendar = TradingCalendar(holidays=[self.today - timedelta(days=4)])
+
+        min_date_return, date_list_return = MetaProcess.return_date_list(
+            self.s3_bucket_conn, meta_key, self.dates[6], calendar
+        )
+
+        self.assertEqual(date_list_exp, date_list_return)
+        self.assertEqual(min_date_exp, min_date_return)
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": meta_key}]})
+
+    def test_return_manifest_key(self):
+        self.assertEqual(
+            "meta/report1/meta_manifest.csv",
+            MetaProcess.return_manifest_key("meta/report1/meta.csv"),
+        )
+
+    def test_update_manifest(self):
+        manifest_key = "meta_manifest.csv"
+        objects_old = {
+            self.dates[2]: [
+                S3ObjectInfo("a.csv", 1, "e1"),
+                S3ObjectInfo("b.csv", 2, "e2"),
+            ],
+            self.dates[1]: [S3ObjectInfo("c.csv", 3, "e3")],
+        }
+        objects_new = {self.dates[2]: [S3ObjectInfo("a.csv", 4, "e4")]}
+
+        MetaProcess.update_manifest(self.s3_bucket_conn, manifest_key, objects_old)
+        MetaProcess.update_manifest(self.s3_bucket_conn, manifest_key, objects_new)
+
+        df_result = self.s3_bucket_conn.read_csv_to_df(manifest_key)
+        self.assertEqual(
+            sorted(df_result.itertuples(index=False, name=None)),
+            [(self.dates[2], "a.csv", 4, "e4"), (self.dates[1], "c.csv", 3, "e3")],
+        )
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": manifest_key}]})
+
+    def test_return_changed_dates(self):
+        meta_key = "meta.csv"
+        meta_content = (
+            f"{MetaProcessFormat.SOURCE_DATE_COL.value},"
+            f"{MetaProcessFormat.PROCESS_COL.value}\n"
+            f"{self.dates[4]},{self.dates[0]}\n"
+            f"{self.dates[3]},{self.dates[0]}\n"
+            f"{self.dates[2]},{self.dates[0]}"
+        )
+        self.s3_bucket.put_object(Body=meta_content, Key=meta_key)
+        for date in self.dates[2:5]:
+            self.s3_bucket.put_object(Body="col1\nval1", Key=f"{date}/{date}_1.csv")
+        MetaProcess.update_manifest(
+            self.s3_bucket_conn,
+            MetaProcess.return_manifest_key(meta_key),
+            {
+                date: self.s3_bucket_conn.list_objects_in_prefix(date)
+                for date in self.dates[2:5]
+            },
+        )
+
+        self.assertEqual(
+            [],
+            MetaProcess.return_changed_dates(
+                self.s3_bucket_conn, self.s3_bucket_conn, meta_key, 7
+            ),
+        )
+
+        self.s3_bucket.put_object(
+            Body="col1\nval2", Key=f"{self.dates[4]}/{self.dates[4]}_1.csv"
+        )
+        self.s3_bucket.put_object(
+            Body="col1\nval2", Key=f"{self.dates[2]}/{self.dates[2]}_2.csv"
+        )
+
+        self.assertEqual(
+            [self.dates[4], self.dates[3], self.dates[2]],
+            MetaProcess.return_changed_dates(
+                self.s3_bucket_conn, self.s3_bucket_conn, meta_key, 7
+            ),
+        )
+        self.assertEqual(
+            [self.dates[2]],
+            MetaProcess.return_changed_dates(
+                self.s3_bucket_conn, self.s3_bucket_conn, meta_key, 1
+            ),
+        )
+
+    def test_return_changed_dates_no_meta_file(self):
+        self.assertEqual(
+            [],
+            MetaProcess.return_changed_dates(
+                self.s3_bucket_conn, self.s3_bucket_conn, "meta.csv", 7
+            ),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+
+import boto3
+from moto import mock_aws
+import numpy as np
+import pandas as pd
+
+from src.common.rolling_state import RollingWindowState
+from src.common.s3 import S3BucketConnector
+
+
+class TestRollingWindowStateMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3_endpoint_url = "https://s3.eu-central-1.amazonaws.com"
+        self.s3_bucket_name = "test-bucket"
+        self.s3 = boto3.resource("s3", endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        self.s3_bucket_conn = S3BucketConnector(
+            self.s3_endpoint_url,
+            self.s3_bucket_name,
+        )
+        self.state = RollingWindowState(
+            self.s3_bucket_conn,
+            "state/report1/rolling.parquet",
+            [5, 3],
+            "ISIN",
+            "Date",
+            "ClosingPriceEur",
+        )
+        rng = np.random.default_rng(3)
+        dates = pd.bdate_range("2021-04-01", periods=30).strftime("%Y-%m-%d")
+        self.df_daily = pd.DataFrame(
+            [
+                [isin, date, round(float(rng.uniform(10, 20)), 2)]
+                for date in dates
+                for isin in ["AT0000A0E9W5", "DE0005772206", "DE000A0HN5C6"]
+                if rng.random() < 0.9
+            ],
+            columns=["ISIN", "Date", "ClosingPriceEur"],
+        )
+
+    def tearDown(self) -> None:
+        self.mock.stop()
+
+    def test_read_missing(self):
+        df_state = self.state.read()
+
+        self.assertTrue(df_state.empty)
+        self.assertEqual(["ISIN", "Date", "ClosingPriceEur"], list(df_state.columns))
+
+    def test_apply(self):
+        df = pd.DataFrame(
+            [
+                ["AT0000A0E9W5", "2021-04-16", 10.0],
+                ["AT0000A0E9W5", "2021-04-19", 11.0],
+                ["AT0000A0E9W5", "2021-04-20", 12.1],
+                ["AT0000A0E9W5", "2021-04-21", 10.89],
+                ["DE0005772206", "2021-04-21", 5.0],
+            ],
+            columns=["ISIN", "Date", "ClosingPriceEur"],
+        )
+
+        df_result, df_state = self.state.apply(df, self.state.read())
+
+        self.assertEqual(
+            ["MovingAvg3d", "Volatility3d", "MovingAvg5d", "Volatility5d"],
+            self.state.metric_columns,
+        )
+        np.testing.assert_allclose(
+            [np.nan, np.nan, 11.03, 11.33, np.nan], df_result["MovingAvg3d"], atol=0.01
+        )
+        np.testing.assert_allclose(
+            [np.nan, np.nan, np.nan, np.std([10, 10, -10], ddof=1), np.nan],
+            df_result["Volatility3d"],
+        )
+        self.assertTrue(df_result["MovingAvg5d"].isna().all())
+        self.assertEqual(6, self.state.capacity)
+        self.assertEqual(5, len(df_state))
+
+    def test_apply_incremental_matches_full(self):
+        df_full, _ = self.state.apply(self.df_daily, self.state.read())
+
+        df_state = self.state.read()
+        frames = []
+        for _, df_day in self.df_daily.groupby("Date"):
+            df_day, df_state = self.state.apply(df_day, df_state)
+            frames.append(df_day)
+            self.assertLessEqual(
+                df_state.groupby("ISIN").size().max(), self.state.capacity
+            )
+        df_incremental = pd.concat(frames, ignore_index=True)
+
+        pd.testing.assert_frame_equal(
+            df_full.sort_values(["ISIN", "Date"], ignore_index=True),
+            df_incremental.sort_values(["ISIN", "Date"], ignore_index=True),
+        )
+        self.assertFalse(df_full["Volatility5d"].isna().all())
+
+    def test_apply_replaces_restated_day(self):
+        _, df_state = self.state.apply(self.df_daily, self.state.read())
+        last_date = self.df_daily["Date"].max()
+        df_restated = self.df_daily[self.df_daily["Date"] == last_date].assign(
+            ClosingPriceEur=100.0
+        )
+
+        df_result, df_state = self.state.apply(df_restated, df_state)
+
+        self.assertEqual(
+            [100.0] * len(df_restated),
+            list(df_state[df_state["Date"] == last_date]["ClosingPriceEur"]),
+        )
+        self.assertTrue((df_result["MovingAvg3d"] > 30).all())
+
+    def test_write_read(self):
+        _, df_state = self.state.apply(self.df_daily, self.state.read())
+
+        self.state.write(df_state)
+
+        pd.testing.assert_frame_equal(df_state, self.state.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
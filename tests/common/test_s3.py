@@ -1,13 +1,20 @@
+from datetime import timedelta
 from io import BytesIO, StringIO
 import os
+import time
 import unittest
+from unittest.mock import patch
 
 import boto3
+from botocore.exceptions import ClientError
 from moto import mock_aws
 import pandas as pd
+import pyarrow.parquet as pq  # type: ignore[import-untyped]
 
+from src.common.concurrency import TransferConcurrencyConfig
 from src.common.custom_exceptions import WrongFormatException
-from src.common.s3 import S3BucketConnector
+from src.common.s3 import S3BucketConnector, S3RetryConfig
+from src.common.storage import ParquetWriteConfig
 
 
 class TestS3BucketConnectorMethods(unittest.TestCase):
@@ -30,6 +37,16 @@ class TestS3BucketConnectorMethods(unittest.TestCase):
     def tearDown(self) -> None:
         self.mock.stop()
 
+    def test_refresh_credentials(self):
+        credentials = self.s3_bucket_conn.role_credentials
+
+        self.s3_bucket_conn.refresh_credentials()
+        self.assertIs(credentials, self.s3_bucket_conn.role_credentials)
+
+        self.s3_bucket_conn.refresh_credentials(timedelta(days=1))
+        self.assertIsNot(credentials, self.s3_bucket_conn.role_credentials)
+        self.assertEqual(self.s3_bucket_name, self.s3_bucket_conn._bucket.name)
+
     def test_list_files_in_prefix_ok(self):
         prefix_exp = "prefix/"
         key1_exp = f"{prefix_exp}test1.csv"
@@ -52,6 +69,21 @@ class TestS3BucketConnectorMethods(unittest.TestCase):
             Delete={"Objects": [{"Key": key1_exp}, {"Key": key2_exp}]}
         )
 
+    def test_list_objects_in_prefix_ok(self):
+        prefix_exp = "prefix/"
+        key_exp = f"{prefix_exp}test1.csv"
+        csv_content = "col1,col2\nvalA,valB"
+        etag_exp = self.s3_bucket.put_object(Body=csv_content, Key=key_exp).e_tag
+
+        list_result = self.s3_bucket_conn.list_objects_in_prefix(prefix_exp)
+
+        self.assertEqual(len(list_result), 1)
+        self.assertEqual(list_result[0].key, key_exp)
+        self.assertEqual(list_result[0].size, len(csv_content))
+        self.assertEqual(list_result[0].etag, etag_exp.strip('"'))
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
+
     def test_list_files_in_prefix_wrong_prefix(self):
         prefix_exp = "wrong-prefix/"
 
@@ -81,6 +113,47 @@ class TestS3BucketConnectorMethods(unittest.TestCase):
 
         self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
 
+    def test_read_csv_to_df_with_etag(self):
+        key_exp = "test.csv"
+        self.s3_bucket.put_object(Body="col1,col2\nval1,val2", Key=key_exp)
+
+        df_result, etag = self.s3_bucket_conn.read_csv_to_df_with_etag(key_exp)
+
+        self.assertEqual(df_result["col1"][0], "val1")
+        self.assertEqual(etag, self.s3_bucket.Object(key_exp).e_tag.strip('"'))
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
+
+    def test_write_df_to_s3_conditional(self):
+        key_exp = "test.csv"
+        df_exp = pd.DataFrame([["A", "B"]], columns=["col1", "col2"])
+        self.s3_bucket_conn.write_df_to_s3(df_exp, key_exp, "csv", if_none_match=True)
+        _, etag = self.s3_bucket_conn.read_csv_to_df_with_etag(key_exp)
+
+        with self.assertRaises(ClientError):
+            self.s3_bucket_conn.write_df_to_s3(
+                df_exp, key_exp, "csv", if_none_match=True
+            )
+        df_new = pd.DataFrame([["C", "D"]], columns=["col1", "col2"])
+        self.s3_bucket_conn.write_df_to_s3(df_new, key_exp, "csv", if_match=etag)
+        with self.assertRaises(ClientError):
+            self.s3_bucket_conn.write_df_to_s3(df_exp, key_exp, "csv", if_match=etag)
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
+
+    def test_read_parquet_to_df_ok(self):
+        key_exp = "test.parquet"
+        df_exp = pd.DataFrame([["A", 1.5]], columns=["col1", "col2"])
+        out_buffer = BytesIO()
+        df_exp.to_parquet(out_buffer, index=False)
+        self.s3_bucket.put_object(Body=out_buffer.getvalue(), Key=key_exp)
+
+        df_result = self.s3_bucket_conn.read_parquet_to_df(key_exp)
+
+        self.assertTrue(df_exp.equals(df_result))
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
+
     def test_write_df_to_s3_empty(self):
         return_exp = None
         log_exp = "The dataframe is empty! No file will be written!"
@@ -138,6 +211,34 @@ class TestS3BucketConnectorMethods(unittest.TestCase):
 
         self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
 
+    def test_write_df_to_s3_parquet_layout(self):
+        df_exp = pd.DataFrame(
+            {"ISIN": ["B", "A", "B", "A"], "Date": ["d2", "d2", "d1", "d1"]}
+        )
+        key_exp = "test.parquet"
+        parquet_args = ParquetWriteConfig(
+            compression="zstd",
+            compression_level=5,
+            row_group_size=2,
+            sort_by=["ISIN", "Date"],
+            use_dictionary=["ISIN"],
+        )
+
+        self.s3_bucket_conn.write_df_to_s3(
+            df_exp, key_exp, "parquet", parquet_args=parquet_args
+        )
+
+        data = self.s3_bucket.Object(key=key_exp).get().get("Body").read()
+        metadata = pq.ParquetFile(BytesIO(data)).metadata
+        df_result = pd.read_parquet(BytesIO(data))
+        self.assertEqual(["A", "A", "B", "B"], list(df_result["ISIN"]))
+        self.assertEqual(["d1", "d2", "d1", "d2"], list(df_result["Date"]))
+        self.assertEqual(2, metadata.num_row_groups)
+        self.assertEqual("ZSTD", metadata.row_group(0).column(0).compression)
+        self.assertEqual("A", metadata.row_group(0).column(0).statistics.max)
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
+
     def test_write_df_to_s3_wrong_format(self):
         df_exp = pd.DataFrame([["A", "B"], ["C", "D"]], columns=["col1", "col2"])
         key_exp = "test.parquet"
@@ -150,6 +251,171 @@ class TestS3BucketConnectorMethods(unittest.TestCase):
                 self.s3_bucket_conn.write_df_to_s3(df_exp, key_exp, format_exp)
             self.assertIn(log_exp, logm.output[0])
 
+    def test_read_csv_to_df_retry_throttled(self):
+        key_exp = "test.csv"
+        csv_content = "col1,col2\nval1,val2"
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+        client = self.s3_bucket_conn._s3.meta.client
+        get_object = client.get_object
+        error = ClientError({"Error": {"Code": "SlowDown"}}, "GetObject")
+        calls = []
+
+        def flaky_get_object(**kwargs):
+            calls.append(kwargs)
+            if len(calls) < 3:
+                raise error
+            return get_object(**kwargs)
+
+        with patch.object(client, "get_object", side_effect=flaky_get_object):
+            with patch("src.common.s3.time.sleep") as sleep_mock:
+                df_result = self.s3_bucket_conn.read_csv_to_df(key_exp)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sleep_mock.call_count, 2)
+        self.assertEqual(df_result["col1"][0], "val1")
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
+
+    def test_read_csv_to_df_retry_exhausted(self):
+        client = self.s3_bucket_conn._s3.meta.client
+        error = ClientError({"Error": {"Code": "503"}}, "GetObject")
+
+        with patch.object(client, "get_object", side_effect=error) as get_mock:
+            with patch("src.common.s3.time.sleep"):
+                with self.assertRaises(ClientError):
+                    self.s3_bucket_conn.read_csv_to_df("test.csv")
+
+        self.assertEqual(
+            get_mock.call_count, self.s3_bucket_conn.retry_args.max_attempts
+        )
+
+    def test_read_csv_to_df_no_retry_no_such_key(self):
+        with patch("src.common.s3.time.sleep") as sleep_mock:
+            with self.assertRaises(ClientError) as ctx:
+                self.s3_bucket_conn.read_csv_to_df("missing.csv")
+
+        self.assertEqual(
+            S3BucketConnector.get_code_from_client_error(ctx.exception), "NoSuchKey"
+        )
+        sleep_mock.assert_not_called()
+
+    def test_read_csv_to_df_hedged(self):
+        key_exp = "test.csv"
+        log_exp = f"GET {key_exp} exceeded"
+        csv_content = "col1,col2\nval1,val2"
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+        s3_bucket_conn = S3BucketConnector(
+            self.s3_endpoint_url,
+            self.s3_bucket_name,
+            S3RetryConfig(hedge_min_samples=2),
+        )
+        s3_bucket_conn._get_latencies.extend([0.01, 0.01])
+        client = s3_bucket_conn._s3.meta.client
+        get_object = client.get_object
+        calls = []
+
+        def stalling_get_object(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                time.sleep(0.5)
+            return get_object(**kwargs)
+
+        with patch.object(client, "get_object", side_effect=stalling_get_object):
+            with self.assertLogs() as logm:
+                df_result = s3_bucket_conn.read_csv_to_df(key_exp)
+                self.assertTrue(any(log_exp in line for line in logm.output))
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(df_result["col2"][0], "val2")
+
+        self.s3_bucket.delete_objects(Delete={"Objects": [{"Key": key_exp}]})
+
+    def test_read_csv_to_dfs(self):
+        keys = [f"2021-04-16/file_{index:02d}.csv" for index in range(12)]
+        for index, key in enumerate(keys):
+            self.s3_bucket.put_object(Body=f"col1,col2\n{index},{key}", Key=key)
+
+        results = list(self.s3_bucket_conn.read_csv_to_dfs(keys))
+
+        self.assertEqual(keys, [key for key, _ in results])
+        self.assertEqual(keys, [df["col2"][0] for _, df in results])
+        stats = self.s3_bucket_conn.transfer_stats()["download"]
+        self.assertEqual(12, stats.requests)
+        self.assertGreater(stats.mb_per_s, 0)
+
+    def test_write_dfs_to_s3(self):
+        df = pd.DataFrame([["A", 1]], columns=["col1", "col2"])
+        items = [(df, f"cache/{index}.parquet") for index in range(5)]
+
+        self.s3_bucket_conn.write_dfs_to_s3(
+            items + [(pd.DataFrame(), "cache/empty.parquet")], "parquet"
+        )
+
+        self.assertEqual(
+            [key for _, key in items],
+            self.s3_bucket_conn.list_files_in_prefix("cache/"),
+        )
+        self.assertEqual(5, self.s3_bucket_conn.transfer_stats()["upload"].requests)
+
+    def test_get_objects_throttled(self):
+        keys = [f"file_{index}.csv" for index in range(8)]
+        for key in keys:
+            self.s3_bucket.put_object(Body=key, Key=key)
+        s3_bucket_conn = S3BucketConnector(
+            self.s3_endpoint_url,
+            self.s3_bucket_name,
+            transfer_args=TransferConcurrencyConfig(initial_concurrency=8),
+        )
+        client = s3_bucket_conn._s3.meta.client
+        get_object = client.get_object
+        calls = []
+
+        def throttled_get_object(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise ClientError({"Error": {"Code": "SlowDown"}}, "GetObject")
+            return get_object(**kwargs)
+
+        with patch.object(client, "get_object", side_effect=throttled_get_object):
+            with patch("src.common.s3.time.sleep"):
+                results = dict(s3_bucket_conn.get_objects(keys))
+
+        self.assertEqual({key: key.encode() for key in keys}, results)
+        stats = s3_bucket_conn.transfer_stats()["download"]
+        self.assertEqual(1, stats.throttled)
+        self.assertEqual(1, stats.backoffs)
+        self.assertEqual(4, stats.concurrency)
+
+    def test_get_objects_hedged_throttled(self):
+        keys = [f"file_{index}.csv" for index in range(16)]
+        for key in keys:
+            self.s3_bucket.put_object(Body=key, Key=key)
+        s3_bucket_conn = S3BucketConnector(
+            self.s3_endpoint_url,
+            self.s3_bucket_name,
+            S3RetryConfig(hedge_min_samples=1),
+            TransferConcurrencyConfig(initial_concurrency=8),
+        )
+        s3_bucket_conn._get_latencies.append(10.0)
+        hedge_executor = s3_bucket_conn._hedge_executor
+        client = s3_bucket_conn._s3.meta.client
+        get_object = client.get_object
+        throttled = set()
+
+        def throttled_get_object(**kwargs):
+            if kwargs["Key"] not in throttled:
+                throttled.add(kwargs["Key"])
+                raise ClientError({"Error": {"Code": "SlowDown"}}, "GetObject")
+            return get_object(**kwargs)
+
+        with patch.object(client, "get_object", side_effect=throttled_get_object):
+            with patch("src.common.s3.time.sleep"):
+                results = dict(s3_bucket_conn.get_objects(keys))
+
+        self.assertEqual({key: key.encode() for key in keys}, results)
+        self.assertIs(hedge_executor, s3_bucket_conn._hedge_executor)
+        self.assertEqual(0, s3_bucket_conn._throttle_streak)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+import boto3
+from moto import mock_aws
+
+from src.common.custom_exceptions import LeaseLostException
+from src.common.s3 import S3BucketConnector
+from src.common.s3_lease import S3Lease
+
+
+class TestS3LeaseMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3_endpoint_url = "https://s3.eu-central-1.amazonaws.com"
+        self.s3_bucket_name = "test-bucket"
+        self.s3 = boto3.resource("s3", endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(
+            Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+        )
+        self.s3_bucket_conn = S3BucketConnector(
+            self.s3_endpoint_url,
+            self.s3_bucket_name,
+        )
+        self.clock = [1000.0]
+        self.lease_a = self.make_lease("worker-a")
+        self.lease_b = self.make_lease("worker-b")
+
+    def tearDown(self) -> None:
+        self.mock.stop()
+
+    def make_lease(self, worker_id: str) -> S3Lease:
+        return S3Lease(
+            self.s3_bucket_conn,
+            "backfill/leases",
+            worker_id,
+            lease_seconds=60,
+            now=lambda: self.clock[0],
+        )
+
+    def test_acquire_exclusive(self):
+        self.assertTrue(self.lease_a.acquire("item1"))
+        self.assertFalse(self.lease_b.acquire("item1"))
+        self.assertTrue(self.lease_b.acquire("item2"))
+        self.assertEqual("worker-a", self.lease_b.read_claim("item1")[0])
+        self.assertEqual(
+            ["backfill/leases/item1", "backfill/leases/item2"],
+            self.s3_bucket_conn.list_files_in_prefix("backfill/leases/"),
+        )
+
+    def test_acquire_retried_own_claim(self):
+        self.assertTrue(self.lease_a.acquire("item1"))
+
+        self.assertTrue(self.make_lease("worker-a").acquire("item1"))
+
+    def test_reclaim_expired_race(self):
+        self.lease_a.acquire("item1")
+        self.clock[0] += 61
+        _, _, etag = self.lease_b.read_claim("item1")
+
+        self.assertTrue(self.lease_b.acquire("item1"))
+        self.assertFalse(self.make_lease("worker-c")._claim("item1", etag))
+        self.assertEqual("worker-b", self.lease_a.read_claim("item1")[0])
+
+    def test_release(self):
+        self.lease_a.acquire("item1")
+        self.lease_a.release("item1")
+
+        self.assertTrue(self.lease_b.acquire("item1"))
+        self.lease_a.release("item1")
+        self.assertEqual("worker-b", self.lease_a.read_claim("item1")[0])
+
+    def test_reclaim_expired(self):
+        self.lease_a.acquire("item1")
+        self.clock[0] += 61
+
+        self.assertTrue(self.lease_b.acquire("item1"))
+        with self.assertRaises(LeaseLostException):
+            self.lease_a.renew("item1")
+        self.lease_b.renew("item1")
+
+    def test_renew(self):
+        self.lease_a.acquire("item1")
+        self.clock[0] += 50
+        self.lease_a.renew("item1")
+        self.clock[0] += 50
+
+        self.assertFalse(self.lease_b.acquire("item1"))
+        with self.assertRaises(LeaseLostException):
+            self.lease_b.renew("item1")
+
+
+if __name__ == "__main__":
+    unittest.main()
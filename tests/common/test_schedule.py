@@ -0,0 +1,81 @@
+from datetime import datetime
+import unittest
+from unittest.mock import MagicMock
+
+from src.common.custom_exceptions import WrongScheduleException
+from src.common.schedule import CronSchedule, ScheduledRunner
+
+
+class TestCronScheduleMethods(unittest.TestCase):
+    def test_from_expression(self):
+        schedule = CronSchedule.from_expression("*/15 8-10,18 * * 1-5")
+
+        self.assertEqual(schedule.minutes, frozenset({0, 15, 30, 45}))
+        self.assertEqual(schedule.hours, frozenset({8, 9, 10, 18}))
+        self.assertEqual(schedule.days, frozenset(range(1, 32)))
+        self.assertEqual(schedule.weekdays, frozenset({1, 2, 3, 4, 5}))
+
+    def test_from_expression_wrong(self):
+        for expression in ["* * * *", "60 * * * *", "a * * * *", "5-1 * * * *"]:
+            with self.assertRaises(WrongScheduleException):
+                CronSchedule.from_expression(expression)
+
+    def test_next_run(self):
+        schedule = CronSchedule.from_expression("*/15 8-18 * * 1-5")
+
+        self.assertEqual(
+            schedule.next_run(datetime(2021, 4, 16, 10, 7, 30)),
+            datetime(2021, 4, 16, 10, 15),
+        )
+        self.assertEqual(
+            schedule.next_run(datetime(2021, 4, 16, 18, 45)),
+            datetime(2021, 4, 19, 8, 0),
+        )
+
+    def test_next_run_day_or_weekday(self):
+        schedule = CronSchedule.from_expression("0 6 1 * 7")
+
+        self.assertEqual(schedule.weekdays, frozenset({0}))
+        self.assertEqual(
+            schedule.next_run(datetime(2021, 4, 16, 10, 0)),
+            datetime(2021, 4, 18, 6, 0),
+        )
+        self.assertEqual(
+            schedule.next_run(datetime(2021, 4, 25, 10, 0)),
+            datetime(2021, 5, 1, 6, 0),
+        )
+
+    def test_next_run_day_and_weekday_wildcard(self):
+        schedule = CronSchedule.from_expression("0 6 */10 * *")
+
+        self.assertEqual(
+            schedule.next_run(datetime(2021, 4, 16, 10, 0)),
+            datetime(2021, 4, 21, 6, 0),
+        )
+
+    def test_next_run_impossible(self):
+        schedule = CronSchedule.from_expression("0 0 31 2 *")
+
+        with self.assertRaises(WrongScheduleException):
+            schedule.next_run(datetime(2021, 4, 16))
+
+
+class TestScheduledRunnerMethods(unittest.TestCase):
+    def test_run(self):
+        job = MagicMock(side_effect=[RuntimeError, None])
+        sleep = MagicMock()
+        runner = ScheduledRunner(
+            CronSchedule.from_expression("0 * * * *"),
+            job,
+            now=lambda: datetime(2021, 4, 16, 10, 30),
+            sleep=sleep,
+        )
+
+        runner.run(max_runs=2)
+
+        self.assertEqual(job.call_count, 2)
+        sleep.assert_called_with(1800.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+from datetime import timedelta
+import json
+import unittest
+
+import boto3
+from moto import mock_aws
+
+from src.common.s3 import S3ObjectInfo
+from src.common.sqs import SQSQueueConnector
+
+
+def s3_event(key: str, etag: str, event_name: str = "ObjectCreated:Put") -> str:
+    return json.dumps(
+        {
+            "Records": [
+                {
+                    "eventName": event_name,
+                    "s3": {"object": {"key": key, "size": 10, "eTag": etag}},
+                }
+            ]
+        }
+    )
+
+
+class TestSQSQueueConnectorMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock = mock_aws()
+        self.mock.start()
+        self.sqs_endpoint_url = "https://sqs.eu-central-1.amazonaws.com"
+        self.sqs = boto3.client("sqs", endpoint_url=self.sqs_endpoint_url)
+        self.queue_url = self.sqs.create_queue(QueueName="xetra-events")["QueueUrl"]
+        self.queue = SQSQueueConnector(self.sqs_endpoint_url, self.queue_url)
+
+    def tearDown(self) -> None:
+        self.mock.stop()
+
+    def test_refresh_credentials(self):
+        credentials = self.queue.role_credentials
+
+        self.queue.refresh_credentials()
+        self.assertIs(credentials, self.queue.role_credentials)
+
+        self.queue.refresh_credentials(timedelta(days=1))
+        self.assertIsNot(credentials, self.queue.role_credentials)
+        self.assertEqual([], self.queue.receive_messages(wait_time_seconds=0))
+
+    def test_parse_s3_event(self):
+        objects_exp = [
+            S3ObjectInfo("2021-04-17/2021-04-17_BINS_XETR13 a.csv", 10, "etag1")
+        ]
+
+        objects = SQSQueueConnector.parse_s3_event(
+            s3_event("2021-04-17/2021-04-17_BINS_XETR13+a.csv", '"etag1"')
+        )
+
+        self.assertEqual(objects_exp, objects)
+
+    def test_parse_s3_event_ignores_other_events(self):
+        self.assertEqual(
+            [],
+            SQSQueueConnector.parse_s3_event(
+                s3_event("2021-04-17/a.csv", "etag1", "ObjectRemoved:Delete")
+            ),
+        )
+        self.assertEqual(
+            [], SQSQueueConnector.parse_s3_event(json.dumps({"Event": "s3:TestEvent"}))
+        )
+
+    def test_receive_and_delete_messages(self):
+        self.sqs.send_message(
+            QueueUrl=self.queue_url, MessageBody=s3_event("2021-04-17/a.csv", "etag1")
+        )
+        self.sqs.send_message(QueueUrl=self.queue_url, MessageBody="not json")
+
+        messages = self.queue.receive_messages(wait_time_seconds=0)
+        self.queue.delete_messages(messages)
+
+        self.assertEqual(
+            sorted(len(message.objects) for message in messages),
+            [0, 1],
+        )
+        self.assertEqual([], self.queue.receive_messages(wait_time_seconds=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+
+from botocore.exceptions import ClientError
+import pandas as pd
+
+from src.common.constants import MetaProcessFormat
+from src.common.meta_process import MetaProcess
+from src.common.storage import BucketConnector, LocalBucketConnector
+
+
+class TestLocalBucketConnectorMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bucket_conn = LocalBucketConnector(self.temp_dir.name, "test-bucket")
+        self.bucket_root = os.path.join(self.temp_dir.name, "test-bucket")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_list_objects_in_prefix(self):
+        self.bucket_conn.put_object("2021-04-16/file1.csv", b"a")
+        self.bucket_conn.put_object("2021-04-16/file2.csv", b"bc")
+        self.bucket_conn.put_object("2021-04-17/file1.csv", b"d")
+
+        objects = self.bucket_conn.list_objects_in_prefix("2021-04-16")
+
+        self.assertEqual(
+            ["2021-04-16/file1.csv", "2021-04-16/file2.csv"],
+            [obj.key for obj in objects],
+        )
+        self.assertEqual([1, 2], [obj.size for obj in objects])
+        self.assertEqual([], self.bucket_conn.list_files_in_prefix("2021-04-18"))
+        self.assertEqual(3, len(self.bucket_conn.list_files_in_prefix("")))
+
+    def test_write_and_read_df(self):
+        df_exp = pd.DataFrame([["A", "B"], ["C", "D"]], columns=["col1", "col2"])
+
+        self.bucket_conn.write_df_to_s3(df_exp, "report/test.csv", "csv")
+        self.bucket_conn.write_df_to_s3(df_exp, "report/test.parquet", "parquet")
+
+        self.assertTrue(
+            df_exp.equals(self.bucket_conn.read_csv_to_df("report/test.csv"))
+        )
+        self.assertTrue(
+            df_exp.equals(self.bucket_conn.read_parquet_to_df("report/test.parquet"))
+        )
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.bucket_root, "report", "test.csv"))
+        )
+
+    def test_get_object_range(self):
+        self.bucket_conn.put_object("test.bin", b"0123456789")
+        mapped_conn = LocalBucketConnector(
+            self.temp_dir.name, "test-bucket", memory_map=True
+        )
+
+        self.assertEqual(b"234", self.bucket_conn.get_object_range("test.bin", 2, 5))
+        self.assertEqual(b"234", mapped_conn.get_object_range("test.bin", 2, 5))
+        self.assertEqual(b"89", mapped_conn.get_object_range("test.bin", 8, 20))
+
+    def test_no_such_key(self):
+        with self.assertRaises(ClientError) as ctx:
+            self.bucket_conn.read_csv_to_df("missing.csv")
+
+        self.assertEqual(
+            "NoSuchKey", BucketConnector.get_code_from_client_error(ctx.exception)
+        )
+
+    def test_conditional_put(self):
+        self.bucket_conn.put_object("test.csv", b"v1", if_none_match=True)
+        _, etag = self.bucket_conn.get_object_with_etag("test.csv")
+
+        with self.assertRaises(ClientError):
+            self.bucket_conn.put_object("test.csv", b"v2", if_none_match=True)
+        self.bucket_conn.put_object("test.csv", b"v2", if_match=etag)
+        with self.assertRaises(ClientError):
+            self.bucket_conn.put_object("test.csv", b"v3", if_match=etag)
+        self.assertEqual(b"v2", self.bucket_conn.get_object("test.csv"))
+
+    def test_put_mirrored_object(self):
+        etag = self.bucket_conn.put_mirrored_object(
+            "2021-04-16/file1.csv", b"a", "0a1b-2"
+        )
+
+        self.assertEqual("0a1b-2", etag)
+        self.assertEqual(
+            ["0a1b-2"],
+            [obj.etag for obj in self.bucket_conn.list_objects_in_prefix("2021-04-16")],
+        )
+        self.assertEqual(
+            (b"a", "0a1b-2"),
+            self.bucket_conn.get_object_with_etag("2021-04-16/file1.csv"),
+        )
+        self.bucket_conn.put_object("2021-04-16/file1.csv", b"b", if_match="0a1b-2")
+        self.assertNotEqual(
+            "0a1b-2", self.bucket_conn.list_objects_in_prefix("2021-04-16")[0].etag
+        )
+        self.bucket_conn.delete_object("2021-04-16/file1.csv")
+        self.assertEqual([], os.listdir(os.path.join(self.bucket_root, "2021-04-16")))
+
+    def test_update_meta_file(self):
+        MetaProcess.update_meta_file(self.bucket_conn, "meta.csv", ["2021-04-16"])
+        MetaProcess.update_meta_file(self.bucket_conn, "meta.csv", ["2021-04-17"])
+
+        df_meta = self.bucket_conn.read_csv_to_df("meta.csv")
+        self.assertEqual(
+            ["2021-04-16", "2021-04-17"],
+            list(df_meta[MetaProcessFormat.SOURCE_DATE_COL.value]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
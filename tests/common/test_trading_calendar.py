@@ -0,0 +1,48 @@
+from datetime import date
+import unittest
+
+from src.common.custom_exceptions import WrongCalendarException
+from src.common.trading_calendar import DailyCalendar, TradingCalendar
+
+
+class TestTradingCalendarMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calendar = TradingCalendar.from_name("xetra")
+
+    def test_from_name_unknown(self):
+        with self.assertRaises(WrongCalendarException):
+            TradingCalendar.from_name("unknown")
+
+    def test_is_trading_day(self):
+        self.assertTrue(self.calendar.is_trading_day(date(2022, 3, 18)))
+        self.assertFalse(self.calendar.is_trading_day(date(2022, 3, 19)))
+        self.assertFalse(self.calendar.is_trading_day(date(2022, 3, 20)))
+        self.assertFalse(self.calendar.is_trading_day(date(2022, 4, 15)))
+        self.assertFalse(self.calendar.is_trading_day(date(2022, 12, 26)))
+
+    def test_previous_trading_day(self):
+        self.assertEqual(
+            self.calendar.previous_trading_day(date(2022, 3, 21)), date(2022, 3, 18)
+        )
+        self.assertEqual(
+            self.calendar.previous_trading_day(date(2022, 4, 19)), date(2022, 4, 14)
+        )
+
+    def test_trading_days(self):
+        days_exp = [date(2022, 4, 14), date(2022, 4, 19), date(2022, 4, 20)]
+
+        days_result = self.calendar.trading_days(date(2022, 4, 14), date(2022, 4, 20))
+
+        self.assertEqual(days_exp, days_result)
+
+    def test_daily_calendar(self):
+        calendar = DailyCalendar()
+
+        self.assertTrue(calendar.is_trading_day(date(2022, 3, 20)))
+        self.assertEqual(
+            calendar.previous_trading_day(date(2022, 3, 21)), date(2022, 3, 20)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
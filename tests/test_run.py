@@ -0,0 +1,42 @@
+from datetime import datetime
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src import run
+
+
+class TestRunMethods(unittest.TestCase):
+    def test_parse_args_date_default(self):
+        self.assertIsNone(run.parse_args(["--daemon", "--intraday"]).date)
+
+    def test_run_job_resolves_date_per_run(self):
+        args = run.parse_args(["--intraday"])
+        report_engine = MagicMock()
+
+        with patch.object(
+            run, "build_report_engine", return_value=report_engine
+        ), patch.object(run, "datetime") as datetime_mock:
+            datetime_mock.today.side_effect = [
+                datetime(2021, 4, 16, 23, 59),
+                datetime(2021, 4, 17, 0, 15),
+            ]
+            run.run_job({}, args, MagicMock(), MagicMock())
+            run.run_job({}, args, MagicMock(), MagicMock())
+
+        self.assertEqual(
+            [("2021-04-16",), ("2021-04-17",)],
+            [call.args for call in report_engine.run_intraday.call_args_list],
+        )
+
+    def test_run_job_explicit_date(self):
+        args = run.parse_args(["--intraday", "--date", "2021-04-16"])
+        report_engine = MagicMock()
+
+        with patch.object(run, "build_report_engine", return_value=report_engine):
+            run.run_job({}, args, MagicMock(), MagicMock())
+
+        report_engine.run_intraday.assert_called_once_with("2021-04-16")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import importlib.util
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+from src.common.arrow_spill import ArrowSpillDataset
+from src.common.custom_exceptions import WrongBackendException
+from src.common.meta_process import MetaProcess
+from src.transformers.xetra_transformer import (
+    XetraETL,
+    XetraSourceConfig,
+    XetraTargetConfig,
+)
+
+DUCKDB_INSTALLED = importlib.util.find_spec("duckdb") is not None
+
+
+class TestExecutionBackends(unittest.TestCase):
+    def setUp(self) -> None:
+        columns_src = [
+            "ISIN",
+            "Mnemonic",
+            "Date",
+            "Time",
+            "StartPrice",
+            "EndPrice",
+            "MinPrice",
+            "MaxPrice",
+            "TradedVolume",
+        ]
+        self.source_config = XetraSourceConfig(
+            first_extract_date="2021-04-01",
+            columns=columns_src,
+            col_date="Date",
+            col_isin="ISIN",
+            col_time="Time",
+            col_start_price="StartPrice",
+            col_min_price="MinPrice",
+            col_max_price="MaxPrice",
+            col_traded_volume="TradedVolume",
+        )
+        self.target_config = XetraTargetConfig(
+            col_isin="ISIN",
+            col_date="Date",
+            col_opening_price="OpeningPriceEur",
+            col_closing_price="ClosingPriceEur",
+            col_min_price="MinimumPriceEur",
+            col_max_price="MaximumPriceEur",
+            col_daily_trading_volume="DailyTradedVolume",
+            col_change_previous_closing="ChangePrevClosing%",
+            key="report1/xetra_daily_report",
+            key_date_format="%Y-%m-%d %H:%M:%S",
+            format="parquet",
+        )
+        rng = np.random.default_rng(42)
+        isins = [f"DE000000{i:04d}" for i in range(50)]
+        dates = ["2021-04-15", "2021-04-16", "2021-04-19", "2021-04-20"]
+        times = [
+            f"{hour:02d}:{minute:02d}" for hour in range(8, 17) for minute in (0, 30)
+        ]
+        rows = [
+            (isin, date, time)
+            for date in dates
+            for time in times
+            for isin in isins
+            if rng.random() < 0.7
+        ]
+        df = pd.DataFrame(rows, columns=["ISIN", "Date", "Time"])
+        df["Mnemonic"] = "MNE"
+        df["StartPrice"] = rng.uniform(10, 100, len(df)).round(2)
+        df["EndPrice"] = rng.uniform(10, 100, len(df)).round(2)
+        df["MinPrice"] = rng.uniform(5, 10, len(df)).round(2)
+        df["MaxPrice"] = rng.uniform(100, 110, len(df)).round(2)
+        df["TradedVolume"] = rng.integers(1, 10000, len(df))
+        self.df_src = df[columns_src]
+        self.hours = [
+            df for _, df in self.df_src.groupby(["Date", self.df_src.Time.str[:2]])
+        ]
+        df_ties = self.df_src.sample(frac=0.1, random_state=7)
+        df_ties = df_ties.assign(StartPrice=rng.uniform(10, 100, len(df_ties)).round(2))
+        self.df_tied = pd.concat([self.df_src, df_ties]).sort_index(kind="stable")
+        self.df_tied = self.df_tied.reset_index(drop=True)
+
+    def create_etl(self, source_config: XetraSourceConfig) -> XetraETL:
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=["2021-04-16", ["2021-04-15", "2021-04-16", "2021-04-19"]],
+        ):
+            return XetraETL(
+                MagicMock(),
+                MagicMock(),
+                "meta_key",
+                source_config,
+                self.target_config,
+            )
+
+    def test_unknown_backend(self):
+        xetra_etl = self.create_etl(self.source_config._replace(backend="unknown"))
+
+        with self.assertRaises(WrongBackendException):
+            xetra_etl.transform_report1(self.df_src)
+
+    @unittest.skipUnless(DUCKDB_INSTALLED, "duckdb is not installed")
+    def test_duckdb_parity_in_memory(self):
+        df_exp = self.create_etl(self.source_config).transform_report1(self.df_src)
+
+        xetra_etl = self.create_etl(self.source_config._replace(backend="duckdb"))
+        df_result = xetra_etl.transform_report1(self.df_src)
+
+        self.assertFalse(df_exp.empty)
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    @unittest.skipUnless(DUCKDB_INSTALLED, "duckdb is not installed")
+    def test_duckdb_parity_tied_times(self):
+        df_exp = self.create_etl(self.source_config).transform_report1(self.df_tied)
+
+        xetra_etl = self.create_etl(
+            self.source_config._replace(backend="duckdb", backend_threads=4)
+        )
+        df_result = xetra_etl.transform_report1(self.df_tied)
+
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    @unittest.skipUnless(DUCKDB_INSTALLED, "duckdb is not installed")
+    def test_duckdb_parity_spilled(self):
+        df_exp = self.create_etl(self.source_config).transform_report1(self.df_src)
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            dataset = ArrowSpillDataset(spill_dir)
+            for df_hour in self.hours:
+                dataset.append(df_hour)
+            xetra_etl = self.create_etl(
+                self.source_config._replace(
+                    spill_dir=spill_dir, backend="duckdb", backend_threads=2
+                )
+            )
+            df_result = xetra_etl.transform_report1(dataset)
+
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_numpy_parity_in_memory(self):
+        df_exp = self.create_etl(self.source_config).transform_report1(self.df_src)
+
+        xetra_etl = self.create_etl(self.source_config._replace(backend="numpy"))
+        df_result = xetra_etl.transform_report1(self.df_src)
+
+        self.assertFalse(df_exp.empty)
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_numpy_parity_tied_times(self):
+        df_exp = self.create_etl(self.source_config).transform_report1(self.df_tied)
+
+        xetra_etl = self.create_etl(self.source_config._replace(backend="numpy"))
+        df_result = xetra_etl.transform_report1(self.df_tied)
+
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_numpy_parity_missing_prices(self):
+        df_src = self.df_src.copy()
+        df_src.loc[df_src.index[::7], "StartPrice"] = np.nan
+        df_src.loc[df_src.index[::11], "EndPrice"] = np.nan
+        df_exp = self.create_etl(self.source_config).transform_report1(df_src)
+
+        xetra_etl = self.create_etl(self.source_config._replace(backend="numpy"))
+        df_result = xetra_etl.transform_report1(df_src)
+
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_numpy_parity_spilled(self):
+        df_exp = self.create_etl(self.source_config).transform_report1(self.df_src)
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            dataset = ArrowSpillDataset(spill_dir)
+            for df_hour in self.hours:
+                dataset.append(df_hour)
+            xetra_etl = self.create_etl(
+                self.source_config._replace(spill_dir=spill_dir, backend="numpy")
+            )
+            df_result = xetra_etl.transform_report1(dataset)
+
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+
+if __name__ == "__main__":
+    unittest.main()
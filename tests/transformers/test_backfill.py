@@ -0,0 +1,226 @@
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import tempfile
+from typing import Tuple
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+
+from src.common.s3 import S3BucketConnector
+from src.common.s3_lease import S3Lease
+from src.common.storage import LocalBucketConnector
+from src.transformers.backfill import XetraBackfill, XetraBackfillConfig
+from src.transformers.xetra_transformer import XetraSourceConfig, XetraTargetConfig
+
+
+def work_in_process(
+    args: Tuple[str, str, XetraSourceConfig, XetraTargetConfig, XetraBackfillConfig],
+) -> int:
+    root, worker_id, source_config, target_config, backfill_config = args
+    return XetraBackfill(
+        LocalBucketConnector(root, "src-bucket"),
+        LocalBucketConnector(root, "trg-bucket"),
+        "meta_key",
+        source_config,
+        target_config,
+        backfill_config,
+    ).work(worker_id)
+
+
+class TestXetraBackfillMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3_endpoint_url = "https://s3.eu-central-1.amazonaws.com"
+        self.s3_bucket_name_src = "src-bucket"
+        self.s3_bucket_name_trg = "trg-bucket"
+        self.meta_key = "meta_key"
+        self.s3 = boto3.resource("s3", endpoint_url=self.s3_endpoint_url)
+        for bucket in [self.s3_bucket_name_src, self.s3_bucket_name_trg]:
+            self.s3.create_bucket(
+                Bucket=bucket,
+                CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+            )
+        self.trg_bucket = self.s3.Bucket(self.s3_bucket_name_trg)
+        self.s3_bucket_src = S3BucketConnector(
+            self.s3_endpoint_url, self.s3_bucket_name_src
+        )
+        self.s3_bucket_trg = S3BucketConnector(
+            self.s3_endpoint_url, self.s3_bucket_name_trg
+        )
+        columns_src = [
+            "ISIN",
+            "Mnemonic",
+            "Date",
+            "Time",
+            "StartPrice",
+            "EndPrice",
+            "MinPrice",
+            "MaxPrice",
+            "TradedVolume",
+        ]
+        self.source_config = XetraSourceConfig(
+            first_extract_date="2021-04-01",
+            columns=columns_src,
+            col_date="Date",
+            col_isin="ISIN",
+            col_time="Time",
+            col_start_price="StartPrice",
+            col_min_price="MinPrice",
+            col_max_price="MaxPrice",
+            col_traded_volume="TradedVolume",
+        )
+        self.target_config = XetraTargetConfig(
+            col_isin="ISIN",
+            col_date="Date",
+            col_opening_price="OpeningPriceEur",
+            col_closing_price="ClosingPriceEur",
+            col_min_price="MinimumPriceEur",
+            col_max_price="MaximumPriceEur",
+            col_daily_trading_volume="DailyTradedVolume",
+            col_change_previous_closing="ChangePrevClosing%",
+            key="report1/xetra_daily_report",
+            key_date_format="%Y-%m-%d %H:%M:%S",
+            format="parquet",
+        )
+        self.backfill_config = XetraBackfillConfig(
+            prefix="backfill/report1",
+            chunk_days=2,
+            lease_seconds=60,
+            poll_seconds=0.01,
+        )
+        data = [
+            ["2021-04-15", "12:00", 20.19, 18.45, 18.20, 20.33, 877],
+            ["2021-04-16", "15:00", 18.27, 21.19, 18.27, 21.34, 987],
+            ["2021-04-17", "13:00", 20.21, 18.27, 18.21, 20.42, 633],
+            ["2021-04-17", "14:00", 18.27, 21.19, 18.27, 21.34, 455],
+            ["2021-04-18", "07:00", 20.58, 19.21, 18.89, 20.58, 9066],
+            ["2021-04-18", "08:00", 19.27, 21.14, 19.27, 21.14, 1220],
+            ["2021-04-19", "07:00", 23.58, 23.58, 23.58, 23.58, 1035],
+        ]
+        df_src = pd.DataFrame(
+            [["AT0000A0E9W5", "SANT"] + row for row in data], columns=columns_src
+        )
+        for _, row in df_src.iterrows():
+            self.s3_bucket_src.write_df_to_s3(
+                row.to_frame().T,
+                f"{row['Date']}/{row['Date']}_BINS_XETR{row['Time'][:2]}.csv",
+                "csv",
+            )
+
+    def tearDown(self) -> None:
+        self.mock.stop()
+
+    def make_backfill(self) -> XetraBackfill:
+        return XetraBackfill(
+            self.s3_bucket_src,
+            self.s3_bucket_trg,
+            self.meta_key,
+            self.source_config,
+            self.target_config,
+            self.backfill_config,
+        )
+
+    def test_publish(self):
+        items = self.make_backfill().publish("2021-04-16", "2021-04-20")
+
+        self.assertEqual(
+            ["2021-04-16_2021-04-17", "2021-04-18_2021-04-19", "2021-04-20_2021-04-20"],
+            items,
+        )
+        self.assertEqual(items, self.make_backfill().pending_items())
+
+    def test_work_concurrent_workers(self):
+        self.make_backfill().publish("2021-04-16", "2021-04-19")
+
+        with patch.object(
+            XetraBackfill,
+            "process_item",
+            autospec=True,
+            side_effect=XetraBackfill.process_item,
+        ) as process_mock:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                processed = list(
+                    executor.map(
+                        lambda worker_id: self.make_backfill().work(worker_id),
+                        ["worker-a", "worker-b", "worker-c"],
+                    )
+                )
+
+        self.assertEqual(2, sum(processed))
+        self.assertEqual(
+            ["2021-04-16_2021-04-17", "2021-04-18_2021-04-19"],
+            sorted(call.args[1] for call in process_mock.call_args_list),
+        )
+        self.assertEqual([], self.make_backfill().pending_items())
+        reports = sorted(
+            obj.key for obj in self.trg_bucket.objects.filter(Prefix="report1/")
+        )
+        self.assertEqual(2, len(reports))
+        df_report = self.s3_bucket_trg.read_parquet_to_df(reports[0])
+        self.assertEqual(["2021-04-16", "2021-04-17"], list(df_report["Date"]))
+        self.assertEqual([987, 1088], list(df_report["DailyTradedVolume"]))
+
+    def test_work_worker_processes(self):
+        with tempfile.TemporaryDirectory() as root:
+            s3_bucket_src = LocalBucketConnector(root, self.s3_bucket_name_src)
+            s3_bucket_trg = LocalBucketConnector(root, self.s3_bucket_name_trg)
+            for key in self.s3_bucket_src.list_files_in_prefix(""):
+                s3_bucket_src.put_object(key, self.s3_bucket_src.get_object(key))
+            backfill = XetraBackfill(
+                s3_bucket_src,
+                s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                self.target_config,
+                self.backfill_config,
+            )
+            backfill.publish("2021-04-16", "2021-04-19")
+
+            with multiprocessing.get_context("spawn").Pool(3) as pool:
+                processed = pool.map(
+                    work_in_process,
+                    [
+                        (
+                            root,
+                            worker_id,
+                            self.source_config,
+                            self.target_config,
+                            self.backfill_config,
+                        )
+                        for worker_id in ["worker-a", "worker-b", "worker-c"]
+                    ],
+                )
+
+            self.assertEqual(2, sum(processed))
+            self.assertEqual([], backfill.pending_items())
+            self.assertEqual(2, len(s3_bucket_trg.list_files_in_prefix("report1/")))
+
+    def test_work_reclaims_dead_worker_lease(self):
+        backfill = self.make_backfill()
+        backfill.publish("2021-04-16", "2021-04-17")
+        S3Lease(
+            self.s3_bucket_trg,
+            "backfill/report1/leases",
+            "dead-worker",
+            lease_seconds=-1,
+        ).acquire("2021-04-16_2021-04-17")
+
+        self.assertEqual(1, backfill.work("worker-a"))
+
+    def test_commit_metadata(self):
+        backfill = self.make_backfill()
+        backfill.publish("2021-04-16", "2021-04-19")
+        backfill.work("worker-a", max_items=1)
+
+        self.assertEqual(["2021-04-16", "2021-04-17"], backfill.commit_metadata())
+        backfill.work("worker-a")
+        self.assertEqual(["2021-04-18", "2021-04-19"], backfill.commit_metadata())
+        self.assertEqual([], backfill.commit_metadata())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+from src.common.arrow_spill import ArrowSpillDataset
+from src.common.custom_exceptions import WrongResolutionException
+from src.common.meta_process import MetaProcess
+from src.transformers.xetra_transformer import (
+    XetraETL,
+    XetraSourceConfig,
+    XetraTargetConfig,
+)
+
+
+class TestOHLCVBars(unittest.TestCase):
+    def setUp(self) -> None:
+        columns_src = [
+            "ISIN",
+            "Mnemonic",
+            "Date",
+            "Time",
+            "StartPrice",
+            "EndPrice",
+            "MinPrice",
+            "MaxPrice",
+            "TradedVolume",
+        ]
+        self.source_config = XetraSourceConfig(
+            first_extract_date="2021-04-01",
+            columns=columns_src,
+            col_date="Date",
+            col_isin="ISIN",
+            col_time="Time",
+            col_start_price="StartPrice",
+            col_min_price="MinPrice",
+            col_max_price="MaxPrice",
+            col_traded_volume="TradedVolume",
+        )
+        self.target_config = XetraTargetConfig(
+            col_isin="ISIN",
+            col_date="Date",
+            col_opening_price="OpeningPriceEur",
+            col_closing_price="ClosingPriceEur",
+            col_min_price="MinimumPriceEur",
+            col_max_price="MaximumPriceEur",
+            col_daily_trading_volume="DailyTradedVolume",
+            col_change_previous_closing="ChangePrevClosing%",
+            key="report1/xetra_daily_report",
+            key_date_format="%Y-%m-%d %H:%M:%S",
+            format="parquet",
+        )
+        rng = np.random.default_rng(7)
+        size = 4000
+        df = pd.DataFrame(
+            {
+                "ISIN": rng.choice([f"DE000000{i:04d}" for i in range(20)], size),
+                "Mnemonic": "MNE",
+                "Date": rng.choice(["2021-04-15", "2021-04-16", "2021-04-19"], size),
+                "Time": [
+                    f"{hour:02d}:{minute:02d}"
+                    for hour, minute in zip(
+                        rng.integers(8, 17, size), rng.integers(0, 60, size)
+                    )
+                ],
+                "StartPrice": rng.uniform(10, 100, size).round(2),
+                "EndPrice": rng.uniform(10, 100, size).round(2),
+                "MinPrice": rng.uniform(5, 10, size).round(2),
+                "MaxPrice": rng.uniform(100, 110, size).round(2),
+                "TradedVolume": rng.integers(1, 10000, size),
+            }
+        )
+        df.loc[df.index[::13], "StartPrice"] = np.nan
+        self.df_src = df[columns_src]
+
+    def create_etl(self, **target_args) -> XetraETL:
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=["2021-04-16", ["2021-04-15", "2021-04-16", "2021-04-19"]],
+        ):
+            return XetraETL(
+                MagicMock(),
+                MagicMock(),
+                "meta_key",
+                self.source_config,
+                self.target_config._replace(**target_args),
+            )
+
+    def test_transform_bars(self):
+        df_src = pd.DataFrame(
+            [
+                ["DE0001", "2021-04-16", "09:20", 12.0, 11.0, 13.0, 10],
+                ["DE0001", "2021-04-16", "09:05", 10.0, 9.0, 11.0, 20],
+                ["DE0001", "2021-04-16", "09:40", 14.0, 13.5, 15.0, 30],
+                ["DE0001", "2021-04-16", "10:01", 16.0, 15.0, 17.0, 40],
+                ["DE0002", "2021-04-16", "09:10", 20.0, 19.0, 21.0, 50],
+            ],
+            columns=[
+                "ISIN",
+                "Date",
+                "Time",
+                "StartPrice",
+                "MinPrice",
+                "MaxPrice",
+                "TradedVolume",
+            ],
+        )
+        df_exp = pd.DataFrame(
+            [
+                [30, "DE0001", "2021-04-16", "09:00", 10.0, 12.0, 9.0, 13.0, 30],
+                [30, "DE0001", "2021-04-16", "09:30", 14.0, 14.0, 13.5, 15.0, 30],
+                [30, "DE0001", "2021-04-16", "10:00", 16.0, 16.0, 15.0, 17.0, 40],
+                [30, "DE0002", "2021-04-16", "09:00", 20.0, 20.0, 19.0, 21.0, 50],
+                [60, "DE0001", "2021-04-16", "09:00", 10.0, 14.0, 9.0, 15.0, 60],
+                [60, "DE0001", "2021-04-16", "10:00", 16.0, 16.0, 15.0, 17.0, 40],
+                [60, "DE0002", "2021-04-16", "09:00", 20.0, 20.0, 19.0, 21.0, 50],
+            ],
+            columns=[
+                "ResolutionMinutes",
+                "ISIN",
+                "Date",
+                "BarTime",
+                "OpeningPriceEur",
+                "ClosingPriceEur",
+                "MinimumPriceEur",
+                "MaximumPriceEur",
+                "DailyTradedVolume",
+            ],
+        )
+
+        df_result = self.create_etl(bar_resolutions=[60, 30]).transform_bars(df_src)
+
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_daily_bars_match_report1(self):
+        columns = [
+            "ISIN",
+            "Date",
+            "OpeningPriceEur",
+            "ClosingPriceEur",
+            "MinimumPriceEur",
+            "MaximumPriceEur",
+            "DailyTradedVolume",
+        ]
+        df_exp = self.create_etl().transform_report1(self.df_src.copy())[columns]
+
+        df_result = self.create_etl(bar_resolutions=[1440]).transform_bars(self.df_src)
+
+        self.assertTrue((df_result["BarTime"] == "00:00").all())
+        pd.testing.assert_frame_equal(df_exp, df_result[columns])
+
+    def test_rolled_up_bars_match_direct(self):
+        df_direct = self.create_etl(bar_resolutions=[60]).transform_bars(self.df_src)
+
+        df_result = self.create_etl(bar_resolutions=[15, 30, 60]).transform_bars(
+            self.df_src
+        )
+
+        self.assertEqual([15, 30, 60], sorted(df_result.ResolutionMinutes.unique()))
+        pd.testing.assert_frame_equal(
+            df_direct,
+            df_result[df_result.ResolutionMinutes == 60].reset_index(drop=True),
+        )
+
+    def test_transform_bars_spilled(self):
+        xetra_etl = self.create_etl(bar_resolutions=[15, 60])
+        df_exp = xetra_etl.transform_bars(self.df_src)
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            dataset = ArrowSpillDataset(spill_dir)
+            for start in range(0, len(self.df_src), 1500):
+                dataset.append(self.df_src.iloc[start : start + 1500])
+            df_result = xetra_etl.transform_bars(dataset)
+            dataset.cleanup()
+
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_invalid_resolution(self):
+        with self.assertRaises(WrongResolutionException):
+            self.create_etl(bar_resolutions=[0, 60]).transform_bars(self.df_src)
+        with self.assertRaises(WrongResolutionException):
+            self.create_etl().transform_bars(self.df_src)
+
+
+if __name__ == "__main__":
+    unittest.main()
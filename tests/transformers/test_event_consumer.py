@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from src.common.s3 import S3ObjectInfo
+from src.common.sqs import SQSMessage
+from src.transformers.event_consumer import XetraEventConsumer
+
+
+class TestXetraEventConsumerMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queue = MagicMock()
+        self.report_engine = MagicMock()
+        self.consumer = XetraEventConsumer(
+            self.queue, self.report_engine, batch_size=3, max_messages=2
+        )
+        self.obj_13 = S3ObjectInfo("2021-04-17/2021-04-17_BINS_XETR13.csv", 10, "e1")
+        self.obj_14 = S3ObjectInfo("2021-04-17/2021-04-17_BINS_XETR14.csv", 10, "e2")
+        self.obj_07 = S3ObjectInfo("2021-04-18/2021-04-18_BINS_XETR07.csv", 10, "e3")
+
+    def test_group_objects_by_date(self):
+        grouped_exp = {
+            "2021-04-17": [self.obj_13, self.obj_14],
+            "2021-04-18": [self.obj_07],
+        }
+        objects = [
+            self.obj_07,
+            self.obj_13,
+            self.obj_14,
+            self.obj_13,
+            S3ObjectInfo("meta/report1.csv", 10, "e4"),
+        ]
+
+        self.assertEqual(grouped_exp, XetraEventConsumer.group_objects_by_date(objects))
+
+    def test_poll_once(self):
+        messages = [
+            SQSMessage("1", "r1", [self.obj_13]),
+            SQSMessage("2", "r2", [self.obj_13]),
+            SQSMessage("3", "r3", [self.obj_07, self.obj_14]),
+        ]
+        self.queue.receive_messages.side_effect = [messages[:2], messages[2:], []]
+
+        self.assertEqual(3, self.consumer.poll_once())
+        self.assertEqual(2, self.queue.receive_messages.call_count)
+        self.assertEqual(
+            [
+                ("2021-04-17", [self.obj_13, self.obj_14]),
+                ("2021-04-18", [self.obj_07]),
+            ],
+            [call.args for call in self.report_engine.run_intraday.call_args_list],
+        )
+        self.queue.delete_messages.assert_called_once_with(messages)
+
+    def test_poll_once_failure_keeps_messages(self):
+        self.queue.receive_messages.side_effect = [
+            [SQSMessage("1", "r1", [self.obj_13])],
+            [],
+        ]
+        self.report_engine.run_intraday.side_effect = RuntimeError
+
+        self.assertEqual(1, self.consumer.poll_once())
+        self.queue.delete_messages.assert_not_called()
+
+    def test_run_continues_after_failed_date(self):
+        messages = [
+            SQSMessage("1", "r1", [self.obj_13]),
+            SQSMessage("2", "r2", [self.obj_07]),
+            SQSMessage("3", "r3", [self.obj_14, self.obj_07]),
+        ]
+        self.queue.receive_messages.side_effect = [messages, [messages[0]], []]
+        self.report_engine.run_intraday.side_effect = [RuntimeError, None, None]
+
+        self.consumer.run(max_polls=2)
+
+        self.assertEqual(3, self.report_engine.run_intraday.call_count)
+        self.assertEqual(
+            [((messages[1:2],),), ((messages[0:1],),)],
+            [(call.args,) for call in self.queue.delete_messages.call_args_list],
+        )
+
+    def test_run_refreshes_credentials_and_survives_client_errors(self):
+        messages = [SQSMessage("1", "r1", [self.obj_13])]
+        self.queue.receive_messages.side_effect = [
+            ClientError({"Error": {"Code": "ExpiredToken"}}, "ReceiveMessage"),
+            messages,
+            [],
+        ]
+        self.queue.delete_messages.side_effect = ClientError(
+            {"Error": {"Code": "ExpiredToken"}}, "DeleteMessageBatch"
+        )
+
+        with patch("src.transformers.event_consumer.time.sleep") as sleep_mock:
+            self.consumer.run(max_polls=2)
+
+        sleep_mock.assert_called_once_with(self.consumer.wait_time_seconds)
+        self.assertEqual(2, self.queue.refresh_credentials.call_count)
+        self.assertEqual(
+            2, self.report_engine.s3_bucket_src.refresh_credentials.call_count
+        )
+        self.assertEqual(
+            2, self.report_engine.s3_bucket_trg.refresh_credentials.call_count
+        )
+        self.report_engine.run_intraday.assert_called_once_with(
+            "2021-04-17", [self.obj_13]
+        )
+        self.queue.delete_messages.assert_called_once_with(messages)
+
+    def test_poll_once_empty(self):
+        self.queue.receive_messages.return_value = []
+
+        self.assertEqual(0, self.consumer.poll_once())
+        self.report_engine.run_intraday.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,333 @@
+from io import BytesIO
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+
+from src.common.custom_exceptions import UnknownReportException
+from src.common.meta_process import MetaProcess
+from src.common.s3 import S3BucketConnector
+from src.transformers.report_engine import (
+    REPORT_TRANSFORMS,
+    XetraReportConfig,
+    XetraReportEngine,
+    register_report_transform,
+)
+from src.transformers.xetra_transformer import XetraSourceConfig, XetraTargetConfig
+
+
+class TestXetraReportEngineMethods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock = mock_aws()
+        self.mock.start()
+        self.s3_endpoint_url = "https://s3.eu-central-1.amazonaws.com"
+        self.s3_bucket_name_src = "src-bucket"
+        self.s3_bucket_name_trg = "trg-bucket"
+        self.s3 = boto3.resource("s3", endpoint_url=self.s3_endpoint_url)
+        for bucket in (self.s3_bucket_name_src, self.s3_bucket_name_trg):
+            self.s3.create_bucket(
+                Bucket=bucket,
+                CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+            )
+        self.trg_bucket = self.s3.Bucket(self.s3_bucket_name_trg)
+        self.s3_bucket_src = S3BucketConnector(
+            self.s3_endpoint_url,
+            self.s3_bucket_name_src,
+        )
+        self.s3_bucket_trg = S3BucketConnector(
+            self.s3_endpoint_url,
+            self.s3_bucket_name_trg,
+        )
+        columns_src = [
+            "ISIN",
+            "Mnemonic",
+            "Date",
+            "Time",
+            "StartPrice",
+            "EndPrice",
+            "MinPrice",
+            "MaxPrice",
+            "TradedVolume",
+        ]
+        self.source_config = XetraSourceConfig(
+            first_extract_date="2021-04-01",
+            columns=columns_src,
+            col_date="Date",
+            col_isin="ISIN",
+            col_time="Time",
+            col_start_price="StartPrice",
+            col_min_price="MinPrice",
+            col_max_price="MaxPrice",
+            col_traded_volume="TradedVolume",
+        )
+        conf_dict_trg = {
+            "col_isin": "ISIN",
+            "col_date": "Date",
+            "col_opening_price": "OpeningPriceEur",
+            "col_closing_price": "ClosingPriceEur",
+            "col_min_price": "MinimumPriceEur",
+            "col_max_price": "MaximumPriceEur",
+            "col_daily_trading_volume": "DailyTradedVolume",
+            "col_change_previous_closing": "ChangePrevClosing%",
+            "key_date_format": "%Y-%m-%d %H:%M:%S",
+            "format": "parquet",
+        }
+        self.report_a = XetraReportConfig(
+            name="report_a",
+            transform="report1",
+            meta_key="meta/report_a.csv",
+            target=XetraTargetConfig(
+                key="report_a/xetra_daily_report", **conf_dict_trg
+            ),
+        )
+        self.report_b = XetraReportConfig(
+            name="report_b",
+            transform="report1",
+            meta_key="meta/report_b.csv",
+            target=XetraTargetConfig(
+                key="report_b/xetra_daily_report", **conf_dict_trg
+            ),
+        )
+        self.date_windows = {
+            "meta/report_a.csv": (
+                "2021-04-17",
+                ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"],
+            ),
+            "meta/report_b.csv": ("2021-04-19", ["2021-04-18", "2021-04-19"]),
+        }
+
+        data = [
+            [
+                "AT0000A0E9W5",
+                "SANT",
+                "2021-04-16",
+                "15:00",
+                18.27,
+                21.19,
+                18.27,
+                21.34,
+                987,
+            ],
+            [
+                "AT0000A0E9W5",
+                "SANT",
+                "2021-04-17",
+                "13:00",
+                20.21,
+                18.27,
+                18.21,
+                20.42,
+                633,
+            ],
+            [
+                "AT0000A0E9W5",
+                "SANT",
+                "2021-04-17",
+                "14:00",
+                18.27,
+                21.19,
+                18.27,
+                21.34,
+                455,
+            ],
+            [
+                "AT0000A0E9W5",
+                "SANT",
+                "2021-04-18",
+                "07:00",
+                20.58,
+                19.21,
+                18.89,
+                20.58,
+                9066,
+            ],
+            [
+                "AT0000A0E9W5",
+                "SANT",
+                "2021-04-18",
+                "08:00",
+                19.27,
+                21.14,
+                19.27,
+                21.14,
+                1220,
+            ],
+            [
+                "AT0000A0E9W5",
+                "SANT",
+                "2021-04-19",
+                "07:00",
+                23.58,
+                23.58,
+                23.58,
+                23.58,
+                1035,
+            ],
+            [
+                "AT0000A0E9W5",
+                "SANT",
+                "2021-04-19",
+                "08:00",
+                23.58,
+                24.22,
+                23.31,
+                24.34,
+                1028,
+            ],
+            [
+                "AT0000A0E9W5",
+                "SANT",
+                "2021-04-19",
+                "09:00",
+                24.22,
+                22.21,
+                22.21,
+                25.01,
+                1523,
+            ],
+        ]
+        self.df_src = pd.DataFrame(data, columns=columns_src)
+        self.src_keys = []
+        for row in range(len(self.df_src)):
+            date, hour = self.df_src.loc[row, "Date"], self.df_src.loc[row, "Time"][:2]
+            key = f"{date}/{date}_BINS_XETR{hour}.csv"
+            self.s3_bucket_src.write_df_to_s3(self.df_src.loc[row:row], key, "csv")
+            self.src_keys.append(key)
+        columns_report = [
+            "ISIN",
+            "Date",
+            "OpeningPriceEur",
+            "ClosingPriceEur",
+            "MinimumPriceEur",
+            "MaximumPriceEur",
+            "DailyTradedVolume",
+            "ChangePrevClosing%",
+        ]
+        data_report = [
+            ["AT0000A0E9W5", "2021-04-17", 20.21, 18.27, 18.21, 21.34, 1088, 10.62],
+            ["AT0000A0E9W5", "2021-04-18", 20.58, 19.27, 18.89, 21.14, 10286, 1.83],
+            ["AT0000A0E9W5", "2021-04-19", 23.58, 24.22, 22.21, 25.01, 3586, 14.58],
+        ]
+        self.df_report = pd.DataFrame(data_report, columns=columns_report)
+
+    def tearDown(self) -> None:
+        self.mock.stop()
+
+    def return_date_window(self, bucket_connector, meta_key, first_date, calendar):
+        return self.date_windows[meta_key]
+
+    def read_report(self, key_prefix: str) -> pd.DataFrame:
+        trg_file = self.s3_bucket_trg.list_files_in_prefix(key_prefix)[0]
+        data = self.trg_bucket.Object(key=trg_file).get().get("Body").read()
+        return pd.read_parquet(BytesIO(data))
+
+    def test_extract_date_list_union(self):
+        with patch.object(
+            MetaProcess, "return_date_list", side_effect=self.return_date_window
+        ):
+            engine = XetraReportEngine(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.source_config,
+                [self.report_a, self.report_b],
+            )
+
+        self.assertEqual(
+            engine.extract_date_list,
+            ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"],
+        )
+
+    def test_run_extracts_once(self):
+        with patch.object(
+            MetaProcess, "return_date_list", side_effect=self.return_date_window
+        ):
+            engine = XetraReportEngine(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.source_config,
+                [self.report_a, self.report_b],
+            )
+            with patch.object(
+                self.s3_bucket_src,
+                "get_object",
+                wraps=self.s3_bucket_src.get_object,
+            ) as read_mock:
+                engine.run()
+
+        self.assertEqual(read_mock.call_count, len(self.src_keys))
+        self.assertTrue(self.df_report.equals(self.read_report("report_a/")))
+        self.assertTrue(
+            self.df_report.loc[2:2]
+            .reset_index(drop=True)
+            .equals(self.read_report("report_b/"))
+        )
+        df_meta_a = self.s3_bucket_trg.read_csv_to_df(self.report_a.meta_key)
+        df_meta_b = self.s3_bucket_trg.read_csv_to_df(self.report_b.meta_key)
+        self.assertEqual(
+            list(df_meta_a["source_date"]), ["2021-04-17", "2021-04-18", "2021-04-19"]
+        )
+        self.assertEqual(list(df_meta_b["source_date"]), ["2021-04-19"])
+
+    def test_run_logs_transfer_stats(self):
+        with patch.object(
+            MetaProcess, "return_date_list", side_effect=self.return_date_window
+        ):
+            engine = XetraReportEngine(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.source_config,
+                [self.report_a],
+            )
+            with self.assertLogs("src.transformers.report_engine") as logm:
+                engine.run()
+
+        (line,) = [line for line in logm.output if "S3 source download" in line]
+        self.assertIn(f"{len(self.src_keys)} requests", line)
+
+    def test_run_registered_transform(self):
+        def transform_volume(etl, df):
+            return df.groupby(etl.src_args.col_date, as_index=False)[
+                etl.src_args.col_traded_volume
+            ].sum()
+
+        register_report_transform("volume", transform_volume)
+        report_volume = self.report_b._replace(
+            transform="volume",
+            target=self.report_b.target._replace(key="volume/xetra_daily_volume"),
+        )
+        try:
+            with patch.object(
+                MetaProcess, "return_date_list", side_effect=self.return_date_window
+            ):
+                engine = XetraReportEngine(
+                    self.s3_bucket_src,
+                    self.s3_bucket_trg,
+                    self.source_config,
+                    [self.report_a, report_volume],
+                )
+                engine.run()
+        finally:
+            del REPORT_TRANSFORMS["volume"]
+
+        df_result = self.read_report("volume/")
+        self.assertEqual(list(df_result["TradedVolume"]), [987, 1088, 10286, 3586])
+
+    def test_unknown_transform(self):
+        report = self.report_a._replace(transform="unknown")
+
+        with patch.object(
+            MetaProcess, "return_date_list", side_effect=self.return_date_window
+        ):
+            with self.assertRaises(UnknownReportException):
+                XetraReportEngine(
+                    self.s3_bucket_src,
+                    self.s3_bucket_trg,
+                    self.source_config,
+                    [report],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from src.common.storage import S3ObjectInfo
+from src.transformers.source_dedup import DuplicateSourceFilter
+
+
+class TestDuplicateSourceFilter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.df = pd.DataFrame(
+            [["AT0000A0E9W5", "2021-04-16", "09:00", 20.1, 5]],
+            columns=["ISIN", "Date", "Time", "StartPrice", "TradedVolume"],
+        )
+        self.source_filter = DuplicateSourceFilter()
+
+    def test_filter_objects_etag(self):
+        objects = [
+            S3ObjectInfo("2021-04-16/a.csv", 100, "0a1b"),
+            S3ObjectInfo("2021-04-16/b.csv", 100, "0b1c"),
+            S3ObjectInfo("2021-04-16/a_copy.csv", 100, "0a1b"),
+            S3ObjectInfo("2021-04-16/a.csv", 100, "0a1b"),
+        ]
+
+        kept = self.source_filter.filter_objects(objects)
+
+        self.assertEqual(objects[:2], kept)
+        self.assertEqual(
+            [("2021-04-16/a_copy.csv", "2021-04-16/a.csv", 100, "etag")],
+            list(self.source_filter.duplicates_df().itertuples(index=False, name=None)),
+        )
+
+    def test_is_duplicate_single_part(self):
+        objects = [
+            S3ObjectInfo("2021-04-16/a.csv", 100, "0a1b"),
+            S3ObjectInfo("2021-04-16/b.csv", 100, "0b1c"),
+        ]
+        self.source_filter.filter_objects(objects)
+
+        self.assertFalse(self.source_filter.is_duplicate(objects[0], self.df))
+        self.assertFalse(self.source_filter.is_duplicate(objects[1], self.df))
+
+    def test_is_duplicate_multipart(self):
+        objects = [
+            S3ObjectInfo("2021-04-16/a.csv", 100, "0a1b-2"),
+            S3ObjectInfo("2021-04-16/b.csv", 100, "0b1c"),
+            S3ObjectInfo("2021-04-16/c.csv", 100, "0c1d-3"),
+        ]
+        self.source_filter.filter_objects(objects)
+
+        self.assertFalse(self.source_filter.is_duplicate(objects[0], self.df))
+        self.assertFalse(
+            self.source_filter.is_duplicate(objects[1], self.df.assign(TradedVolume=6))
+        )
+        self.assertTrue(self.source_filter.is_duplicate(objects[2], self.df.copy()))
+        self.assertEqual(
+            [("2021-04-16/c.csv", "2021-04-16/a.csv", 100, "content")],
+            list(self.source_filter.duplicates_df().itertuples(index=False, name=None)),
+        )
+
+    def test_write(self):
+        bucket_connector = MagicMock()
+        self.source_filter.write(bucket_connector, "quarantine/2021-04-16")
+        bucket_connector.write_df_to_s3.assert_not_called()
+
+        self.source_filter.filter_objects(
+            [
+                S3ObjectInfo("2021-04-16/a.csv", 100, "0a1b"),
+                S3ObjectInfo("2021-04-16/a_copy.csv", 100, "0a1b"),
+            ]
+        )
+        self.source_filter.write(bucket_connector, "quarantine/2021-04-16")
+
+        df_duplicates, key, file_format = bucket_connector.write_df_to_s3.call_args.args
+        self.assertEqual(1, len(df_duplicates))
+        self.assertTrue(key.startswith("quarantine/2021-04-16/duplicates_"))
+        self.assertEqual("csv", file_format)
+
+
+if __name__ == "__main__":
+    unittest.main()
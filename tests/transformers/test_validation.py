@@ -0,0 +1,203 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from src.common.constants import ValidationRules
+from src.common.custom_exceptions import UnknownValidationRuleException
+from src.transformers.validation import VALIDATION_RULES, XetraValidator
+from src.transformers.xetra_transformer import XetraSourceConfig
+
+
+class TestXetraValidator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.columns_src = [
+            "ISIN",
+            "Mnemonic",
+            "Date",
+            "Time",
+            "StartPrice",
+            "EndPrice",
+            "MinPrice",
+            "MaxPrice",
+            "TradedVolume",
+        ]
+        self.source_config = XetraSourceConfig(
+            first_extract_date="2021-04-01",
+            columns=self.columns_src,
+            col_date="Date",
+            col_isin="ISIN",
+            col_time="Time",
+            col_start_price="StartPrice",
+            col_min_price="MinPrice",
+            col_max_price="MaxPrice",
+            col_traded_volume="TradedVolume",
+        )
+        self.df_src = pd.DataFrame(
+            [
+                [
+                    "AT0000A0E9W5",
+                    "SANT",
+                    "2021-04-16",
+                    "09:00",
+                    20.1,
+                    20.2,
+                    20.0,
+                    20.3,
+                    5,
+                ],
+                [
+                    "AT0000A0E9W5",
+                    "SANT",
+                    "2021-04-16",
+                    "09:01",
+                    -1.0,
+                    20.2,
+                    20.0,
+                    20.3,
+                    5,
+                ],
+                [
+                    "AT0000A0E9W5",
+                    "SANT",
+                    "2021-04-16",
+                    "09:02",
+                    20.1,
+                    20.2,
+                    21.0,
+                    20.3,
+                    5,
+                ],
+                [
+                    "AT0000A0E9W5",
+                    "SANT",
+                    "2021-16-04",
+                    "9h03",
+                    20.1,
+                    20.2,
+                    20.0,
+                    20.3,
+                    5,
+                ],
+                [None, "SANT", "2021-04-16", "09:04", 20.1, 20.2, 20.0, 20.3, -5],
+                [
+                    "AT0000A0E9W5",
+                    "SANT",
+                    "2021-04-16",
+                    "09:00",
+                    20.1,
+                    20.2,
+                    20.0,
+                    20.3,
+                    5,
+                ],
+                [
+                    "DE0005772206",
+                    "EXS",
+                    "2021-04-16",
+                    "09:00",
+                    30.1,
+                    30.2,
+                    30.0,
+                    30.3,
+                    7,
+                ],
+            ],
+            columns=self.columns_src,
+        )
+        self.rules = [rule.value for rule in ValidationRules]
+
+    def test_rules_registered(self):
+        self.assertEqual(set(self.rules), set(VALIDATION_RULES))
+
+    def test_unknown_rule(self):
+        with self.assertRaises(UnknownValidationRuleException):
+            XetraValidator(self.source_config, ["negative_price", "unknown"])
+
+    def test_validate(self):
+        validator = XetraValidator(self.source_config, self.rules)
+
+        df_result = validator.validate(self.df_src, "2021-04-16/file.csv")
+
+        pd.testing.assert_frame_equal(self.df_src.iloc[[0, 6]], df_result)
+        df_quarantined = validator.quarantined[0]
+        self.assertEqual(
+            [
+                "negative_price",
+                "min_above_max",
+                "bad_date;bad_time",
+                "missing_isin;negative_volume",
+                "duplicate_row",
+            ],
+            list(df_quarantined["reason_codes"]),
+        )
+        self.assertTrue((df_quarantined["source_key"] == "2021-04-16/file.csv").all())
+        self.assertEqual(
+            {
+                "missing_isin": 1,
+                "bad_date": 1,
+                "bad_time": 1,
+                "bad_number": 0,
+                "negative_price": 1,
+                "negative_volume": 1,
+                "min_above_max": 1,
+                "duplicate_row": 1,
+            },
+            validator.counts,
+        )
+        self.assertEqual(7, validator.checked)
+        self.assertEqual(5, validator.quarantined_rows)
+
+    def test_validate_bad_number(self):
+        df_src = self.df_src.iloc[[0, 6]].astype({"MaxPrice": object})
+        df_src.loc[6, "MaxPrice"] = "n/a"
+        validator = XetraValidator(self.source_config, ["bad_number"])
+
+        df_result = validator.validate(df_src, "2021-04-16/file.csv")
+
+        self.assertEqual(["AT0000A0E9W5"], list(df_result["ISIN"]))
+        self.assertEqual(np.float64, df_result["MaxPrice"].dtype)
+        self.assertEqual(["bad_number"], list(validator.quarantined[0]["reason_codes"]))
+
+    def test_validate_clean(self):
+        validator = XetraValidator(self.source_config, self.rules)
+        df_clean = self.df_src.iloc[[0, 6]]
+
+        df_result = validator.validate(df_clean, "2021-04-16/file.csv")
+
+        self.assertIs(df_clean, df_result)
+        self.assertEqual([], validator.quarantined)
+
+    def test_write(self):
+        bucket_connector = MagicMock()
+        validator = XetraValidator(self.source_config, self.rules)
+        validator.validate(self.df_src, "2021-04-16/file.csv")
+
+        validator.write(bucket_connector, "quarantine/2021-04-16")
+
+        rows_call, counts_call = bucket_connector.write_df_to_s3.call_args_list
+        self.assertEqual(5, len(rows_call.args[0]))
+        self.assertTrue(rows_call.args[1].startswith("quarantine/2021-04-16/rows_"))
+        self.assertEqual("parquet", rows_call.args[2])
+        df_counts = counts_call.args[0]
+        self.assertEqual(
+            [7, 5],
+            list(df_counts[df_counts["rule"].isin(["checked", "quarantined"])]["rows"]),
+        )
+        self.assertTrue(counts_call.args[1].startswith("quarantine/2021-04-16/counts_"))
+        self.assertEqual([], validator.quarantined)
+        self.assertEqual(0, validator.checked)
+        self.assertEqual({rule: 0 for rule in self.rules}, validator.counts)
+
+    def test_write_nothing_checked(self):
+        bucket_connector = MagicMock()
+        validator = XetraValidator(self.source_config, self.rules)
+
+        validator.write(bucket_connector, "quarantine/2200-01-01")
+
+        bucket_connector.write_df_to_s3.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
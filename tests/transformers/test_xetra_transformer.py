@@ -1,5 +1,7 @@
+from datetime import datetime
 from io import BytesIO
 import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -7,6 +9,8 @@ import boto3
 from moto import mock_aws
 import pandas as pd
 
+from src.common.arrow_spill import ArrowSpillDataset
+from src.common.custom_exceptions import IntradayStateConflictException
 from src.common.meta_process import MetaProcess
 from src.common.s3 import S3BucketConnector
 from src.transformers.xetra_transformer import (
@@ -275,6 +279,152 @@ class TextXetraETLMethods(unittest.TestCase):
             )
             df_result = xetra_etl.extract()
         self.assertTrue((df_exp.equals(df_result)))
+        self.assertTrue(df_result.attrs["sorted_by_time"])
+
+    def test_extract_files_validation(self):
+        df_exp = self.df_src.loc[[1, 2, 3, 4, 6, 7, 8]].reset_index(drop=True)
+        source_config = self.source_config._replace(
+            validation_rules=["negative_price", "min_above_max"],
+            quarantine_key="quarantine/report1",
+        )
+        self.s3_bucket_src.write_df_to_s3(
+            self.df_src.loc[5:5].assign(MinPrice=22.0),
+            "2021-04-18/2021-04-18_BINS_XETR08.csv",
+            "csv",
+        )
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=["2021-04-17", ["2021-04-16", "2021-04-17", "2021-04-18"]],
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                source_config,
+                self.target_config,
+            )
+            df_result = xetra_etl.extract()
+            with patch.object(self.s3_bucket_trg, "write_df_to_s3") as write_mock:
+                xetra_etl.extract()
+
+        pd.testing.assert_frame_equal(df_exp.loc[0:3], df_result)
+        df_counts, df_rows = (
+            write_mock.call_args_list[1].args[0],
+            write_mock.call_args_list[0].args[0],
+        )
+        self.assertEqual([5, 1, 0, 1], list(df_counts["rows"]))
+        self.assertEqual(1, len(df_rows))
+        keys = sorted(
+            obj.key
+            for obj in self.s3_bucket_trg.list_objects_in_prefix(
+                "quarantine/report1/2021-04-16_2021-04-18/"
+            )
+        )
+        self.assertEqual(2, len(keys))
+        df_counts = self.s3_bucket_trg.read_csv_to_df(keys[0])
+        self.assertEqual([5, 1, 0, 1], list(df_counts["rows"]))
+        df_rows = self.s3_bucket_trg.read_parquet_to_df(keys[1])
+        self.assertEqual(["min_above_max"], list(df_rows["reason_codes"]))
+        self.assertEqual(
+            ["2021-04-18/2021-04-18_BINS_XETR08.csv"], list(df_rows["source_key"])
+        )
+
+    def test_extract_no_files_validation(self):
+        source_config = self.source_config._replace(
+            validation_rules=["negative_price"], quarantine_key="quarantine/report1"
+        )
+
+        with patch.object(
+            MetaProcess, "return_date_list", return_value=["2200-01-01", []]
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                source_config,
+                self.target_config,
+            )
+            df_result = xetra_etl.extract()
+
+        self.assertTrue(df_result.empty)
+        self.assertEqual(
+            [], self.s3_bucket_trg.list_objects_in_prefix("quarantine/report1/")
+        )
+
+    def test_extract_files_duplicate_source(self):
+        df_exp = self.df_src.loc[1:8].reset_index(drop=True)
+        source_config = self.source_config._replace(quarantine_key="quarantine/report1")
+        self.s3_bucket_src.write_df_to_s3(
+            self.df_src.loc[5:5], "2021-04-18/2021-04-18_BINS_XETR08_retry.csv", "csv"
+        )
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=["2021-04-17", ["2021-04-16", "2021-04-17", "2021-04-18"]],
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                source_config,
+                self.target_config,
+            )
+            with patch.object(
+                self.s3_bucket_src,
+                "get_object",
+                wraps=self.s3_bucket_src.get_object,
+            ) as read_mock:
+                df_result = xetra_etl.extract()
+
+        pd.testing.assert_frame_equal(df_exp.loc[0:4], df_result)
+        self.assertEqual(5, read_mock.call_count)
+        (key,) = [
+            obj.key
+            for obj in self.s3_bucket_trg.list_objects_in_prefix(
+                "quarantine/report1/2021-04-16_2021-04-18/duplicates_"
+            )
+        ]
+        df_duplicates = self.s3_bucket_trg.read_csv_to_df(key)
+        self.assertEqual(
+            ["2021-04-18/2021-04-18_BINS_XETR08_retry.csv"],
+            list(df_duplicates["source_key"]),
+        )
+        self.assertEqual(
+            ["2021-04-18/2021-04-18_BINS_XETR08.csv"],
+            list(df_duplicates["original_key"]),
+        )
+        self.assertEqual(["etag"], list(df_duplicates["matched_by"]))
+
+    def test_extract_files_unsorted(self):
+        df_exp = self.df_src.loc[[3, 2]].reset_index(drop=True)
+
+        extract_date = "2021-04-17"
+        extract_date_list = ["2021-04-17"]
+        list_objects = self.s3_bucket_src.list_objects_in_prefix
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=[extract_date, extract_date_list],
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                self.target_config,
+            )
+            with patch.object(
+                self.s3_bucket_src,
+                "list_objects_in_prefix",
+                side_effect=lambda prefix: sorted(list_objects(prefix), reverse=True),
+            ):
+                df_result = xetra_etl.extract()
+        self.assertTrue((df_exp.equals(df_result)))
+        self.assertFalse(df_result.attrs["sorted_by_time"])
 
     def test_transform_report1_empty_df(self):
         log_exp = "The dataframe is empty. No transformations will be applied."
@@ -332,6 +482,58 @@ class TextXetraETLMethods(unittest.TestCase):
 
             self.assertTrue(df_exp.equals(df_result))
 
+    def test_transform_report1_compact_numeric(self):
+        extract_date = "2021-04-17"
+        extract_date_list = ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"]
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=[extract_date, extract_date_list],
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config._replace(compact_numeric=True),
+                self.target_config,
+            )
+            df_extract = xetra_etl.extract()
+            df_result = xetra_etl.transform_report1(df_extract)
+
+        self.assertEqual("int32", df_extract["StartPrice"].dtype)
+        self.assertEqual("int16", df_extract["TradedVolume"].dtype)
+        self.assertEqual(182700, df_extract["StartPrice"][0])
+        self.assertTrue(self.df_report.equals(df_result))
+
+    def test_transform_report1_presorted(self):
+        df_exp = self.df_report
+
+        extract_date = "2021-04-17"
+        extract_date_list = ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"]
+        df_input = self.df_src.loc[1:8].reset_index(drop=True)
+        df_input.attrs["sorted_by_time"] = True
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=[extract_date, extract_date_list],
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                self.target_config,
+            )
+            with patch.object(
+                pd.Series, "sort_values", side_effect=AssertionError
+            ) as sort_mock:
+                df_result = xetra_etl.transform_report1(df_input)
+
+        sort_mock.assert_not_called()
+        self.assertTrue(df_exp.equals(df_result))
+
     def test_load(self):
         log1_exp = "Xetra target data successfully written."
         log2_exp = "Xetra meta file successfully updated."
@@ -407,6 +609,490 @@ class TextXetraETLMethods(unittest.TestCase):
             Delete={"Objects": [{"Key": trg_file}, {"Key": self.meta_key}]}
         )
 
+    def test_extract_files_spill(self):
+        df_exp = self.df_src.loc[1:8].reset_index(drop=True)
+
+        extract_date = "2021-04-17"
+        extract_date_list = ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"]
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            source_config = self.source_config._replace(spill_dir=spill_dir)
+            with patch.object(
+                MetaProcess,
+                "return_date_list",
+                return_value=[extract_date, extract_date_list],
+            ):
+                xetra_etl = XetraETL(
+                    self.s3_bucket_src,
+                    self.s3_bucket_trg,
+                    self.meta_key,
+                    source_config,
+                    self.target_config,
+                )
+                dataset = xetra_etl.extract()
+
+            self.assertIsInstance(dataset, ArrowSpillDataset)
+            self.assertEqual(len(dataset.files), 8)
+            self.assertTrue(df_exp.equals(dataset.to_df()))
+            dataset.cleanup()
+
+    def test_extract_files_memory_budget(self):
+        df_exp = self.df_src.loc[1:8].reset_index(drop=True)
+        source_config = self.source_config._replace(
+            memory_budget_mb=0.002, compact_numeric=True
+        )
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=["2021-04-17", ["2021-04-16", "2021-04-17", "2021-04-18"]],
+        ), patch.object(self.s3_bucket_src.download_controller, "concurrency", 8):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                source_config,
+                self.target_config,
+            )
+            dataset = xetra_etl.extract(
+                ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"]
+            )
+
+        self.assertIsInstance(dataset, ArrowSpillDataset)
+        self.assertEqual(8, len(dataset.files))
+        pd.testing.assert_frame_equal(df_exp, dataset.to_df())
+        budget = xetra_etl.memory_budget
+        self.assertGreater(budget.deferred, 0)
+        self.assertEqual(0, budget.held)
+        self.assertEqual(0, budget.reserved)
+        dataset.cleanup()
+
+    def test_etl_report1_memory_budget(self):
+        source_config = self.source_config._replace(memory_budget_mb=0.002)
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=[
+                "2021-04-17",
+                ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"],
+            ],
+        ):
+            XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                source_config,
+                self.target_config,
+            ).etl_report1()
+
+        trg_file = self.s3_bucket_trg.list_files_in_prefix(self.target_config.key)[0]
+        df_result = self.s3_bucket_trg.read_parquet_to_df(trg_file)
+        self.assertTrue(self.df_report.equals(df_result))
+
+    def test_transform_report1_spill_ok(self):
+        df_exp = self.df_report
+
+        extract_date = "2021-04-17"
+        extract_date_list = ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"]
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            dataset = ArrowSpillDataset(spill_dir)
+            for row in range(1, 9):
+                dataset.append(self.df_src.loc[row:row])
+            with patch.object(
+                MetaProcess,
+                "return_date_list",
+                return_value=[extract_date, extract_date_list],
+            ):
+                xetra_etl = XetraETL(
+                    self.s3_bucket_src,
+                    self.s3_bucket_trg,
+                    self.meta_key,
+                    self.source_config,
+                    self.target_config,
+                )
+                df_result = xetra_etl.transform_report1(dataset)
+
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_etl_report1_spill(self):
+        df_exp = self.df_report
+
+        extract_date = "2021-04-17"
+        extract_date_list = ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"]
+
+        with tempfile.TemporaryDirectory() as spill_dir:
+            source_config = self.source_config._replace(spill_dir=spill_dir)
+            with patch.object(
+                MetaProcess,
+                "return_date_list",
+                return_value=[extract_date, extract_date_list],
+            ):
+                xetra_etl = XetraETL(
+                    self.s3_bucket_src,
+                    self.s3_bucket_trg,
+                    self.meta_key,
+                    source_config,
+                    self.target_config,
+                )
+                xetra_etl.etl_report1()
+            self.assertEqual(os.listdir(spill_dir), [])
+
+        trg_file = self.s3_bucket_trg.list_files_in_prefix(self.target_config.key)[0]
+        data = self.trg_bucket.Object(key=trg_file).get().get("Body").read()
+        df_result = pd.read_parquet(BytesIO(data))
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_etl_report1_daily_cache(self):
+        df_exp = self.df_report
+        target_config = self.target_config._replace(daily_cache_key="cache/report1")
+
+        extract_date = "2021-04-17"
+        extract_date_list = ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"]
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=[extract_date, extract_date_list],
+        ):
+            XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            ).etl_report1()
+            self.s3_bucket_src.write_df_to_s3(
+                self.df_src.loc[7:7].assign(TradedVolume=2028),
+                "2021-04-19/2021-04-19_BINS_XETR08.csv",
+                "csv",
+            )
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            )
+            with patch.object(
+                self.s3_bucket_src,
+                "get_object",
+                wraps=self.s3_bucket_src.get_object,
+            ) as read_mock:
+                df_result = xetra_etl.transform_report1(
+                    xetra_etl.extract(xetra_etl.read_daily_cache())
+                )
+
+        self.assertEqual(
+            sorted(xetra_etl.cached_days), ["2021-04-16", "2021-04-17", "2021-04-18"]
+        )
+        self.assertEqual(read_mock.call_count, 3)
+        self.assertEqual(list(df_result["DailyTradedVolume"]), [1088, 10286, 4586])
+        self.assertTrue(
+            df_exp.drop(columns="DailyTradedVolume").equals(
+                df_result.drop(columns="DailyTradedVolume")
+            )
+        )
+
+    def test_etl_report1_rolling_state(self):
+        target_config = self.target_config._replace(
+            rolling_state_key="state/report1/rolling.parquet", rolling_windows=[2]
+        )
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=["2021-04-17", ["2021-04-16", "2021-04-17", "2021-04-18"]],
+        ):
+            XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            ).etl_report1()
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=["2021-04-19", ["2021-04-18", "2021-04-19"]],
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            )
+            df_result = xetra_etl.transform_report1(xetra_etl.extract())
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=[
+                "2021-04-17",
+                ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"],
+            ],
+        ):
+            xetra_etl_full = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config._replace(rolling_state_key="state/full.parquet"),
+            )
+            df_full = xetra_etl_full.transform_report1(xetra_etl_full.extract())
+
+        self.assertEqual(
+            list(self.df_report.columns) + ["MovingAvg2d", "Volatility2d"],
+            list(df_result.columns),
+        )
+        self.assertEqual(21.74, df_result["MovingAvg2d"].iloc[-1])
+        pd.testing.assert_frame_equal(df_full.tail(1).reset_index(drop=True), df_result)
+        self.assertEqual(
+            ["2021-04-17", "2021-04-18", "2021-04-19"],
+            list(xetra_etl.rolling_state_update["Date"]),
+        )
+
+    def test_etl_report1_changed_source(self):
+        source_config = self.source_config._replace(change_lookback_days=7)
+
+        with patch.object(
+            MetaProcess,
+            "return_date_list",
+            return_value=[
+                "2021-04-17",
+                ["2021-04-16", "2021-04-17", "2021-04-18", "2021-04-19"],
+            ],
+        ):
+            XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                source_config,
+                self.target_config,
+            ).etl_report1()
+        self.s3_bucket_src.write_df_to_s3(
+            self.df_src.loc[3:3].assign(TradedVolume=555),
+            "2021-04-17/2021-04-17_BINS_XETR14.csv",
+            "csv",
+        )
+
+        with patch.object(
+            MetaProcess, "return_date_list", return_value=["2200-01-01", []]
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                source_config,
+                self.target_config,
+            )
+            df_result = xetra_etl.transform_report1(xetra_etl.extract())
+
+        self.assertEqual(
+            xetra_etl.extract_date_list, ["2021-04-16", "2021-04-17", "2021-04-18"]
+        )
+        self.assertEqual(xetra_etl.meta_update_list, ["2021-04-17", "2021-04-18"])
+        df_exp = self.df_report.loc[0:1].copy()
+        df_exp.loc[0, "DailyTradedVolume"] = 1188
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_etl_report1_intraday(self):
+        target_config = self.target_config._replace(intraday_state_key="intraday")
+        self.src_bucket.delete_objects(
+            Delete={"Objects": [{"Key": "2021-04-17/2021-04-17_BINS_XETR14.csv"}]}
+        )
+
+        with patch.object(
+            MetaProcess, "return_date_list", return_value=["2200-01-01", []]
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            )
+            xetra_etl.etl_report1_intraday("2021-04-16")
+            xetra_etl.etl_report1_intraday("2021-04-17")
+            self.s3_bucket_src.write_df_to_s3(
+                self.df_src.loc[3:3], "2021-04-17/2021-04-17_BINS_XETR14.csv", "csv"
+            )
+            with patch.object(
+                self.s3_bucket_src,
+                "read_csv_to_df",
+                wraps=self.s3_bucket_src.read_csv_to_df,
+            ) as read_mock:
+                xetra_etl.etl_report1_intraday("2021-04-17")
+
+        self.assertEqual(read_mock.call_count, 1)
+        reports = sorted(
+            obj.key
+            for obj in self.trg_bucket.objects.all()
+            if "_provisional_" in obj.key
+        )
+        df_result = self.s3_bucket_trg.read_parquet_to_df(reports[-1])
+        self.assertTrue(self.df_report.loc[0:0].equals(df_result))
+
+    def test_etl_report1_intraday_same_second(self):
+        target_config = self.target_config._replace(intraday_state_key="intraday")
+
+        with patch.object(
+            MetaProcess, "return_date_list", return_value=["2200-01-01", []]
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            )
+            with patch(
+                "src.transformers.xetra_transformer.datetime", wraps=datetime
+            ) as datetime_mock:
+                datetime_mock.today.return_value = datetime(2021, 4, 17, 18, 0)
+                xetra_etl.etl_report1_intraday("2021-04-16")
+                xetra_etl.etl_report1_intraday("2021-04-17")
+
+        reports = sorted(
+            obj.key
+            for obj in self.trg_bucket.objects.all()
+            if "_provisional_" in obj.key
+        )
+        self.assertEqual(
+            [
+                "report1/xetra_daily_report_provisional_2021-04-16_"
+                "2021-04-17 18:00:00.parquet",
+                "report1/xetra_daily_report_provisional_2021-04-17_"
+                "2021-04-17 18:00:00.parquet",
+            ],
+            reports,
+        )
+
+    def test_etl_report1_intraday_duplicate_events(self):
+        target_config = self.target_config._replace(intraday_state_key="intraday")
+
+        with patch.object(
+            MetaProcess, "return_date_list", return_value=["2200-01-01", []]
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            )
+            objects = self.s3_bucket_src.list_objects_in_prefix("2021-04-17")
+            xetra_etl.etl_report1_intraday("2021-04-17", objects[:1] + objects[:1])
+            with patch.object(
+                self.s3_bucket_src,
+                "list_objects_in_prefix",
+                wraps=self.s3_bucket_src.list_objects_in_prefix,
+            ) as list_mock, patch.object(
+                self.s3_bucket_src,
+                "read_csv_to_df",
+                wraps=self.s3_bucket_src.read_csv_to_df,
+            ) as read_mock:
+                xetra_etl.etl_report1_intraday("2021-04-17", objects)
+
+        list_mock.assert_not_called()
+        self.assertEqual(read_mock.call_count, 1)
+
+    def test_etl_report1_intraday_state_conflict(self):
+        target_config = self.target_config._replace(intraday_state_key="intraday")
+
+        with patch.object(
+            MetaProcess, "return_date_list", return_value=["2200-01-01", []]
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            )
+            objects = self.s3_bucket_src.list_objects_in_prefix("2021-04-17")
+            xetra_etl.etl_report1_intraday("2021-04-17", objects[:1])
+            df_state, consumed, etag = xetra_etl._read_intraday_state("2021-04-17")
+            with patch.object(
+                xetra_etl,
+                "_read_intraday_state",
+                return_value=(df_state, dict(consumed), "0" * 32),
+            ), self.assertRaises(IntradayStateConflictException):
+                xetra_etl.etl_report1_intraday("2021-04-17", objects[1:])
+
+        self.assertEqual(
+            ["intraday/2021-04-17/aggregates.parquet"],
+            self.s3_bucket_trg.list_files_in_prefix("intraday/2021-04-17"),
+        )
+        self.assertEqual(
+            (consumed, etag), xetra_etl._read_intraday_state("2021-04-17")[1:]
+        )
+        self.assertEqual({objects[0].key: objects[0]}, consumed)
+
+    def test_etl_report1_intraday_duplicate_source(self):
+        target_config = self.target_config._replace(intraday_state_key="intraday")
+
+        with patch.object(
+            MetaProcess, "return_date_list", return_value=["2200-01-01", []]
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            )
+            xetra_etl.etl_report1_intraday("2021-04-17")
+            self.s3_bucket_src.write_df_to_s3(
+                self.df_src.loc[2:2], "2021-04-17/2021-04-17_BINS_XETR0.csv", "csv"
+            )
+            with patch.object(
+                self.s3_bucket_src,
+                "read_csv_to_df",
+                wraps=self.s3_bucket_src.read_csv_to_df,
+            ) as read_mock:
+                xetra_etl.etl_report1_intraday("2021-04-17")
+
+        read_mock.assert_not_called()
+        df_state, consumed, _ = xetra_etl._read_intraday_state("2021-04-17")
+        self.assertEqual(1088, df_state["DailyTradedVolume"].sum())
+        self.assertEqual(2, len(consumed))
+
+    def test_etl_report1_intraday_duplicate_source_event(self):
+        target_config = self.target_config._replace(intraday_state_key="intraday")
+        key = "2021-04-17/2021-04-17_BINS_XETR0.csv"
+
+        with patch.object(
+            MetaProcess, "return_date_list", return_value=["2200-01-01", []]
+        ):
+            xetra_etl = XetraETL(
+                self.s3_bucket_src,
+                self.s3_bucket_trg,
+                self.meta_key,
+                self.source_config,
+                target_config,
+            )
+            xetra_etl.etl_report1_intraday("2021-04-17")
+            self.s3_bucket_src.write_df_to_s3(self.df_src.loc[2:2], key, "csv")
+            objects = [
+                obj
+                for obj in self.s3_bucket_src.list_objects_in_prefix("2021-04-17")
+                if obj.key == key
+            ]
+            with patch.object(
+                self.s3_bucket_src,
+                "read_csv_to_df",
+                wraps=self.s3_bucket_src.read_csv_to_df,
+            ) as read_mock:
+                xetra_etl.etl_report1_intraday("2021-04-17", objects)
+
+        read_mock.assert_not_called()
+        df_state, consumed, _ = xetra_etl._read_intraday_state("2021-04-17")
+        self.assertEqual(1088, df_state["DailyTradedVolume"].sum())
+        self.assertEqual(2, len(consumed))
+        self.assertTrue(all(obj.size > 0 for obj in consumed.values()))
+
 
 if __name__ == "__main__":
     unittest.main()